@@ -6,6 +6,7 @@ import toml
 import typer
 from src.interfaces.network.tokens import TokenNative, TokenUnderlying
 from src.flow.flow import Flow
+from src.flow.async_runner import AsyncFlowRunner
 from src.actions import ACTION_BUNDLE_CLASSES
 from src.utils.data_structures import UserData
 from src.flow.user_manager import UserManager
@@ -33,8 +34,8 @@ def parse_action_params(action_params_list: list[str]) -> dict[str, dict]:
     return action_params
 
 
-def make_threads(action_params, total_time, cli):
-    threads = []
+def make_flows(action_params, total_time, cli):
+    flows = []
     for i in user_nums:
         flow = Flow(
             UserData(
@@ -48,26 +49,32 @@ def make_threads(action_params, total_time, cli):
             total_time=total_time,
             time_wait=5
             )
-        t = threading.Thread(target=flow.run)
-        threads.append(t)
-    return threads
+        flows.append(flow)
+    return flows
+
+def make_threads(action_params, total_time, cli):
+    return [threading.Thread(target=flow.run) for flow in make_flows(action_params, total_time, cli)]
 
 def main( 
         request_funds: bool = False, 
         action_params: Annotated[list[str] | None, typer.Option()] = None,
-        cli: bool = False
+        cli: bool = False,
+        use_async: Annotated[bool, typer.Option("--async")] = False
     ):
     um = UserManager(token_native, token_underlying, user_nums=user_nums)
     if request_funds:
         um.request_funds()
     um.distribute_funds()
     action_params = parse_action_params(action_params) if action_params else {}
-    threads = make_threads(action_params, run_time, cli)
-    for t in threads:
-        time.sleep(random.uniform(3, 3.5))
-        t.start()
-    for t in threads:
-        t.join()
+    if use_async:
+        AsyncFlowRunner(make_flows(action_params, run_time, cli)).run()
+    else:
+        threads = make_threads(action_params, run_time, cli)
+        for t in threads:
+            time.sleep(random.uniform(3, 3.5))
+            t.start()
+        for t in threads:
+            t.join()
     um.collect_funds()
 
 if __name__ == "__main__":
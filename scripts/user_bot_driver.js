@@ -0,0 +1,78 @@
+// Long-lived driver for the fasset-bots user-bot CLI.
+// Started from the fasset-bots folder with the path of the compiled user-bot entry as argument.
+// Reads one JSON request per line from stdin: {"id": 1, "args": ["-s", "secrets.json", "-f", "FTestXRP", "balances"]},
+// runs the CLI in this process and answers with one JSON line: {"id": 1, "code": 0, "output": "..."}.
+// Node startup and the modules loaded by the CLI are shared by all commands, only the entry module is loaded again.
+const path = require("path");
+const readline = require("readline");
+
+const entry = path.resolve(process.argv[2]);
+const write = process.stdout.write.bind(process.stdout);
+const exit = process.exit;
+
+let output = "";
+let finish = null;
+
+function capture(chunk, encoding, callback) {
+    output += typeof chunk === "string" ? chunk : Buffer.from(chunk).toString();
+    if (typeof encoding === "function") encoding();
+    else if (typeof callback === "function") callback();
+    return true;
+}
+
+// the CLI ends every command with process.exit, which only finishes the current request here
+process.exit = (code) => {
+    if (finish) finish(code ?? 0);
+};
+process.on("uncaughtException", (error) => {
+    output += `${error && error.stack ? error.stack : error}\n`;
+    if (finish) finish(1);
+});
+process.on("unhandledRejection", (error) => {
+    output += `${error && error.stack ? error.stack : error}\n`;
+    if (finish) finish(1);
+});
+
+function run(request) {
+    return new Promise((resolve) => {
+        output = "";
+        finish = (code) => {
+            finish = null;
+            process.stdout.write = write;
+            resolve({ id: request.id, code: code, output: output });
+        };
+        process.stdout.write = capture;
+        process.argv = [process.argv[0], entry, ...request.args];
+        try {
+            delete require.cache[require.resolve(entry)];
+            require(entry);
+        } catch (error) {
+            output += `${error && error.stack ? error.stack : error}\n`;
+            finish(1);
+        }
+    });
+}
+
+const queue = [];
+let running = false;
+let closed = false;
+
+async function next() {
+    if (running) return;
+    running = true;
+    while (queue.length > 0) {
+        const response = await run(queue.shift());
+        write(JSON.stringify(response) + "\n");
+    }
+    running = false;
+    if (closed) exit(0);
+}
+
+readline.createInterface({ input: process.stdin }).on("line", (line) => {
+    if (!line.trim()) return;
+    queue.push(JSON.parse(line));
+    next();
+}).on("close", () => {
+    closed = true;
+    if (!running) exit(0);
+});
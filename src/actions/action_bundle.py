@@ -1,48 +1,88 @@
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
-from src.interfaces.contracts.asset_manager import AssetManager
 from src.actions.core_actions.core_actions import core_actions
-from src.interfaces.user.user_bot import UserBot
-from src.interfaces.user.state_manager import StateManager
+from src.interfaces.user.user import get_user_context
 if TYPE_CHECKING:
     from src.utils.data_structures import FlowState, RelevantInfo, UserData
 
 
+class BundleContext():
+    """
+    Per-user data shared by all action bundles of a flow (tokens, networks, credentials, loggers,
+    core actions and lot size), so that it is built once per flow instead of in every bundle.
+    """
+    def __init__(self, user_data: "UserData", cli: bool):
+
+        # user contexts for data extraction and logging
+        self.user_data = user_data
+        self.cli = cli
+        user_context = get_user_context(user_data)
+        partner_context = get_user_context(user_data.partner_data())
+
+        # tokens
+        self.token_native = user_context.token_native
+        self.token_underlying = user_context.token_underlying
+        self.token_fasset = user_context.token_fasset
+
+        # networks
+        self.native_network = user_context.token_native.network
+        self.underlying_network = user_context.token_underlying.network
+
+        # secrets
+        self.native_credentials = user_context.native_credentials
+        self.underlying_credentials = user_context.underlying_credentials
+        self.partner_native_credentials = partner_context.native_credentials
+        self.partner_underlying_credentials = partner_context.underlying_credentials
+
+        # loggers
+        self.logger = user_context.logger
+        self.partner_logger = partner_context.logger
+
+        # flow logic
+        self.ca = core_actions(user_data, cli)
+        self.ca_partner = core_actions(user_data.partner_data(), cli)
+
+    @property
+    def lot_size(self) -> int:
+        # read from the shared settings snapshot on every call, so that lot size changes are seen
+        return get_user_context(self.user_data).asset_manager().lot_size()
+
+
 class ActionBundle(ABC):
+    """
+    Conditions and relevant info are class-level, evaluated over the shared BundleContext and the current flow state,
+    so that only the chosen bundle is instantiated in a flow step.
+    """
+    cli_available : bool = True
+    partner_involved : bool = False
+
     def __init__(
             self,
-            user_data: "UserData",
-            flow_state : "FlowState",
-            cli: bool
+            context: "BundleContext",
+            flow_state : "FlowState"
         ):
+        self.check_available(context.cli)
+        self.context = context
+        self.user_data = context.user_data
 
-        # sm for data extraction and logging
-        self.user_data = user_data
-        if cli:
-            sm = UserBot(user_data)
-            sm_partner = UserBot(user_data.partner_data())
-        else:
-            sm = StateManager(user_data)
-            sm_partner = StateManager(user_data.partner_data())
-        
         # tokens
-        self.token_native = sm.token_native
-        self.token_underlying = sm.token_underlying
-        self.token_fasset = sm.token_fasset
+        self.token_native = context.token_native
+        self.token_underlying = context.token_underlying
+        self.token_fasset = context.token_fasset
 
         # networks
-        self.native_network = sm.native_network
-        self.underlying_network = sm.underlying_network
-        
+        self.native_network = context.native_network
+        self.underlying_network = context.underlying_network
+
         # secrets
-        self.native_credentials = sm.native_credentials
-        self.underlying_credentials = sm.underlying_credentials
-        self.partner_native_credentials = sm_partner.native_credentials
-        self.partner_underlying_credentials = sm_partner.underlying_credentials
-        
+        self.native_credentials = context.native_credentials
+        self.underlying_credentials = context.underlying_credentials
+        self.partner_native_credentials = context.partner_native_credentials
+        self.partner_underlying_credentials = context.partner_underlying_credentials
+
         # loggers
-        self.logger = sm.logger
-        self.partner_logger = sm_partner.logger
+        self.logger = context.logger
+        self.partner_logger = context.partner_logger
 
         # state
         self.flow_state = flow_state
@@ -50,16 +90,20 @@ class ActionBundle(ABC):
         self.mint_status = flow_state.mint_status
         self.redemption_status = flow_state.redemption_status
         self.pool_holdings = flow_state.pool_holdings
-        
+
         # flow logic
-        self.lot_size = AssetManager(self.native_network, self.token_fasset).lot_size()
-        partner_data = user_data.partner_data()
-        self.ca = core_actions(user_data, cli)
-        self.ca_partner = core_actions(partner_data, cli)
-        self.partner_involved = False  # set to True in subclasses where partner is involved
+        self.lot_size = context.lot_size
+        self.ca = context.ca
+        self.ca_partner = context.ca_partner
 
+    @classmethod
+    def check_available(cls, cli: bool) -> None:
+        if cli and not cls.cli_available:
+            raise Exception(f"{cls.__name__} is not available in CLI mode.")
+
+    @classmethod
     @abstractmethod
-    def condition(self) -> bool:
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
         pass
 
     @abstractmethod
@@ -71,10 +115,11 @@ class ActionBundle(ABC):
     def expected_state(self) -> "FlowState | list[FlowState]":
         pass
 
-    def general_conditions(self) -> bool:
-        enough_native = self.balances[self.token_native] > 10  # to avoid gas issues
+    @classmethod
+    def general_conditions(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        enough_native = flow_state.balances[context.token_native] > 10  # to avoid gas issues
         return enough_native
-    
+
     def update_partner_flow_state(self, partner_flow_state : "FlowState") -> None:
         self.partner_flow_state = partner_flow_state
         self.partner_balances = partner_flow_state.balances
@@ -82,6 +127,7 @@ class ActionBundle(ABC):
         self.partner_redemption_status = partner_flow_state.redemption_status
         self.partner_pool_holdings = partner_flow_state.pool_holdings
 
+    @classmethod
     @abstractmethod
-    def relevant_info(self) -> "RelevantInfo":
-        pass
\ No newline at end of file
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
+        pass
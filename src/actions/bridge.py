@@ -6,8 +6,8 @@ from src.actions.action_bundle import ActionBundle
 from src.interfaces.network.tokens import TokenExternalFAsset, TokenExternalNative, TokenNative
 from src.utils.data_structures import RelevantInfo
 if TYPE_CHECKING:
+    from src.actions.action_bundle import BundleContext
     from src.utils.data_structures import FlowState
-    from src.utils.data_structures import UserData
 
 BRIDGE_FEE = {
     TokenNative.C2FLR: 50,
@@ -28,14 +28,16 @@ def to_builtin(obj):
         return obj
 
 class _BridgeToExternalNetwork(ActionBundle):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool, token_external: "TokenExternalFAsset"):
-        super().__init__(user_data, flow_state, cli)
-        self.token_external = token_external
-        self.external_network = token_external.network
-
-    def condition(self) -> bool:
-        enough_fasset = self.balances[self.token_fasset] >= self.lot_size
-        enough_fees = self.balances[self.token_native] >= BRIDGE_FEE[self.token_native]
+    token_external : "TokenExternalFAsset"
+
+    def __init__(self, context: "BundleContext", flow_state: "FlowState"):
+        super().__init__(context, flow_state)
+        self.external_network = self.token_external.network
+
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        enough_fasset = flow_state.balances[context.token_fasset] >= context.lot_size
+        enough_fees = flow_state.balances[context.token_native] >= BRIDGE_FEE[context.token_native]
         return enough_fasset and enough_fees
     
     def action(self) -> None:
@@ -56,21 +58,25 @@ class _BridgeToExternalNetwork(ActionBundle):
         new_balances.subtract_fees(self.ca.fee_tracker)
         return self.flow_state.replace([new_balances])
     
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_native, self.token_fasset, self.token_external, self.external_network.coin]
+            tokens=[context.token_native, context.token_fasset, cls.token_external, cls.token_external.network.coin]
         )
     
 
 class _BridgeFromExternalNetwork(ActionBundle):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool, token_external: "TokenExternalFAsset"):
-        super().__init__(user_data, flow_state, cli)
-        self.token_external = token_external
-        self.external_network = token_external.network
-
-    def condition(self) -> bool:
-        enough_external = self.balances[self.token_external] >= self.lot_size
-        enough_fees = self.balances[self.external_network.coin] >= BRIDGE_FEE[self.external_network.coin]
+    token_external : "TokenExternalFAsset"
+
+    def __init__(self, context: "BundleContext", flow_state: "FlowState"):
+        super().__init__(context, flow_state)
+        self.external_network = self.token_external.network
+
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        external_coin = cls.token_external.network.coin
+        enough_external = flow_state.balances[cls.token_external] >= context.lot_size
+        enough_fees = flow_state.balances[external_coin] >= BRIDGE_FEE[external_coin]
         return enough_external and enough_fees
     
     def action(self) -> None:
@@ -91,21 +97,25 @@ class _BridgeFromExternalNetwork(ActionBundle):
         new_balances.subtract_fees(self.ca.fee_tracker)
         return self.flow_state.replace([new_balances])
     
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_native, self.token_fasset, self.token_external, self.external_network.coin]
+            tokens=[context.token_native, context.token_fasset, cls.token_external, cls.token_external.network.coin]
         )
 
 
 class _AutoRedeemFromExternalNetwork(ActionBundle):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool, token_external: "TokenExternalFAsset"):
-        super().__init__(user_data, flow_state, cli)
-        self.token_external = token_external
-        self.external_network = token_external.network
-
-    def condition(self) -> bool:
-        enough_external = self.balances[self.token_external] >= self.lot_size
-        enough_fees = self.balances[self.external_network.coin] >= BRIDGE_FEE[self.external_network.coin]
+    token_external : "TokenExternalFAsset"
+
+    def __init__(self, context: "BundleContext", flow_state: "FlowState"):
+        super().__init__(context, flow_state)
+        self.external_network = self.token_external.network
+
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        external_coin = cls.token_external.network.coin
+        enough_external = flow_state.balances[cls.token_external] >= context.lot_size
+        enough_fees = flow_state.balances[external_coin] >= BRIDGE_FEE[external_coin]
         return enough_external and enough_fees
     
     def action(self) -> None:
@@ -127,27 +137,24 @@ class _AutoRedeemFromExternalNetwork(ActionBundle):
         new_balances.subtract_fees(self.ca.fee_tracker)
         return self.flow_state.replace([new_balances])
     
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_underlying, self.token_native, self.token_fasset, self.token_external, self.external_network.coin]
+            tokens=[context.token_underlying, context.token_native, context.token_fasset, cls.token_external, cls.token_external.network.coin]
         )
 
 
 class BridgeToHyperEVM(_BridgeToExternalNetwork):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool):
-        super().__init__(user_data, flow_state, cli, TokenExternalFAsset.FTestXRP_HyperEVM_testnet)
+    token_external = TokenExternalFAsset.FTestXRP_HyperEVM_testnet
 
 
 class BridgeToHyperCore(_BridgeToExternalNetwork):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool):
-        super().__init__(user_data, flow_state, cli, TokenExternalFAsset.FTestXRP_HyperCore_testnet)
+    token_external = TokenExternalFAsset.FTestXRP_HyperCore_testnet
 
 
 class BridgeFromHyperEVM(_BridgeFromExternalNetwork):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool):
-        super().__init__(user_data, flow_state, cli, TokenExternalFAsset.FTestXRP_HyperEVM_testnet)
+    token_external = TokenExternalFAsset.FTestXRP_HyperEVM_testnet
 
 
 class AutoRedeemFromHyperEVM(_AutoRedeemFromExternalNetwork):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool):
-        super().__init__(user_data, flow_state, cli, TokenExternalFAsset.FTestXRP_HyperEVM_testnet)
\ No newline at end of file
+    token_external = TokenExternalFAsset.FTestXRP_HyperEVM_testnet
\ No newline at end of file
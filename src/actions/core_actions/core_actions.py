@@ -1,6 +1,6 @@
 from decimal import Decimal
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 from src.flow.fee_tracker import FeeTracker
 if TYPE_CHECKING:
     from src.interfaces.network.tokens import Token
@@ -15,8 +15,18 @@ class CoreActions(ABC):
 
     # state (user-specific) retrieval
 
+    def get_snapshot_blocks(self) -> tuple[Optional[int], Optional[int]]:
+        """
+        Returns the native block and the underlying ledger index that state reads can be pinned to.
+        None means that the implementation cannot pin reads and always reads the latest state.
+        """
+        return None, None
+
     @abstractmethod
-    def get_balances(self, tokens: list["Token"], log_steps: bool = False) -> "Balances":
+    def get_balances(
+            self, tokens: list["Token"], log_steps: bool = False,
+            block: Optional[int] = None, ledger_index: Optional[int] = None
+        ) -> "Balances":
         pass
 
     @abstractmethod
@@ -24,11 +34,14 @@ class CoreActions(ABC):
         pass
 
     @abstractmethod
-    def get_redemption_status(self, log_steps: bool = False) -> "RedemptionStatus":
+    def get_redemption_status(
+            self, log_steps: bool = False,
+            block: Optional[int] = None, ledger_index: Optional[int] = None
+        ) -> "RedemptionStatus":
         pass
 
     @abstractmethod
-    def get_pool_holdings(self, log_steps: bool = False) -> list["PoolHolding"]:
+    def get_pool_holdings(self, log_steps: bool = False, block: Optional[int] = None) -> list["PoolHolding"]:
         pass
 
     # info (system-specific) retrieval
@@ -37,6 +50,19 @@ class CoreActions(ABC):
     def get_agents(self, log_steps: bool = False) -> list["AgentInfo"]:
         pass
 
+    def get_agents_by_fee(self, log_steps: bool = False) -> list["AgentInfo"]:
+        """
+        Agents sorted by ascending fee.
+        """
+        return sorted(self.get_agents(log_steps), key=lambda agent: agent.fee)
+
+    def sync_agents(self, block: Optional[int]) -> None:
+        """
+        Makes sure that agents returned by get_agents are not older than block.
+        Nothing to do where agents are not cached.
+        """
+        pass
+
     @abstractmethod
     def get_pools(self, log_steps: bool = False) -> list["Pool"]:
         pass
@@ -70,11 +96,19 @@ class CoreActions(ABC):
         pass
 
     @abstractmethod
-    def mint_execute(self, mint_id: int, log_steps: bool = False) -> None:
+    def mint_execute(self, mint_id: int, log_steps: bool = False, wait: bool = True) -> bool:
+        """
+        If wait is False, implementations may only request the payment proof and return False
+        when the proof is not available yet.
+        """
         pass
 
     @abstractmethod
-    def redeem_default(self, redemption_id: int, log_steps: bool = False) -> None:
+    def redeem_default(self, redemption_id: int, log_steps: bool = False, wait: bool = True) -> bool:
+        """
+        If wait is False, implementations may only request the non-existence proof and return False
+        when the proof is not available yet.
+        """
         pass
 
 
@@ -1,5 +1,5 @@
 from decimal import Decimal
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 from src.interfaces.user.user_bot import UserBot
 from src.actions.core_actions.core_actions import CoreActions
 if TYPE_CHECKING: 
@@ -14,19 +14,25 @@ class CoreActionsCLI(CoreActions):
 
     # state retrieval
 
-    def get_balances(self, tokens: list["Token"], log_steps: bool = False) -> "Balances":
+    def get_balances(
+            self, tokens: list["Token"], log_steps: bool = False,
+            block: Optional[int] = None, ledger_index: Optional[int] = None
+        ) -> "Balances":
         return self.user_bot.get_balances(log_steps=log_steps)
 
     def get_pools(self, log_steps: bool = False) -> list["Pool"]:
         return self.user_bot.get_pools(log_steps=log_steps)
 
-    def get_pool_holdings(self, log_steps: bool = False) -> list["PoolHolding"]:
+    def get_pool_holdings(self, log_steps: bool = False, block: Optional[int] = None) -> list["PoolHolding"]:
         return self.user_bot.get_pool_holdings(log_steps=log_steps)
 
     def get_mint_status(self, log_steps: bool = False) -> "MintStatus":
         return self.user_bot.get_mint_status(log_steps=log_steps)
     
-    def get_redemption_status(self, log_steps: bool = False) -> "RedemptionStatus":
+    def get_redemption_status(
+            self, log_steps: bool = False,
+            block: Optional[int] = None, ledger_index: Optional[int] = None
+        ) -> "RedemptionStatus":
         return self.user_bot.get_redemption_status(log_steps=log_steps)
     
     # logging
@@ -54,11 +60,13 @@ class CoreActionsCLI(CoreActions):
     def withdraw_pool_fees(self, pool_address: str, fees: Decimal, log_steps: bool = False) -> None:
         self.user_bot.withdraw_pool_fees(pool_address, fees, log_steps=log_steps)
 
-    def mint_execute(self, mint_id: int, log_steps: bool = False) -> None:
+    def mint_execute(self, mint_id: int, log_steps: bool = False, wait: bool = True) -> bool:
         self.user_bot.execute_mint(mint_id, log_steps=log_steps)
+        return True
 
-    def redeem_default(self, redemption_id: int, log_steps: bool = False) -> None:
+    def redeem_default(self, redemption_id: int, log_steps: bool = False, wait: bool = True) -> bool:
         self.user_bot.redeem_default(redemption_id, log_steps=log_steps)
+        return True
 
     # not implemented
 
@@ -1,16 +1,17 @@
+import threading
 from decimal import Decimal
 from typing import TYPE_CHECKING, Literal, Optional
 from src.interfaces.user.bridger import Bridger
 from src.actions.core_actions.core_actions import CoreActions
-from src.interfaces.contracts.asset_manager import AssetManager
+from src.interfaces.contracts.agent_registry import get_agent_registry
 from src.interfaces.user.state_manager import StateManager
 from src.interfaces.user.minter import Minter
 from src.interfaces.user.redeemer import Redeemer
 from src.interfaces.user.pool_manager import PoolManager
-from src.utils.data_structures import AgentInfo
+from src.interfaces.user.event_subscriber import EventSubscriber, events_enabled
 if TYPE_CHECKING:
     from src.interfaces.network.networks.external_networks.external_network import ExternalNetwork
-    from src.utils.data_structures import Balances, MintStatus, RedemptionStatus, UserData, Pool, PoolHolding
+    from src.utils.data_structures import AgentInfo, Balances, MintStatus, RedemptionStatus, UserData, Pool, PoolHolding
     from src.interfaces.network.tokens import Token
 
 
@@ -22,12 +23,47 @@ class CoreActionsManual(CoreActions):
         self.redeemer = Redeemer(user_data, fee_tracker=self.fee_tracker)
         self.pool_manager = PoolManager(user_data, fee_tracker=self.fee_tracker)
         self.bridger = Bridger(user_data, fee_tracker=self.fee_tracker)
+        self.events = EventSubscriber(user_data, fee_tracker=self.fee_tracker) if events_enabled else None
+        # snapshot reads run concurrently and share the event state
+        self._events_lock = threading.Lock()
         self.logger = self.sm.logger
 
     # state retrieval
 
-    def get_balances(self, tokens: list["Token"], log_steps: bool = False) -> "Balances":
-        balances = self.sm.get_balances(tokens, log_steps=log_steps)
+    def get_snapshot_blocks(self) -> tuple[Optional[int], Optional[int]]:
+        return self.sm.get_snapshot_blocks()
+
+    def _events_synced(self, block: Optional[int]) -> bool:
+        """
+        Applies events up to block (reconciling at block if needed).
+        Returns whether the event state is at block.
+        """
+        if self.events is None or block is None:
+            return False
+        with self._events_lock:
+            if self.events.needs_reconciliation():
+                self.events.reconcile(block)
+            else:
+                self.events.sync(block)
+            return self.events.last_block == block
+
+    def get_balances(
+            self, tokens: list["Token"], log_steps: bool = False,
+            block: Optional[int] = None, ledger_index: Optional[int] = None
+        ) -> "Balances":
+        token_fasset = self.sm.token_fasset
+        synced = token_fasset in tokens and self._events_synced(block)
+        from_events = synced and self.events.fasset_balance_uba is not None
+        balances = self.sm.get_balances(
+            [token for token in tokens if not (from_events and token == token_fasset)], 
+            log_steps=log_steps, 
+            block_identifier=block if block is not None else "latest",
+            ledger_index=ledger_index if ledger_index is not None else "validated"
+        )
+        if from_events:
+            balances[token_fasset] = token_fasset.from_uba(self.events.fasset_balance_uba)
+        elif synced:
+            self.events.fasset_balance_uba = token_fasset.to_uba(balances[token_fasset])
         if log_steps:
             self.logger.info(f"Balances: {balances}")
         return balances
@@ -38,8 +74,11 @@ class CoreActionsManual(CoreActions):
             self.logger.info(f"Pools: {pools}")
         return pools
 
-    def get_pool_holdings(self, log_steps: bool = False) -> list["PoolHolding"]:
-        pool_holdings = self.pool_manager.pool_holdings(log_steps=log_steps)
+    def get_pool_holdings(self, log_steps: bool = False, block: Optional[int] = None) -> list["PoolHolding"]:
+        pool_holdings = self.pool_manager.pool_holdings(
+            log_steps=log_steps, 
+            block_identifier=block if block is not None else "latest"
+        )
         if log_steps:
             self.logger.info(f"Pool holdings: {pool_holdings}")
         return pool_holdings
@@ -50,38 +89,37 @@ class CoreActionsManual(CoreActions):
             self.logger.info(f"Mint status: {mint_status}")
         return mint_status
 
-    def get_redemption_status(self, log_steps: bool = False) -> "RedemptionStatus":
-        redemption_status = self.redeemer.redemption_status()
+    def get_redemption_status(
+            self, log_steps: bool = False,
+            block: Optional[int] = None, ledger_index: Optional[int] = None
+        ) -> "RedemptionStatus":
+        synced = self._events_synced(block)
+        redemption_status = self.redeemer.redemption_status(
+            block_identifier=block if block is not None else "latest",
+            ledger_index=ledger_index,
+            assume_active=synced and self.events.statuses_synced
+        )
+        if synced:
+            self.events.statuses_synced = True
         if log_steps:
             self.logger.info(f"Redemption status: {redemption_status}")
         return redemption_status
     
-    def get_agents(self, chunk_size: int = 10, log_steps: bool = False) -> list["AgentInfo"]:
-        agent_list = []
-        start = 0
-        am = AssetManager(self.sm.native_network, self.sm.token_fasset)
-        while True:
-            new = am.get_available_agents_detailed_list(start, start + chunk_size)
-            agent_list.extend(new)
-            if len(new) < chunk_size:
-                break
-            start += len(new)
-        fields_mapping = {
-            "agentVault": "address",
-            "freeCollateralLots": "max_lots",
-            "feeBIPS": "fee",
-            }
-        result = []
-        for agent in agent_list:
-            d = {}
-            for k, v in agent.items():
-                if k in fields_mapping:
-                    if k.endswith("BIPS"):
-                        d[fields_mapping[k]] = Decimal(v / 1e4)
-                    else:
-                        d[fields_mapping[k]] = v
-            result.append(AgentInfo(**d))
-        return result
+    def get_agents(self, log_steps: bool = False) -> list["AgentInfo"]:
+        agents = get_agent_registry(self.sm.native_network, self.sm.token_fasset).agents()
+        if log_steps:
+            self.logger.info(f"Agents: {agents}")
+        return agents
+
+    def get_agents_by_fee(self, log_steps: bool = False) -> list["AgentInfo"]:
+        agents = get_agent_registry(self.sm.native_network, self.sm.token_fasset).agents_by_fee()
+        if log_steps:
+            self.logger.info(f"Agents: {agents}")
+        return agents
+
+    def sync_agents(self, block: Optional[int]) -> None:
+        if block is not None:
+            get_agent_registry(self.sm.native_network, self.sm.token_fasset).refresh(block)
     
     # logic
 
@@ -131,13 +169,13 @@ class CoreActionsManual(CoreActions):
         self.logger.info(f"Transferring {amount} pool tokens of pool {pool_address} to {to_address}.")
         self.pool_manager.transfer_pool_tokens(pool_address, to_address, amount, log_steps=log_steps)
 
-    def mint_execute(self, mint_id: int, log_steps: bool = False) -> None:
+    def mint_execute(self, mint_id: int, log_steps: bool = False, wait: bool = True) -> bool:
         self.logger.info(f"Executing minting for mint ID {mint_id}.")
-        self.minter.prove_and_execute_minting(mint_id, log_steps=log_steps)
+        return self.minter.prove_and_execute_minting(mint_id, log_steps=log_steps, wait=wait)
 
-    def redeem_default(self, redemption_id: int, log_steps: bool = False) -> None:
+    def redeem_default(self, redemption_id: int, log_steps: bool = False, wait: bool = True) -> bool:
         self.logger.info(f"Executing redemption for redemption ID {redemption_id}.")
-        self.redeemer.redeem_default(redemption_id, log_steps=log_steps)
+        return self.redeemer.redeem_default(redemption_id, log_steps=log_steps, wait=wait)
 
     def bridge_to(self, to_network: type["ExternalNetwork"], lots: int, log_steps: bool = False) -> None:
         self.logger.info(f"Bridging to {to_network.__name__} with {lots} lots.")
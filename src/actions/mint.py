@@ -1,24 +1,33 @@
 import random
-from typing import TYPE_CHECKING, Optional
-from src.actions.core_actions.core_actions import core_actions
+from itertools import takewhile
+from typing import TYPE_CHECKING
 from src.actions.action_bundle import ActionBundle
 from src.actions.helper_functions import can_mint
 from src.utils.data_storage import DataStorageClient
 from src.utils.data_structures import RelevantInfo
 if TYPE_CHECKING:
+    from src.actions.action_bundle import BundleContext
     from src.utils.data_structures import FlowState
-    from src.utils.data_structures import AgentInfo, UserData
+    from src.utils.data_structures import AgentInfo
 
 
 class _MintRandomAmount(ActionBundle):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool, agent_list: Optional[list["AgentInfo"]] = None):
-        super().__init__(user_data, flow_state, cli)
-        self.agent_list = agent_list if agent_list is not None else self.ca.get_agents()
+    def __init__(self, context: "BundleContext", flow_state: "FlowState", **params):
+        super().__init__(context, flow_state)
+        self.agent_list = self.agents(context, **params)
         available_agents = [agent for agent in self.agent_list if agent.max_lots >= 1]
         self.agent = random.choice(available_agents) if available_agents else None
 
-    def condition(self) -> bool:
-        return can_mint(self.balances, self.token_underlying, self.lot_size, self.agent_list)
+    @classmethod
+    def agents(cls, context: "BundleContext") -> list["AgentInfo"]:
+        """
+        Agents to choose from when minting.
+        """
+        return context.ca.get_agents()
+
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState", **params) -> bool:
+        return can_mint(flow_state.balances, context.token_underlying, context.lot_size, cls.agents(context, **params))
 
     def action(self) -> None:
         # action logic
@@ -37,49 +46,46 @@ class _MintRandomAmount(ActionBundle):
         new_balances.subtract_fees(self.ca.fee_tracker)
         return self.flow_state.replace([new_balances])
 
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_underlying, self.token_native, self.token_fasset],
-            mint_status=True
+            tokens=[context.token_underlying, context.token_native, context.token_fasset],
+            mint_status=True,
+            agents=True
         )
 
 
 class MintRandomAgentRandomAmount(_MintRandomAmount):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool):
-        super().__init__(user_data, flow_state, cli)
+    pass
 
 
 class MintLowestFeeAgentRandomAmount(_MintRandomAmount):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool):
-        ca = core_actions(user_data, cli)
-        agent_list = ca.get_agents()
-        agent_fees_dict = {
-            agent_fee: [
-                agent for agent in agent_list if agent.fee == agent_fee and agent.max_lots >= 1
-                ] 
-                for agent_fee in set(agent.fee for agent in agent_list)
-            }
-        lowest_fee = min(fee for fee, agents in agent_fees_dict.items() if agents)
-        self.agent_list = agent_fees_dict[lowest_fee]
-        super().__init__(user_data, flow_state, cli, agent_list=self.agent_list)
+    @classmethod
+    def agents(cls, context: "BundleContext") -> list["AgentInfo"]:
+        # sorted by fee, so the lowest fee group is at the front
+        agent_list = [agent for agent in context.ca.get_agents_by_fee() if agent.max_lots >= 1]
+        if not agent_list:
+            return []
+        lowest_fee = agent_list[0].fee
+        return list(takewhile(lambda agent: agent.fee == lowest_fee, agent_list))
 
 
 class MintSpecificAgentRandomAmount(_MintRandomAmount):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool, agent_address: str):
-        ca = core_actions(user_data, cli)
-        agent_list = ca.get_agents()
-        specific_agent = next((agent for agent in agent_list if agent.address == agent_address), None)
+    def __init__(self, context: "BundleContext", flow_state: "FlowState", agent_address: str):
+        super().__init__(context, flow_state, agent_address=agent_address)
+
+    @classmethod
+    def agents(cls, context: "BundleContext", agent_address: str) -> list["AgentInfo"]:
+        specific_agent = next((agent for agent in context.ca.get_agents() if agent.address == agent_address), None)
         if not specific_agent:
             raise ValueError(f"Agent with address {agent_address} not found.")
-        super().__init__(user_data, flow_state, cli, agent_list=[specific_agent])
-    
+        return [specific_agent]
 
-class MintExecuteRandomMinting(ActionBundle):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool):
-        super().__init__(user_data, flow_state, cli)
 
-    def condition(self) -> bool:
-        return self.mint_status.pending
+class MintExecuteRandomMinting(ActionBundle):
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        return flow_state.mint_status.pending
 
     def action(self) -> None:
         # action logic
@@ -88,13 +94,16 @@ class MintExecuteRandomMinting(ActionBundle):
         dsc = DataStorageClient(self.user_data, action_type="mint")
         self.mint_id = mint_id
         self.record = dsc.get_record(mint_id)
-        # action logic continued
-        self.ca.mint_execute(mint_id, log_steps=True)
+        # action logic continued (if the proof is not ready yet, it is only requested)
+        self.executed = self.ca.mint_execute(mint_id, log_steps=True, wait=False)
 
     @property
     def expected_state(self) -> "FlowState":
         # balances
         new_balances = self.balances.copy()
+        if not self.executed:
+            new_balances.subtract_fees(self.ca.fee_tracker)
+            return self.flow_state.replace([new_balances])
         new_balances[self.token_fasset] += self.lot_size * self.record["lots"]
         new_balances.subtract_fees(self.ca.fee_tracker)
         # mint status
@@ -102,23 +111,21 @@ class MintExecuteRandomMinting(ActionBundle):
         new_mint_status.pending.remove(self.mint_id)
         return self.flow_state.replace([new_balances, new_mint_status])
 
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_underlying, self.token_fasset, self.token_native],
+            tokens=[context.token_underlying, context.token_fasset, context.token_native],
             mint_status=True
         )
-    
+
 
 class MintRandomAgentRandomAmountBlockUnderlying(MintRandomAgentRandomAmount):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool):
-        if cli:
-            raise Exception("MintRandomAgentRandomAmountBlockUnderlying is not available in CLI mode.")
-        super().__init__(user_data, flow_state, cli)
+    cli_available = False
 
     def action(self) -> None:
         sm = self.ca.sm
         sm.block_underlying_deposits()
         try:
             super().action()
-        finally:    
-            sm.unblock_underlying_deposits()
\ No newline at end of file
+        finally:
+            sm.unblock_underlying_deposits()
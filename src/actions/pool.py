@@ -6,15 +6,14 @@ from src.actions.action_bundle import ActionBundle
 from src.actions.helper_functions import random_decimal_between, add_max_amount_to_stay_above_exit_CR, can_enter_pool, collateral_to_tokens, tokens_to_collateral
 from src.utils.data_structures import PoolHolding, RelevantInfo
 if TYPE_CHECKING:
+    from src.actions.action_bundle import BundleContext
     from src.utils.data_structures import FlowState
 
 
 class EnterRandomPoolRandomAmount(ActionBundle):
-    def __init__(self, user_data, flow_state, cli):
-        super().__init__(user_data, flow_state, cli)
-
-    def condition(self) -> bool:
-        return can_enter_pool(self.balances, self.token_native)
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        return can_enter_pool(flow_state.balances, context.token_native)
 
     def action(self) -> None:
         # action logic
@@ -49,20 +48,20 @@ class EnterRandomPoolRandomAmount(ActionBundle):
             ))
         return self.flow_state.replace([new_balances, new_pool_holdings])
 
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_native, self.token_fasset],
+            tokens=[context.token_native, context.token_fasset],
             pool_holdings=True
         )
 
 
 class ExitRandomPoolRandomAmount(ActionBundle):
-    def __init__(self, user_data, flow_state, cli):
-        super().__init__(user_data, flow_state, cli)
-
-    def condition(self) -> bool:
-        self.pool_holdings = add_max_amount_to_stay_above_exit_CR(self.pool_holdings, self.native_network, self.token_fasset)
-        for pool_holding in self.pool_holdings:
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        # sets max_amount_to_exit on the pool holdings of flow_state, used by action
+        pool_holdings = add_max_amount_to_stay_above_exit_CR(flow_state.pool_holdings, context.native_network, context.token_fasset)
+        for pool_holding in pool_holdings:
             if pool_holding.max_amount_to_exit > 0:
                 return True
         return False
@@ -94,19 +93,18 @@ class ExitRandomPoolRandomAmount(ActionBundle):
                 pool_holding.max_amount_to_exit = None
         return self.flow_state.replace([new_balances, new_pool_holdings])
 
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_native, self.token_fasset],
+            tokens=[context.token_native, context.token_fasset],
             pool_holdings=True
         )
 
 
 class WithdrawPoolFeesRandomPool(ActionBundle):
-    def __init__(self, user_data, flow_state, cli):
-        super().__init__(user_data, flow_state, cli)
-
-    def condition(self) -> bool:
-        return [ph for ph in self.pool_holdings if ph.fasset_fees > 0]
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        return [ph for ph in flow_state.pool_holdings if ph.fasset_fees > 0]
 
     def action(self) -> None:
         # action logic
@@ -133,8 +131,9 @@ class WithdrawPoolFeesRandomPool(ActionBundle):
                 pool_holding.fasset_fees -= self.amount
         return self.flow_state.replace([new_balances, new_pool_holdings])
 
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_native, self.token_fasset],
+            tokens=[context.token_native, context.token_fasset],
             pool_holdings=True
         )
\ No newline at end of file
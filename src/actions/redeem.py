@@ -5,16 +5,15 @@ from src.interfaces.contracts.asset_manager import AssetManager
 from src.actions.action_bundle import ActionBundle
 from src.utils.data_structures import RelevantInfo
 if TYPE_CHECKING:
+    from src.actions.action_bundle import BundleContext
     from src.utils.data_structures import FlowState
 
 
 class RedeemRandomAmount(ActionBundle):
-    def __init__(self, user_data, flow_state, cli):
-        super().__init__(user_data, flow_state, cli)
-
-    def condition(self) -> bool:
-        if self.token_fasset in self.balances: 
-            return self.balances[self.token_fasset] >= self.lot_size
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        if context.token_fasset in flow_state.balances: 
+            return flow_state.balances[context.token_fasset] >= context.lot_size
         return False
 
     def action(self) -> None:
@@ -39,18 +38,17 @@ class RedeemRandomAmount(ActionBundle):
         new_redemption_status.pending.extend(redemption_ids)
         return self.flow_state.replace([new_balances, new_redemption_status])
 
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_underlying, self.token_native, self.token_fasset],
+            tokens=[context.token_underlying, context.token_native, context.token_fasset],
             redemption_status=True
         )
 
 class RedeemDefaultRandomRedemption(ActionBundle):
-    def __init__(self, user_data, flow_state, cli):
-        super().__init__(user_data, flow_state, cli)
-
-    def condition(self) -> bool:
-        return self.redemption_status.default
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        return flow_state.redemption_status.default
 
     def action(self) -> None:
         # action logic
@@ -59,15 +57,18 @@ class RedeemDefaultRandomRedemption(ActionBundle):
         dsc = DataStorageClient(self.user_data, "redeem")
         self.record = dsc.get_record(redemption_id)
         self.redemption_id = redemption_id
-        # action logic continued
-        self.ca.redeem_default(redemption_id, log_steps=True)
+        # action logic continued (if the proof is not ready yet, it is only requested)
+        self.executed = self.ca.redeem_default(redemption_id, log_steps=True, wait=False)
 
     @property
     def expected_state(self) -> "FlowState":
         # balances
+        new_balances = self.balances.copy()
+        if not self.executed:
+            new_balances.subtract_fees(self.ca.fee_tracker)
+            return self.flow_state.replace([new_balances])
         lot_amount = self.record["lots"]
         redemption_fee = AssetManager(self.native_network, self.token_fasset).redemption_fee()
-        new_balances = self.balances.copy()
         new_balances[self.token_underlying] += self.lot_size * lot_amount * (1 - redemption_fee)
         new_balances.subtract_fees(self.ca.fee_tracker)
         # redemption status
@@ -75,17 +76,15 @@ class RedeemDefaultRandomRedemption(ActionBundle):
         new_redemption_status.default.remove(self.redemption_id)
         return self.flow_state.replace([new_balances, new_redemption_status])
     
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_underlying, self.token_native, self.token_fasset],
+            tokens=[context.token_underlying, context.token_native, context.token_fasset],
             redemption_status=True
         )
 
 class RedeemDefaultRandomRedemptionBlockUnderlying(RedeemDefaultRandomRedemption):
-    def __init__(self, user_data, flow_state, cli):
-        if cli:
-            raise Exception("RedeemDefaultRandomRedemptionBlockUnderlying is not available in CLI mode.")
-        super().__init__(user_data, flow_state, cli)
+    cli_available = False
 
     def action(self) -> None:
         sm = self.ca.sm
@@ -98,14 +97,17 @@ class RedeemDefaultRandomRedemptionBlockUnderlying(RedeemDefaultRandomRedemption
     @property
     def expected_state(self) -> "FlowState":
         normal_expected_state = super().expected_state
+        if not self.executed:
+            return normal_expected_state
         redemption_fee = AssetManager(self.native_network, self.token_fasset).redemption_fee()
         lot_amount = self.record["lots"]
         new_balances = normal_expected_state.balances.copy()
         new_balances[self.token_underlying] += self.lot_size * lot_amount * (1 - redemption_fee)
         return normal_expected_state.replace([new_balances])
     
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_underlying, self.token_native, self.token_fasset],
+            tokens=[context.token_underlying, context.token_native, context.token_fasset],
             redemption_status=True
         )
\ No newline at end of file
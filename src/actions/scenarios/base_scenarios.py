@@ -9,28 +9,28 @@ from src.utils.data_structures import RelevantInfo
 from src.utils.data_storage import DataStorageClient
 if TYPE_CHECKING:
     from interfaces.network.tokens import TokenExternalFAsset
-    from src.utils.data_structures import UserData
+    from src.actions.action_bundle import BundleContext
     from src.utils.data_structures import FlowState
 
 # TODO: remove caps also at bridge.py
 
 class ScenarioMintBridge(ActionBundle):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool, token_external: "TokenExternalFAsset"):
-        if cli:
-            raise Exception(f"{self.__class__.__name__} is not available in CLI mode.")
-        super().__init__(user_data, flow_state, cli)
-        self.token_external = token_external
-        self.external_network = token_external.network
-
-    def condition(self) -> bool:
-        self.agents_dict = self.ca.get_agents()
-        mint_condition = can_mint(self.balances, self.token_underlying, self.lot_size, self.agents_dict)
-        bridge_to_condition = self.balances[self.token_native] >= BRIDGE_FEE[self.token_native]
+    cli_available = False
+    token_external : "TokenExternalFAsset"
+
+    def __init__(self, context: "BundleContext", flow_state: "FlowState"):
+        super().__init__(context, flow_state)
+        self.external_network = self.token_external.network
+
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        mint_condition = can_mint(flow_state.balances, context.token_underlying, context.lot_size, context.ca.get_agents())
+        bridge_to_condition = flow_state.balances[context.token_native] >= BRIDGE_FEE[context.token_native]
         return mint_condition and bridge_to_condition
 
     def action(self) -> None:
         # mint
-        agents = [agent for agent in self.agents_dict if agent.max_lots >= 1]
+        agents = [agent for agent in self.ca.get_agents() if agent.max_lots >= 1]
         agent = random.choice(agents)
         possible_lots = int(self.balances[self.token_underlying] // self.lot_size)
         max_lots = min(agent.max_lots, possible_lots)
@@ -54,31 +54,34 @@ class ScenarioMintBridge(ActionBundle):
         new_balances.subtract_fees(self.ca.fee_tracker)
         return self.flow_state.replace([new_balances])
     
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_underlying, self.token_native, self.token_fasset, self.token_external, self.external_network.coin],
-            mint_status=True
+            tokens=[context.token_underlying, context.token_native, context.token_fasset, cls.token_external, cls.token_external.network.coin],
+            mint_status=True,
+            agents=True
         )
     
 
 class ScenarioMintBridgeBridge(ActionBundle):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool, token_external: "TokenExternalFAsset"):
-        if cli:
-            raise Exception(f"{self.__class__.__name__} is not available in CLI mode.")
-        super().__init__(user_data, flow_state, cli)
-        self.token_external = token_external
-        self.external_network = token_external.network
+    cli_available = False
+    token_external : "TokenExternalFAsset"
+
+    def __init__(self, context: "BundleContext", flow_state: "FlowState"):
+        super().__init__(context, flow_state)
+        self.external_network = self.token_external.network
     
-    def condition(self) -> bool:
-        self.agents_dict = self.ca.get_agents()
-        mint_condition = can_mint(self.balances, self.token_underlying, self.lot_size, self.agents_dict)
-        bridge_to_condition = self.balances[self.token_native] >= BRIDGE_FEE[self.token_native]
-        bridge_from_condition = self.balances[self.external_network.coin] >= BRIDGE_FEE[self.external_network.coin]
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        external_coin = cls.token_external.network.coin
+        mint_condition = can_mint(flow_state.balances, context.token_underlying, context.lot_size, context.ca.get_agents())
+        bridge_to_condition = flow_state.balances[context.token_native] >= BRIDGE_FEE[context.token_native]
+        bridge_from_condition = flow_state.balances[external_coin] >= BRIDGE_FEE[external_coin]
         return mint_condition and bridge_to_condition and bridge_from_condition
     
     def action(self) -> None:
         # mint
-        agents = [agent for agent in self.agents_dict if agent.max_lots >= 1]
+        agents = [agent for agent in self.ca.get_agents() if agent.max_lots >= 1]
         agent = random.choice(agents)
         possible_lots = int(self.balances[self.token_underlying] // self.lot_size)
         max_lots = min(agent.max_lots, possible_lots)
@@ -106,31 +109,34 @@ class ScenarioMintBridgeBridge(ActionBundle):
         new_balances.subtract_fees(self.ca.fee_tracker)
         return self.flow_state.replace([new_balances])
 
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_underlying, self.token_native, self.token_fasset, self.token_external, self.external_network.coin],
-            mint_status=True
+            tokens=[context.token_underlying, context.token_native, context.token_fasset, cls.token_external, cls.token_external.network.coin],
+            mint_status=True,
+            agents=True
         )
     
 
 class ScenarioMintBridgeBridgeRedeem(ActionBundle):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool, token_external: "TokenExternalFAsset"):
-        if cli:
-            raise Exception(f"{self.__class__.__name__} is not available in CLI mode.")
-        super().__init__(user_data, flow_state, cli)
-        self.token_external = token_external
-        self.external_network = token_external.network
+    cli_available = False
+    token_external : "TokenExternalFAsset"
+
+    def __init__(self, context: "BundleContext", flow_state: "FlowState"):
+        super().__init__(context, flow_state)
+        self.external_network = self.token_external.network
     
-    def condition(self) -> bool:
-        self.agents_dict = self.ca.get_agents()
-        mint_condition = can_mint(self.balances, self.token_underlying, self.lot_size, self.agents_dict)
-        bridge_to_condition = self.balances[self.token_native] >= BRIDGE_FEE[self.token_native]
-        bridge_from_condition = self.balances[self.external_network.coin] >= BRIDGE_FEE[self.external_network.coin]
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        external_coin = cls.token_external.network.coin
+        mint_condition = can_mint(flow_state.balances, context.token_underlying, context.lot_size, context.ca.get_agents())
+        bridge_to_condition = flow_state.balances[context.token_native] >= BRIDGE_FEE[context.token_native]
+        bridge_from_condition = flow_state.balances[external_coin] >= BRIDGE_FEE[external_coin]
         return mint_condition and bridge_to_condition and bridge_from_condition
 
     def action(self) -> None:
         # mint
-        agents = [agent for agent in self.agents_dict if agent.max_lots >= 1]
+        agents = [agent for agent in self.ca.get_agents() if agent.max_lots >= 1]
         agent = random.choice(agents)
         possible_lots = int(self.balances[self.token_underlying] // self.lot_size)
         max_lots = min(agent.max_lots, possible_lots)
@@ -167,32 +173,35 @@ class ScenarioMintBridgeBridgeRedeem(ActionBundle):
         new_redemption_status.pending.extend(redemption_ids)
         return self.flow_state.replace([new_balances, new_redemption_status])
 
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_underlying, self.token_native, self.token_fasset, self.token_external, self.external_network.coin],
+            tokens=[context.token_underlying, context.token_native, context.token_fasset, cls.token_external, cls.token_external.network.coin],
             mint_status=True,
-            redemption_status=True
+            redemption_status=True,
+            agents=True
         )
 
 
 class ScenarioMintBridgeAutoRedeem(ActionBundle):
-    def __init__(self, user_data: "UserData", flow_state: "FlowState", cli: bool, token_external: "TokenExternalFAsset"):
-        if cli:
-            raise Exception(f"{self.__class__.__name__} is not available in CLI mode.")
-        super().__init__(user_data, flow_state, cli)
-        self.token_external = token_external
-        self.external_network = token_external.network
+    cli_available = False
+    token_external : "TokenExternalFAsset"
+
+    def __init__(self, context: "BundleContext", flow_state: "FlowState"):
+        super().__init__(context, flow_state)
+        self.external_network = self.token_external.network
     
-    def condition(self) -> bool:
-        self.agents_dict = self.ca.get_agents()
-        mint_condition = can_mint(self.balances, self.token_underlying, self.lot_size, self.agents_dict)
-        bridge_to_condition = self.balances[self.token_native] >= BRIDGE_FEE[self.token_native]
-        auto_redeem_condition = self.balances[self.external_network.coin] >= BRIDGE_FEE[self.external_network.coin]
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        external_coin = cls.token_external.network.coin
+        mint_condition = can_mint(flow_state.balances, context.token_underlying, context.lot_size, context.ca.get_agents())
+        bridge_to_condition = flow_state.balances[context.token_native] >= BRIDGE_FEE[context.token_native]
+        auto_redeem_condition = flow_state.balances[external_coin] >= BRIDGE_FEE[external_coin]
         return mint_condition and bridge_to_condition and auto_redeem_condition
     
     def action(self) -> None:
         # mint
-        agents = [agent for agent in self.agents_dict if agent.max_lots >= 1]
+        agents = [agent for agent in self.ca.get_agents() if agent.max_lots >= 1]
         agent = random.choice(agents)
         possible_lots = int(self.balances[self.token_underlying] // self.lot_size)
         max_lots = min(agent.max_lots, possible_lots)
@@ -219,8 +228,10 @@ class ScenarioMintBridgeAutoRedeem(ActionBundle):
         new_balances.subtract_fees(self.ca.fee_tracker)
         return self.flow_state.replace([new_balances])
 
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_underlying, self.token_native, self.token_fasset, self.token_external, self.external_network.coin],
-            mint_status=True
+            tokens=[context.token_underlying, context.token_native, context.token_fasset, cls.token_external, cls.token_external.network.coin],
+            mint_status=True,
+            agents=True
         )
\ No newline at end of file
@@ -8,18 +8,20 @@ from src.interfaces.contracts import *
 from src.utils.data_storage import DataStorageClient
 from src.utils.data_structures import RelevantInfo
 if TYPE_CHECKING:
+    from src.actions.action_bundle import BundleContext
     from src.utils.data_structures import FlowState
 
 
 class Scenario1(ActionBundle):
-    def __init__(self, user_data, flow_state, cli):
-        super().__init__(user_data, flow_state, cli)
+    def __init__(self, context: "BundleContext", flow_state: "FlowState"):
+        super().__init__(context, flow_state)
         self.agents = self.ca.get_agents()
 
 
-    def condition(self) -> bool:
-        enter_pool_condition = can_enter_pool(self.balances, self.token_native)
-        mint_condition = can_mint(self.balances, self.token_underlying, self.lot_size, self.agents)
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        enter_pool_condition = can_enter_pool(flow_state.balances, context.token_native)
+        mint_condition = can_mint(flow_state.balances, context.token_underlying, context.lot_size, context.ca.get_agents())
         return enter_pool_condition and mint_condition
 
 
@@ -110,10 +112,12 @@ class Scenario1(ActionBundle):
             ]
     
     
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_underlying, self.token_native, self.token_fasset],
+            tokens=[context.token_underlying, context.token_native, context.token_fasset],
             mint_status=True,
             redemption_status=True,
-            pool_holdings=True
+            pool_holdings=True,
+            agents=True
         )
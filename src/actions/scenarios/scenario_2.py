@@ -7,19 +7,18 @@ from src.actions.helper_functions import can_enter_pool, collateral_to_tokens, r
 from src.interfaces.contracts import *
 from src.utils.data_structures import PoolHolding, RelevantInfo
 if TYPE_CHECKING:
+    from src.actions.action_bundle import BundleContext
     from src.utils.data_structures import FlowState
 
 
 class Scenario2(ActionBundle):
-    def __init__(self, user_data, flow_state, cli):
-        if cli:
-            raise Exception("Scenario2 is not available in CLI mode.")
-        super().__init__(user_data, flow_state, cli)
-        self.partner_involved = True
+    cli_available = False
+    partner_involved = True
     
 
-    def condition(self) -> bool:
-        return can_enter_pool(self.balances, self.token_underlying)
+    @classmethod
+    def condition(cls, context: "BundleContext", flow_state: "FlowState") -> bool:
+        return can_enter_pool(flow_state.balances, context.token_underlying)
 
 
     def action(self) -> None:
@@ -127,8 +126,9 @@ class Scenario2(ActionBundle):
         return self.partner_flow_state.replace([new_balances, new_pool_holdings])
     
 
-    def relevant_info(self) -> "RelevantInfo":
+    @classmethod
+    def relevant_info(cls, context: "BundleContext") -> "RelevantInfo":
         return RelevantInfo(
-            tokens=[self.token_native, self.token_fasset],
+            tokens=[context.token_native, context.token_fasset],
             pool_holdings=True
         )
\ No newline at end of file
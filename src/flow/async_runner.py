@@ -0,0 +1,69 @@
+import asyncio
+import random
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+import toml
+if TYPE_CHECKING:
+    from src.flow.flow import Flow
+
+config = toml.load("config.toml")
+concurrency : int = config["flow"]["concurrency"]
+
+
+class AsyncFlowRunner():
+    """
+    Runs flows of many users in one event loop.
+    Flow steps (action bundles, core actions) are blocking, so each step is run in a worker thread,
+    with at most `concurrency` steps running at the same time.
+    Waiting between steps is done in the event loop and does not hold a thread.
+    """
+    def __init__(
+            self,
+            flows: list["Flow"],
+            concurrency: int = concurrency,
+            start_delay: tuple[float, float] = (3, 3.5)
+        ):
+        self.flows = flows
+        self.concurrency = concurrency
+        self.start_delay = start_delay
+
+    async def _run_flow(
+            self,
+            flow: "Flow",
+            delay: float,
+            semaphore: asyncio.Semaphore,
+            executor: ThreadPoolExecutor
+        ) -> None:
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(delay)
+        flow._start()
+        while True:
+            async with semaphore:
+                try:
+                    successful = await loop.run_in_executor(executor, flow._step)
+                except Exception as e:
+                    flow._log(
+                        f"----- Flow stopped with exception: {e} -----\n{traceback.format_exc()}",
+                        level="error"
+                    )
+                    return
+            await asyncio.sleep(flow.time_wait)
+            if flow._finish_step(successful):
+                return
+
+    async def _run(self, executor: ThreadPoolExecutor) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = []
+        delay = 0
+        for flow in self.flows:
+            delay += random.uniform(*self.start_delay)
+            tasks.append(self._run_flow(flow, delay, semaphore, executor))
+        await asyncio.gather(*tasks)
+
+    def run(self) -> None:
+        """
+        Runs all flows until they finish.
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="flow") as executor:
+            asyncio.run(self._run(executor))
@@ -24,6 +24,10 @@ class FeeTracker:
                 self.other_fees[token] = Decimal(0)
             self.other_fees[token] += other_fees
 
+    def reset(self) -> None:
+        self.gas_fees = {}
+        self.other_fees = {}
+
     def get_fees(self, token: "Coin") -> Decimal:
         """
         Return total accumulated fees (gas + other) for the given token.
@@ -2,8 +2,10 @@ import traceback
 import random
 import time
 from typing import TYPE_CHECKING, Literal, Optional
-from src.actions.core_actions.core_actions import core_actions
 from src.actions import ACTION_BUNDLE_CLASSES
+from src.actions.action_bundle import BundleContext
+from src.flow.snapshot_executor import get_snapshot_executor
+from src.interfaces.contracts.read_cache import get_read_cache, read_cache_enabled
 from src.utils.data_structures import RelevantInfo, FlowState
 if TYPE_CHECKING:
     from src.actions.action_bundle import ActionBundle
@@ -46,26 +48,22 @@ class Flow():
         self.total_time = total_time
         self.time_wait = time_wait
 
-        # core actions for logging and state retrieval
-        self.ca = core_actions(user_data, cli)
-        self.ca_partner = core_actions(self.partner_data, cli)
+        # context shared by all action bundles, its core actions are also used for logging and state retrieval
+        self.context = BundleContext(user_data, cli)
+        self.ca = self.context.ca
+        self.ca_partner = self.context.ca_partner
 
         # relevant info for state retrieval
-        action_bunldes : list["ActionBundle"] = []
-        for cls in ACTION_BUNDLE_CLASSES:
-            if cls.__name__ in self.actions:
-                action_params = self.action_params.get(cls.__name__, {})
-                bundle = cls(
-                        self.user_data,
-                        FlowState.new(),
-                        self.cli,
-                        **action_params
-                    )
-                action_bunldes.append(bundle)
+        self.bundle_classes : list[type["ActionBundle"]] = [
+            cls for cls in ACTION_BUNDLE_CLASSES if cls.__name__ in self.actions
+        ]
+        for cls in self.bundle_classes:
+            cls.check_available(cli)
         self.relevant_info = RelevantInfo.union([
-            ab.relevant_info()
-            for ab in action_bunldes if ab.__class__.__name__ in actions
+            cls.relevant_info(self.context) for cls in self.bundle_classes
             ])
+        # the partner state is read together with the user state if any bundle may need it
+        self.partner_involved = any(cls.partner_involved for cls in self.bundle_classes)
 
     def _log(
             self, 
@@ -77,49 +75,69 @@ class Flow():
             self.ca_partner.log(message, level)
 
     @staticmethod
-    def _flow_state(ca: "CoreActions", relevant_info: "RelevantInfo", log_steps: bool) -> "FlowState":
-        flow_state = FlowState(ca.get_balances(relevant_info.tokens, log_steps))
-        if relevant_info.mint_status:
-            flow_state.mint_status = ca.get_mint_status(log_steps)
-        if relevant_info.redemption_status:
-            flow_state.redemption_status = ca.get_redemption_status(log_steps)
-        if relevant_info.pool_holdings:
-            flow_state.pool_holdings = ca.get_pool_holdings(log_steps)
-        return flow_state
+    def _flow_states(cas: list["CoreActions"], relevant_info: "RelevantInfo", log_steps: bool) -> list["FlowState"]:
+        """
+        Reads the states of all given users, each with all reads pinned to the same native block and underlying ledger.
+        Snapshot blocks, and then all independent reads of all users, are run concurrently on the shared snapshot executor.
+        Cached agents are synced to the newest snapshot block in the meantime, so that bundle conditions
+        do not see agents older than the snapshot.
+        """
+        executor = get_snapshot_executor()
+        snapshot_blocks = [future.result() for future in [executor.submit(ca.get_snapshot_blocks) for ca in cas]]
+        reads = []
+        for ca, (block, ledger_index) in zip(cas, snapshot_blocks):
+            futures = {"balances": executor.submit(ca.get_balances, relevant_info.tokens, log_steps, block, ledger_index)}
+            if relevant_info.mint_status:
+                futures["mint_status"] = executor.submit(ca.get_mint_status, log_steps)
+            if relevant_info.redemption_status:
+                futures["redemption_status"] = executor.submit(ca.get_redemption_status, log_steps, block, ledger_index)
+            if relevant_info.pool_holdings:
+                futures["pool_holdings"] = executor.submit(ca.get_pool_holdings, log_steps, block)
+            reads.append(futures)
+        blocks = [block for block, _ in snapshot_blocks if block is not None]
+        if relevant_info.agents and blocks:
+            # agents are shared by all users, syncing them once is enough
+            cas[0].sync_agents(max(blocks))
+        flow_states = []
+        for (block, ledger_index), futures in zip(snapshot_blocks, reads):
+            flow_state = FlowState(futures.pop("balances").result(), block=block, ledger_index=ledger_index)
+            for name, future in futures.items():
+                setattr(flow_state, name, future.result())
+            flow_states.append(flow_state)
+        return flow_states
 
-    def _update_flow_state(self, log_steps: bool = True) -> None:
-        self.flow_state = self._flow_state(self.ca, self.relevant_info, log_steps)
-
-    def _get_partner_flow_state(self, log_steps: bool = True) -> "FlowState":
-        return self._flow_state(self.ca_partner, self.relevant_info, log_steps)
+    def _update_flow_state(self, log_steps: bool = True, partner: bool = False) -> Optional["FlowState"]:
+        """
+        Updates the user's flow state. With partner, the partner's state is read concurrently and returned.
+        """
+        cas = [self.ca, self.ca_partner] if partner else [self.ca]
+        flow_states = self._flow_states(cas, self.relevant_info, log_steps)
+        self.flow_state = flow_states[0]
+        return flow_states[1] if partner else None
     
     def _step(self) -> Optional[bool] :
-        self._update_flow_state()
+        partner_flow_state = self._update_flow_state(partner=self.partner_involved)
 
-        action_bundles = []
-        for cls in ACTION_BUNDLE_CLASSES:
-            if cls.__name__ in self.actions:
-                action_params = self.action_params.get(cls.__name__, {})
-                bundle = cls(
-                        self.user_data,
-                        self.flow_state,
-                        self.cli,
-                        **action_params
-                    )
-                if bundle.general_conditions() and bundle.condition():
-                    action_bundles.append(bundle)
+        bundle_classes = [
+            cls for cls in self.bundle_classes
+            if cls.general_conditions(self.context, self.flow_state)
+            and cls.condition(self.context, self.flow_state, **self.action_params.get(cls.__name__, {}))
+        ]
         
-        if not action_bundles:
+        if not bundle_classes:
             self._log("-- No action can be executed at this time. --", level="info")
             return None
 
         else:
-            bundle : "ActionBundle" = random.choice(action_bundles)
+            cls = random.choice(bundle_classes)
+            # fees of earlier (failed) actions must not be attributed to this one
+            self.ca.fee_tracker.reset()
+            self.ca_partner.fee_tracker.reset()
+            bundle : "ActionBundle" = cls(self.context, self.flow_state, **self.action_params.get(cls.__name__, {}))
             self._log(f"-- Executing action {bundle.__class__.__name__} --", level="info")
             
             successful = True
             if bundle.partner_involved:
-                partner_flow_state = self._get_partner_flow_state()
                 bundle.update_partner_flow_state(partner_flow_state)
             try:
                 bundle.action()
@@ -132,10 +150,9 @@ class Flow():
             
             if successful:
                 expected_state = bundle.expected_state
-                self._update_flow_state(log_steps=False)
+                partner_flow_state = self._update_flow_state(log_steps=False, partner=bundle.partner_involved)
                 state_mismatches = self.flow_state.compare(expected_state)
                 if bundle.partner_involved:
-                    partner_flow_state = self._get_partner_flow_state(log_steps=False)
                     partner_expected_state = bundle.partner_expected_state
                     partner_state_mismatches = partner_flow_state.compare(partner_expected_state)
                 else:
@@ -156,29 +173,47 @@ class Flow():
                                 )
             return successful
 
-    def run(self) -> None:
+    def _start(self) -> None:
         self._log(f"----- Starting flow. -----", level="info", partner=True)
         all_actions = len(ACTION_BUNDLE_CLASSES) == len(self.actions)
         if all_actions:
             self._log("----- All actions available. -----", level="info")
         else:
             self._log(f"----- Available actions: {', '.join(self.actions)}. -----", level="info")
-        successful_steps = 0
-        all_steps = 0
-        t = time.time()
+        self.successful_steps = 0
+        self.all_steps = 0
+        self._t = time.time()
+        self._read_cache_totals = get_read_cache().totals()
+
+    def _finish_step(self, successful: Optional[bool]) -> bool:
+        """
+        Records the result of a step (including the wait after it).
+        Returns True if the flow should stop.
+        """
+        if successful:
+            self.successful_steps += 1
+        if successful is not None:
+            self.all_steps += 1
+        if read_cache_enabled:
+            hits, misses = get_read_cache().totals()
+            last_hits, last_misses = self._read_cache_totals
+            self._read_cache_totals = (hits, misses)
+            self._log(f"--- Read cache (all users): {hits - last_hits} eth_calls saved, {misses - last_misses} misses. ---", level="info")
+        if self.total_time:
+            self.total_time -= time.time() - self._t
+            self._t = time.time()
+            if self.total_time <= 0:
+                self._log("--- Total time reached, stopping flow. ---", level="info", partner=True)
+                self._log(f"----- Flow finished. Successful steps: {self.successful_steps}/{self.all_steps} -----", level="info")
+                return True
+            else:
+                self._log(f"--- Step finished, time left: {self.total_time:.2f} seconds. ---", level="info")
+        return False
+
+    def run(self) -> None:
+        self._start()
         while True:
             successful = self._step()
             time.sleep(self.time_wait)
-            if successful:
-                successful_steps += 1
-            if successful is not None:
-                all_steps += 1
-            if self.total_time:
-                self.total_time -= time.time() - t
-                t = time.time()
-                if self.total_time <= 0:
-                    self._log("--- Total time reached, stopping flow. ---", level="info", partner=True)
-                    self._log(f"----- Flow finished. Successful steps: {successful_steps}/{all_steps} -----", level="info")
-                    break
-                else:
-                    self._log(f"--- Step finished, time left: {self.total_time:.2f} seconds. ---", level="info")
\ No newline at end of file
+            if self._finish_step(successful):
+                break
@@ -0,0 +1,21 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import toml
+
+config = toml.load("config.toml")
+snapshot_workers : int = config["flow"]["snapshot_workers"]
+
+_lock = threading.Lock()
+_executor : Optional[ThreadPoolExecutor] = None
+
+def get_snapshot_executor() -> ThreadPoolExecutor:
+    """
+    Returns the process-wide worker pool for state snapshot reads, shared by all flows.
+    Tasks submitted to it must not wait for other tasks of the pool, so that a full pool cannot deadlock.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=snapshot_workers, thread_name_prefix="snapshot")
+        return _executor
@@ -8,4 +8,5 @@ from .fdc_hub import FdcHub
 from .fdc_request_fee_configurations import FdcRequestFeeConfigurations
 from .relay import Relay
 from .fasset import FAsset
-from .fasset_oft_adapter import FAssetOFTAdapter
\ No newline at end of file
+from .fasset_oft_adapter import FAssetOFTAdapter
+from .multicall3 import Multicall3, read_batch
\ No newline at end of file
@@ -0,0 +1,139 @@
+import threading
+import time
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Optional
+import toml
+from .agent_vault import AgentVault
+from .asset_manager import AssetManager
+from .contract_metadata import get_contract_metadata
+from .multicall3 import read_batch
+from src.utils.data_structures import AgentInfo
+if TYPE_CHECKING:
+    from src.interfaces.network.networks.native_networks.native_network import NativeNetwork
+    from src.interfaces.network.tokens import TokenFAsset
+
+config = toml.load("config.toml")
+ttl : float = config["agents"]["ttl"]
+page_size : int = config["agents"]["page_size"]
+
+
+class AgentRegistry():
+    """
+    Available agents of one fasset, shared by all users of the process.
+    The list is refreshed in one paginated sweep, pinned to one block, at most once per ttl seconds
+    and only if a new block was produced since the last sweep.
+    Readers that pin their state to a block (flow snapshots) pass it, and the list is swept again
+    at once if that block is newer than the last swept one.
+    Indexes by fee and by free lots are rebuilt only when the swept list changes.
+    """
+    def __init__(self, native_network: "NativeNetwork", token_fasset: "TokenFAsset"):
+        self.native_network = native_network
+        self.am = AssetManager(native_network, token_fasset)
+        self._lock = threading.Lock()
+        self._block : Optional[int] = None
+        self._refreshed_at : float = 0
+        self._agents : list[dict[str, Any]] = []
+        self._agent_infos : list[AgentInfo] = []
+        self._by_fee : list[AgentInfo] = []
+        self._by_free_lots : list[AgentInfo] = []
+
+    def _sweep(self, block: int) -> list[dict[str, Any]]:
+        agents = []
+        start = 0
+        while True:
+            new = self.am.get_available_agents_detailed_list(start, start + page_size, block)
+            agents.extend(new)
+            if len(new) < page_size:
+                break
+            start += len(new)
+        return agents
+
+    def _index(self, agents: list[dict[str, Any]]) -> None:
+        self._agents = agents
+        self._agent_infos = [
+            AgentInfo(
+                address=agent["agentVault"],
+                max_lots=agent["freeCollateralLots"],
+                fee=Decimal(agent["feeBIPS"] / 1e4)
+            )
+            for agent in agents
+        ]
+        self._by_fee = sorted(self._agent_infos, key=lambda agent: agent.fee)
+        self._by_free_lots = sorted(self._agent_infos, key=lambda agent: agent.max_lots, reverse=True)
+
+    def _refresh(self, block: Optional[int] = None) -> None:
+        if block is not None and self._block is not None and block <= self._block:
+            return
+        if block is None:
+            if time.time() - self._refreshed_at < ttl:
+                return
+            block = self.am.web3.eth.block_number
+        if self._block is None or block > self._block:
+            agents = self._sweep(block)
+            if agents != self._agents:
+                self._index(agents)
+            self._block = block
+        self._refreshed_at = time.time()
+
+    def refresh(self, block: int) -> None:
+        """
+        Sweeps the list at block if it is newer than the last swept block.
+        """
+        with self._lock:
+            self._refresh(block)
+
+    def agents(self, block: Optional[int] = None) -> list[AgentInfo]:
+        """
+        Available agents, swept at block or later if block is given.
+        """
+        with self._lock:
+            self._refresh(block)
+            return list(self._agent_infos)
+
+    def agents_by_fee(self, block: Optional[int] = None) -> list[AgentInfo]:
+        """
+        Available agents sorted by ascending fee.
+        """
+        with self._lock:
+            self._refresh(block)
+            return list(self._by_fee)
+
+    def agents_by_free_lots(self, block: Optional[int] = None) -> list[AgentInfo]:
+        """
+        Available agents sorted by descending number of free lots.
+        """
+        with self._lock:
+            self._refresh(block)
+            return list(self._by_free_lots)
+
+    def collateral_pools(self, block: Optional[int] = None) -> list[str]:
+        """
+        Collateral pools of available agents (swept at block or later if block is given), taken from the contract metadata.
+        Pools of new agents are read in one batched call.
+        """
+        with self._lock:
+            self._refresh(block)
+            agent_vaults = [agent["agentVault"] for agent in self._agents]
+        return get_contract_metadata().get_many(
+            self.native_network, agent_vaults, "collateralPool",
+            lambda vaults: read_batch(
+                self.native_network,
+                [AgentVault(self.native_network, vault).batch_call("collateralPool") for vault in vaults]
+            )
+        )
+
+
+_lock = threading.Lock()
+_agent_registries : dict[tuple[str, str], AgentRegistry] = {}
+
+def get_agent_registry(native_network: "NativeNetwork", token_fasset: "TokenFAsset") -> AgentRegistry:
+    """
+    Returns the process-wide agent registry for the given fasset.
+    """
+    key = (native_network.__name__, token_fasset.name)
+    with _lock:
+        agent_registry = _agent_registries.get(key)
+        if agent_registry is None:
+            agent_registry = AgentRegistry(native_network, token_fasset)
+            _agent_registries[key] = agent_registry
+        return agent_registry
@@ -19,4 +19,4 @@ class AgentVault(ContractClient):
         super().__init__(names, network, vault_address, sender_credentials=sender_credentials, fee_tracker=fee_tracker)
 
     def collateral_pool(self) -> str:
-        return self.read("collateralPool")
\ No newline at end of file
+        return self.read_immutable("collateralPool")
\ No newline at end of file
@@ -1,12 +1,15 @@
 from decimal import Decimal
 from typing import Any, Optional, TYPE_CHECKING
 from .contract_client import ContractClient
+from .multicall3 import read_batch
+from .asset_manager_settings import AssetManagerSettings, get_asset_manager_settings
 from src.utils.contracts import get_contract_names, get_output_index
 if TYPE_CHECKING:
     from src.interfaces.network.networks.native_networks.native_network import NativeNetwork
     from src.utils.data_structures import UserCredentials
     from src.flow.fee_tracker import FeeTracker
     from src.interfaces.network.tokens import TokenFAsset
+    from web3.types import BlockIdentifier
 
 
 class AssetManager(ContractClient):
@@ -28,10 +31,11 @@ class AssetManager(ContractClient):
         idx = get_output_index(self.interface_name, "getAgentInfo", attribute)
         return agent_info[idx]
 
-    def get_available_agents_detailed_list(self, start: int, end: int) -> list[dict[str, Any]]:
+    def get_available_agents_detailed_list(self, start: int, end: int, block_identifier: "BlockIdentifier" = "latest") -> list[dict[str, Any]]:
         agent_list = self.read(
             "getAvailableAgentsDetailedList",
-            inputs=[start, end]
+            inputs=[start, end],
+            block_identifier=block_identifier
         )[0]
         idxs = {}
         fields = [
@@ -53,15 +57,17 @@ class AssetManager(ContractClient):
             result.append(agent_info)
         return result
 
+    def settings(self) -> AssetManagerSettings:
+        """
+        Returns the settings snapshot shared by all users (see AssetManagerSettingsCache).
+        """
+        return get_asset_manager_settings(self)
+
     def collateral_pool_token_timelock_seconds(self) -> int:
-        settings = self.read("getSettings")
-        idx = get_output_index(self.interface_name, "getSettings", "collateralPoolTokenTimelockSeconds")
-        return settings[idx]
+        return self.settings().collateral_pool_token_timelock_seconds
     
     def lot_size(self) -> int:
-        settings = self.read("getSettings")
-        idx = get_output_index(self.interface_name, "getSettings", "lotSizeAMG")
-        lot_size_uba = settings[idx]
+        lot_size_uba = self.settings().lot_size_amg
         return int(self.token_fasset.from_uba(lot_size_uba))
 
     def asset_price_nat_wei(self) -> dict[str, int]:
@@ -72,16 +78,11 @@ class AssetManager(ContractClient):
         }
     
     def redemption_fee(self) -> Decimal:
-        settings = self.read("getSettings")
-        idx = get_output_index(self.interface_name, "getSettings", "redemptionFeeBIPS")
-        fee_bips = settings[idx]
+        fee_bips = self.settings().redemption_fee_bips
         return Decimal(fee_bips / 1e4)
 
     def max_redeemed_tickets(self) -> int:
-        settings = self.read("getSettings")
-        idx = get_output_index(self.interface_name, "getSettings", "maxRedeemedTickets")
-        max_tickets = settings[idx]
-        return max_tickets
+        return self.settings().max_redeemed_tickets
 
     def get_fAssets_backed_by_pool(self, vault_address: str) -> int:
         return self.read(
@@ -144,6 +145,13 @@ class AssetManager(ContractClient):
         )
         return redemption_info
 
+    def redemption_request_infos(self, redemption_request_ids: list[int], block_identifier: "BlockIdentifier" = "latest") -> list[tuple]:
+        """
+        Get redemption request infos for many ids in one batched read.
+        """
+        calls = [self.batch_call("redemptionRequestInfo", [redemption_request_id]) for redemption_request_id in redemption_request_ids]
+        return read_batch(self.network, calls, block_identifier)
+
     def redemption_queue(self, first_redemption_ticket_id: int = 0, page_size: int = 10) -> list:
         """
         Get redemption queue starting from given ticket id.
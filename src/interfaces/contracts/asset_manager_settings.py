@@ -0,0 +1,101 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+import toml
+from src.utils.contracts import get_output_index
+if TYPE_CHECKING:
+    from .asset_manager import AssetManager
+
+config = toml.load("config.toml")
+ttl : float = config["asset_manager_settings"]["ttl"]
+poll_interval : float = config["asset_manager_settings"]["poll_interval"]
+max_block_range : int = config["events"]["max_block_range"]
+
+# asset manager events after which the settings are read again
+CHANGE_EVENTS = ["SettingChanged", "SettingArrayChanged", "ContractChanged"]
+
+
+@dataclass(frozen=True)
+class AssetManagerSettings:
+    block: int
+    lot_size_amg: int
+    redemption_fee_bips: int
+    max_redeemed_tickets: int
+    collateral_pool_token_timelock_seconds: int
+
+
+class AssetManagerSettingsCache():
+    """
+    Settings snapshot of one asset manager, shared by all users of the process.
+    The settings are read in full only at first use, after a SettingChanged, SettingArrayChanged
+    or ContractChanged event, and when ttl expires.
+    Change events are looked for at most once per poll_interval seconds, so most settings reads cost no request.
+    """
+    def __init__(self, am: "AssetManager"):
+        self.am = am
+        self._lock = threading.Lock()
+        self._settings : Optional[AssetManagerSettings] = None
+        self._read_time : float = 0
+        self._poll_time : float = 0
+        self._last_block : Optional[int] = None
+
+    def _read(self) -> None:
+        block = self.am.web3.eth.block_number
+        settings = self.am.read("getSettings", block_identifier=block)
+        field = lambda name: settings[get_output_index(self.am.interface_name, "getSettings", name)]
+        self._settings = AssetManagerSettings(
+            block=block,
+            lot_size_amg=field("lotSizeAMG"),
+            redemption_fee_bips=field("redemptionFeeBIPS"),
+            max_redeemed_tickets=field("maxRedeemedTickets"),
+            collateral_pool_token_timelock_seconds=field("collateralPoolTokenTimelockSeconds")
+        )
+        self._last_block = block
+        self._read_time = self._poll_time = time.time()
+
+    def _changed(self) -> bool:
+        """
+        Returns whether a change event was emitted since the last checked block.
+        """
+        block = self.am.web3.eth.block_number
+        if block - self._last_block > max_block_range:
+            return True
+        changed = False
+        if block > self._last_block:
+            events = self.am.contract.events
+            logs = self.am.web3.eth.get_logs({
+                "fromBlock": self._last_block + 1,
+                "toBlock": block,
+                "address": self.am.address,
+                "topics": [[events[name]().topic for name in CHANGE_EVENTS]]
+            })
+            changed = len(logs) > 0
+        self._last_block = block
+        self._poll_time = time.time()
+        return changed
+
+    def get(self) -> AssetManagerSettings:
+        with self._lock:
+            now = time.time()
+            if self._settings is None or now - self._read_time >= ttl:
+                self._read()
+            elif now - self._poll_time >= poll_interval and self._changed():
+                self._read()
+            return self._settings
+
+
+_lock = threading.Lock()
+_settings_caches : dict[tuple[str, str], AssetManagerSettingsCache] = {}
+
+def get_asset_manager_settings(am: "AssetManager") -> AssetManagerSettings:
+    """
+    Returns the shared settings snapshot of the given asset manager.
+    """
+    key = (am.network.__name__, am.address.lower())
+    with _lock:
+        settings_cache = _settings_caches.get(key)
+        if settings_cache is None:
+            settings_cache = AssetManagerSettingsCache(am)
+            _settings_caches[key] = settings_cache
+    return settings_cache.get()
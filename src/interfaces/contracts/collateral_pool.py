@@ -24,10 +24,10 @@ class CollateralPool(ContractClient):
         super().__init__(names, network, pool_address, sender_credentials=sender_credentials, fee_tracker=fee_tracker)
 
     def agent_vault(self) -> str:
-        return self.read("agentVault")
+        return self.read_immutable("agentVault")
     
     def pool_token(self) -> str:
-        return self.read("poolToken")
+        return self.read_immutable("poolToken")
 
     def debt_free_tokens_of(self, address: str) -> int:
         return self.read("debtFreeTokensOf", [address])
@@ -26,7 +26,7 @@ class CollateralPoolToken(ContractClient):
         self.write("transfer", inputs=[to_address, amount])
 
     def decimals(self) -> int:
-        return self.read("decimals")
+        return self.read_immutable("decimals")
     
     def to_uba(self, amount: Decimal) -> int:
         decimals = self.decimals()
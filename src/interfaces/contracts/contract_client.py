@@ -1,15 +1,97 @@
 from typing import TYPE_CHECKING, Any, Literal, Optional, Union
-from dotenv import load_dotenv
-from web3 import Web3
-from web3.middleware import ExtraDataToPOAMiddleware
 import warnings
-import os
-from src.utils.contracts import get_contract_abi, get_contract_address
+from eth_utils.abi import get_abi_output_types
+from web3._utils.abi import map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from src.interfaces.network.providers import get_web3
+from src.interfaces.network.nonce_manager import get_nonce_manager
+from src.interfaces.network.gas import get_gas_oracle
+from src.interfaces.contracts.contract_metadata import get_contract_metadata
+from src.interfaces.contracts.read_cache import get_read_cache, read_cache_enabled
+from src.utils.contracts import get_contract, get_contract_address
 if TYPE_CHECKING:
     from src.interfaces.network.networks.native_networks.native_network import NativeNetwork
     from src.interfaces.network.networks.external_networks.external_network import ExternalNetwork
     from src.utils.data_structures import UserCredentials
     from src.flow.fee_tracker import FeeTracker
+    from web3 import Web3
+    from web3.types import BlockIdentifier
+
+
+class BatchCall:
+    """
+    A read call prepared for batched execution (see multicall3.py).
+    """
+    def __init__(self, web3: "Web3", target: str, function: Any):
+        self.web3 = web3
+        self.target = target
+        self.function = function
+
+    def call_data(self) -> str:
+        return self.function._encode_transaction_data()
+
+    def decode(self, data: bytes) -> Any:
+        """
+        Decodes return data the same way as a direct contract call.
+        """
+        output_types = get_abi_output_types(self.function.abi)
+        output = self.web3.codec.decode(output_types, data)
+        normalized = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, output)
+        return normalized[0] if len(normalized) == 1 else normalized
+
+
+class PendingTransaction:
+    """
+    A sent transaction whose receipt was not awaited yet (see ContractClient.send).
+    """
+    def __init__(
+            self, 
+            client: "ContractClient", 
+            tx: dict, 
+            tx_hash: bytes, 
+            method: str,
+            inputs: list,
+            events: list[str],
+            cached_gas: bool = False
+        ):
+        self.client = client
+        self.tx = tx
+        self.tx_hash = tx_hash
+        self.method = method
+        self.inputs = inputs
+        self.events = events
+        self.cached_gas = cached_gas
+
+    def _track_fees(self, receipt: dict) -> None:
+        fees_uba = receipt.gasUsed * getattr(receipt, 'effectiveGasPrice', self.tx['gasPrice'])
+        fees = self.client.network.coin.from_uba(fees_uba)
+        if self.client.fee_tracker is not None:
+            self.client.fee_tracker.update_fees(self.client.network.coin, gas_fees=fees)
+
+    def wait(self) -> dict[Literal["receipt", "events"], dict]:
+        """
+        Waits for the receipt and records the fees.
+        If the transaction ran out of gas with a cached gas estimate, it is resent with a live estimate.
+        Returns the receipt and requested event outputs.
+        """
+        try:
+            receipt = self.client.web3.eth.wait_for_transaction_receipt(self.tx_hash)
+        except Exception:
+            # timed out or dropped, the nonce may never be used
+            get_nonce_manager(self.client.web3, self.client.sender_address).resync()
+            raise
+        if read_cache_enabled:
+            # later reads at "latest" must not be served from a block before this transaction
+            get_read_cache().see_block(self.client.network, receipt.blockNumber)
+        if receipt.status != 1:
+            if self.cached_gas and receipt.gasUsed >= self.tx['gas']:
+                self._track_fees(receipt)
+                get_gas_oracle(self.client.web3).forget_estimate(self.client.address, self.method)
+                return self.client.send(self.method, self.inputs, self.events, self.tx['value']).wait()
+            raise Exception(f"Transaction 0x{self.tx_hash.hex()} failed.")
+        events = self.client._get_events_from_receipt(receipt, self.events)
+        self._track_fees(receipt)
+        return {"receipt": receipt, "events": events}
 
 
 class ContractClient:
@@ -30,46 +112,46 @@ class ContractClient:
         self.sender_address = sender_credentials.address if sender_credentials else None
         self.sender_private_key = sender_credentials.private_key if sender_credentials else None
         self.fee_tracker = fee_tracker
-        
-        kwargs = {}
-        if timeout is not None:
-            kwargs['timeout'] = timeout
-        self.web3 = Web3(Web3.HTTPProvider(self.network.rpc_url(), request_kwargs=kwargs))
-        self.web3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
-        assert self.web3.is_connected()
-        
-        abi = get_contract_abi(self.interface_name)
+        self.web3 = get_web3(self.network.rpc_url(), timeout)
+
         if address is None:
             self.address = get_contract_address(self.instance_name, self.network)
-        self.contract = self.web3.eth.contract(self.address, abi=abi)
+        self.contract = get_contract(self.web3, self.network, self.interface_name, self.address)
 
-    def _build_transaction(self, method: str, args: list[str] = [], value: int = 0) -> dict:
-        nonce = self.web3.eth.get_transaction_count(self.sender_address)
-        gas = self.contract.functions[method](*args).estimate_gas({
+    def _build_transaction(self, method: str, args: list[str] = [], value: int = 0) -> tuple[dict, bool]:
+        """
+        Builds the transaction with the shared gas price and the cached gas estimate of the method.
+        Returns the transaction and whether the gas estimate was cached.
+        """
+        gas_oracle = get_gas_oracle(self.web3)
+        estimate = lambda: self.contract.functions[method](*args).estimate_gas({
             'from': self.sender_address,
             'value': value
         })
-        gas_price = self.web3.eth.gas_price
+        gas, cached_gas = gas_oracle.estimate_gas(self.address, method, estimate)
+        gas_price = gas_oracle.gas_price()
         tx = self.contract.functions[method](*args).build_transaction({
             'from': self.sender_address,
-            'nonce': nonce,
             'gas': gas,
             'gasPrice': gas_price,
-            'value': value
+            'value': value,
+            'chainId': gas_oracle.chain_id()
         })
-        return tx
+        # the nonce is handed out last, so that a failed build does not leave a gap
+        tx['nonce'] = get_nonce_manager(self.web3, self.sender_address).next_nonce()
+        return tx, cached_gas
 
-    def _sign_and_send_transaction(self, tx: dict) -> dict:
+    def _sign_and_send_transaction(self, tx: dict) -> bytes:
         """
-        Signs and sends a transaction to the blockchain.
-        Returns any event outputs.
+        Signs and sends a transaction to the blockchain without waiting for the receipt.
+        Returns the transaction hash.
         """
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.sender_private_key)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
-        if receipt.status != 1:
-            raise Exception(f"Transaction 0x{tx_hash.hex()} failed.")
-        return receipt
+        try:
+            signed_tx = self.web3.eth.account.sign_transaction(tx, self.sender_private_key)
+            return self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        except Exception:
+            get_nonce_manager(self.web3, self.sender_address).resync()
+            raise
     
     def _get_events_from_receipt(self, receipt: dict, events: list[str]) -> dict:
         """
@@ -93,17 +175,29 @@ class ContractClient:
                 result[event_name] = []
         return result
     
+    def send(self, method: str, inputs: list = [], events: list = [], value: int = 0) -> PendingTransaction:
+        """
+        Sends a transaction without waiting for its receipt, so that more transactions
+        of the same sender can be sent before it is mined.
+        """
+        tx, cached_gas = self._build_transaction(method, inputs, value)
+        tx_hash = self._sign_and_send_transaction(tx)
+        return PendingTransaction(self, tx, tx_hash, method, inputs, events, cached_gas)
+
     def write(self, method: str, inputs: list = [], events: list = [], value: int = 0) -> dict[Literal["receipt", "events"], dict]:
-        tx = self._build_transaction(method, inputs, value)
-        receipt = self._sign_and_send_transaction(tx)
-        events = self._get_events_from_receipt(receipt, events)
-        fees_uba = receipt.gasUsed * getattr(receipt, 'effectiveGasPrice', tx['gasPrice'])
-        fees = self.network.coin.from_uba(fees_uba)
-        self.fee_tracker.update_fees(self.network.coin, gas_fees=fees)
-        return {"receipt": receipt, "events": events}
+        return self.send(method, inputs, events, value).wait()
     
-    def read(self, method: str, inputs: list = []) -> Any:
-        return self.contract.functions[method](*inputs).call()
+    def read(self, method: str, inputs: list = [], block_identifier: "BlockIdentifier" = "latest") -> Any:
+        function = self.contract.functions[method](*inputs)
+        if read_cache_enabled:
+            return get_read_cache().read(self.network, self.web3, self.address, method, function, block_identifier)
+        return function.call(block_identifier=block_identifier)
 
-    
-    
+    def read_immutable(self, method: str) -> Any:
+        """
+        Reads a value that never changes for the deployed contract, once per process (see ContractMetadata).
+        """
+        return get_contract_metadata().get(self.network, self.address, method, lambda: self.read(method))
+
+    def batch_call(self, method: str, inputs: list = []) -> BatchCall:
+        return BatchCall(self.web3, self.address, self.contract.functions[method](*inputs))
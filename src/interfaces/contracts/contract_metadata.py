@@ -0,0 +1,83 @@
+import json
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional
+import toml
+if TYPE_CHECKING:
+    from src.interfaces.network.networks.native_networks.native_network import NativeNetwork
+
+config = toml.load("config.toml")
+metadata_file = Path(config["contract_metadata"]["file"])
+persist : bool = config["contract_metadata"]["persist"]
+
+
+class ContractMetadata():
+    """
+    Immutable facts of deployed contracts (token decimals, pool token and agent vault of a pool,
+    collateral pool of an agent vault), shared by all users of the process.
+    Each value is read once per (network, contract, method) and then never again.
+    With persist, values are kept in metadata_file and loaded at startup.
+    """
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._values : dict[str, Any] = {}
+        if self.path is not None and self.path.exists():
+            with open(self.path, "r") as f:
+                self._values = json.load(f)
+
+    @staticmethod
+    def _key(network: "NativeNetwork", address: str, method: str) -> str:
+        return f"{network.__name__}:{address.lower()}:{method}"
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._values, f, indent=4)
+        tmp_path.replace(self.path)
+
+    def get(self, network: "NativeNetwork", address: str, method: str, read: Callable[[], Any]) -> Any:
+        """
+        Returns the value of method on contract address, calling read only if it is not known yet.
+        """
+        return self.get_many(network, [address], method, lambda addresses: [read()])[0]
+
+    def get_many(
+            self,
+            network: "NativeNetwork",
+            addresses: list[str],
+            method: str,
+            read_batch: Callable[[list[str]], list[Any]]
+        ) -> list[Any]:
+        """
+        Returns the values of method on all contract addresses.
+        Unknown values are read with one call of read_batch.
+        """
+        keys = [self._key(network, address, method) for address in addresses]
+        with self._lock:
+            missing = list(dict.fromkeys(address for address, key in zip(addresses, keys) if key not in self._values))
+        if missing:
+            values = read_batch(missing)
+            with self._lock:
+                for address, value in zip(missing, values):
+                    self._values[self._key(network, address, method)] = value
+                self._save()
+        with self._lock:
+            return [self._values[key] for key in keys]
+
+
+_lock = threading.Lock()
+_contract_metadata : Optional[ContractMetadata] = None
+
+def get_contract_metadata() -> ContractMetadata:
+    """
+    Returns the process-wide contract metadata.
+    """
+    global _contract_metadata
+    with _lock:
+        if _contract_metadata is None:
+            _contract_metadata = ContractMetadata(metadata_file if persist else None)
+        return _contract_metadata
@@ -7,6 +7,8 @@ if TYPE_CHECKING:
     from src.interfaces.network.tokens import TokenFAsset
     from src.utils.data_structures import UserCredentials
     from src.flow.fee_tracker import FeeTracker
+    from web3.types import BlockIdentifier
+    from src.interfaces.contracts.contract_client import PendingTransaction
 
 
 class FAsset(ContractClient):
@@ -24,15 +26,21 @@ class FAsset(ContractClient):
     def get_balance(self) -> Decimal:
         return self.balance_of(self.sender_address)
 
-    def balance_of(self, address: str) -> Decimal:
-        balance_uba = self.read("balanceOf", inputs=[address])
+    def balance_of(self, address: str, block_identifier: "BlockIdentifier" = "latest") -> Decimal:
+        balance_uba = self.read("balanceOf", inputs=[address], block_identifier=block_identifier)
         return self.token_fasset.from_uba(balance_uba)
     
     def approve(self, spender: str, amount: int):
         return self.write("approve", inputs=[spender, amount])
+
+    def send_approve(self, spender: str, amount: int) -> "PendingTransaction":
+        return self.send("approve", inputs=[spender, amount])
     
     def allowance(self, owner: str, spender: str) -> int:
         return self.read("allowance", inputs=[owner, spender])
     
     def transfer(self, to: str, amount: int):
-        return self.write("transfer", inputs=[to, amount])
\ No newline at end of file
+        return self.write("transfer", inputs=[to, amount])
+
+    def send_transfer(self, to: str, amount: int) -> "PendingTransaction":
+        return self.send("transfer", inputs=[to, amount])
\ No newline at end of file
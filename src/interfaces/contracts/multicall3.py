@@ -0,0 +1,69 @@
+from typing import Any, Optional, TYPE_CHECKING
+from .contract_client import ContractClient
+from src.interfaces.network.providers import get_web3
+from src.utils.contracts import contract_exists, get_contract_names
+if TYPE_CHECKING:
+    from web3.types import BlockIdentifier
+    from src.interfaces.network.networks.native_networks.native_network import NativeNetwork
+    from src.interfaces.network.networks.external_networks.external_network import ExternalNetwork
+    from src.interfaces.contracts.contract_client import BatchCall
+    from src.utils.data_structures import UserCredentials
+    from src.flow.fee_tracker import FeeTracker
+
+
+class Multicall3(ContractClient):
+    def __init__(
+            self,
+            network: "NativeNetwork | ExternalNetwork",
+            sender_credentials: Optional["UserCredentials"]  = None,
+            fee_tracker: Optional["FeeTracker"]  = None
+        ):
+        names = get_contract_names(self)
+        super().__init__(names, network, sender_credentials=sender_credentials, fee_tracker=fee_tracker)
+
+    def aggregate(self, calls: list["BatchCall"], block_identifier: "BlockIdentifier" = "latest") -> list[Any]:
+        """
+        Executes all calls in a single eth_call.
+        Reverts (and raises) if any of the calls reverts.
+        """
+        encoded_calls = [(call.target, False, call.call_data()) for call in calls]
+        results = self.contract.functions["aggregate3"](encoded_calls).call(block_identifier=block_identifier)
+        return [call.decode(return_data) for call, (_, return_data) in zip(calls, results)]
+
+    def aggregate_value(self, calls: list[tuple["BatchCall", int]]) -> dict:
+        """
+        Executes all calls, each with its own value, in a single transaction.
+        Reverts if any of the calls reverts.
+        """
+        encoded_calls = [(call.target, False, value, call.call_data()) for call, value in calls]
+        return self.write("aggregate3Value", inputs=[encoded_calls], value=sum(value for _, value in calls))
+
+    def eth_balance_call(self, address: str) -> "BatchCall":
+        return self.batch_call("getEthBalance", [address])
+
+
+def has_multicall(network: "NativeNetwork | ExternalNetwork") -> bool:
+    return contract_exists("Multicall3", network)
+
+def read_batch(
+        network: "NativeNetwork | ExternalNetwork",
+        calls: list["BatchCall"],
+        block_identifier: "BlockIdentifier" = "latest"
+    ) -> list[Any]:
+    """
+    Executes read calls in one request, so that all results come from the same block.
+    Uses Multicall3 where it is deployed and a JSON-RPC batch request otherwise.
+    Returns results in the order of calls.
+    """
+    if not calls:
+        return []
+    if has_multicall(network):
+        return Multicall3(network).aggregate(calls, block_identifier)
+    web3 = get_web3(network.rpc_url())
+    if block_identifier == "latest":
+        block_identifier = web3.eth.block_number
+    with web3.batch_requests() as batch:
+        for call in calls:
+            batch.add(web3.eth.call({"to": call.target, "data": call.call_data()}, block_identifier))
+        results = batch.execute()
+    return [call.decode(return_data) for call, return_data in zip(calls, results)]
@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Literal, Optional
+import toml
+if TYPE_CHECKING:
+    from web3 import Web3
+    from web3.types import BlockIdentifier
+    from src.interfaces.network.networks.native_networks.native_network import NativeNetwork
+    from src.interfaces.network.networks.external_networks.external_network import ExternalNetwork
+
+config = toml.load("config.toml")
+read_cache_enabled : bool = config["read_cache"]["enabled"]
+block_ttl : float = config["read_cache"]["block_ttl"]
+immutable_methods : list[str] = config["read_cache"]["immutable"]
+per_block_methods : list[str] = config["read_cache"]["per_block"]
+
+
+class ReadCache():
+    """
+    Read-through cache of contract view calls, shared by all users of the process.
+    Values of per-block methods are keyed by (chain, block, contract, calldata) and dropped when a newer block is seen,
+    values of immutable methods are keyed by (chain, contract, calldata) and kept.
+    Reads of other methods are not cached. Reads at "latest" are pinned to the latest block number,
+    which is reused for block_ttl seconds (about one block time) and advanced by the receipts
+    of transactions sent through ContractClient (see see_block), so that reads after a write see it.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latest_blocks : dict[str, tuple[int, float]] = {}
+        self._per_block : dict[tuple[str, int, str, str], Any] = {}
+        self._immutable : dict[tuple[str, str, str], Any] = {}
+        self._hits : dict[str, int] = defaultdict(int)
+        self._misses : dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def policy(method: str) -> Literal["immutable", "per_block", "uncacheable"]:
+        if method in immutable_methods:
+            return "immutable"
+        if method in per_block_methods:
+            return "per_block"
+        return "uncacheable"
+
+    def _see_block(self, chain: str, block: int) -> None:
+        """
+        Records block as the latest block of chain if it is newer, dropping values of older blocks.
+        """
+        latest = self._latest_blocks.get(chain)
+        if latest is not None and block <= latest[0]:
+            return
+        self._latest_blocks[chain] = (block, time.time())
+        for key in [key for key in self._per_block if key[0] == chain and key[1] < block]:
+            del self._per_block[key]
+
+    def see_block(self, network: "NativeNetwork | ExternalNetwork", block: int) -> None:
+        """
+        Records a block known to exist (e.g. of a transaction receipt) as the latest block of network if it is newer.
+        """
+        with self._lock:
+            self._see_block(network.__name__, block)
+
+    def _latest_block(self, chain: str, web3: "Web3") -> int:
+        with self._lock:
+            latest = self._latest_blocks.get(chain)
+            if latest is not None and time.time() - latest[1] < block_ttl:
+                return latest[0]
+        block = web3.eth.block_number
+        with self._lock:
+            latest = self._latest_blocks.get(chain)
+            if latest is not None and block == latest[0]:
+                # no new block yet, the block number is reused for another block_ttl
+                self._latest_blocks[chain] = (block, time.time())
+            else:
+                self._see_block(chain, block)
+        return block
+
+    def read(
+            self,
+            network: "NativeNetwork | ExternalNetwork",
+            web3: "Web3",
+            address: str,
+            method: str,
+            function: Any,
+            block_identifier: "BlockIdentifier" = "latest"
+        ) -> Any:
+        """
+        Returns the result of the prepared contract function call, from the cache if possible.
+        """
+        policy = self.policy(method)
+        if policy == "uncacheable":
+            return function.call(block_identifier=block_identifier)
+        chain = network.__name__
+        calldata = function._encode_transaction_data()
+        if policy == "immutable":
+            key, store = (chain, address.lower(), calldata), self._immutable
+        else:
+            if block_identifier == "latest":
+                block_identifier = self._latest_block(chain, web3)
+            if not isinstance(block_identifier, int):
+                return function.call(block_identifier=block_identifier)
+            key, store = (chain, block_identifier, address.lower(), calldata), self._per_block
+        with self._lock:
+            if key in store:
+                self._hits[method] += 1
+                return store[key]
+        value = function.call(block_identifier=block_identifier)
+        with self._lock:
+            if policy == "per_block":
+                self._see_block(chain, block_identifier)
+                latest = self._latest_blocks[chain][0]
+                if block_identifier < latest:
+                    # read at an older block, its values are not kept
+                    self._misses[method] += 1
+                    return value
+            store[key] = value
+            self._misses[method] += 1
+        return value
+
+    def stats(self) -> dict[str, tuple[int, int]]:
+        """
+        Returns (hits, misses) per method. Every hit is an eth_call saved.
+        """
+        with self._lock:
+            methods = set(self._hits) | set(self._misses)
+            return {method: (self._hits[method], self._misses[method]) for method in sorted(methods)}
+
+    def totals(self) -> tuple[int, int]:
+        """
+        Returns total hits and misses.
+        """
+        with self._lock:
+            return sum(self._hits.values()), sum(self._misses.values())
+
+
+_lock = threading.Lock()
+_read_cache : Optional[ReadCache] = None
+
+def get_read_cache() -> ReadCache:
+    """
+    Returns the process-wide read cache.
+    """
+    global _read_cache
+    with _lock:
+        if _read_cache is None:
+            _read_cache = ReadCache()
+        return _read_cache
@@ -1,16 +1,29 @@
 import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
 from typing import TYPE_CHECKING, Literal, Optional
 import random
 import requests
 import json
 import time
+import toml
 from src.interfaces.network.tokens import TokenUnderlying
+from src.interfaces.network.providers import get_session, pool_size
 from src.interfaces.contracts import *
+from src.interfaces.contracts.multicall3 import has_multicall
+from src.utils.data_structures import UserCredentials
 from src.utils.encoding import pad_right_to_64_hex, to_utf8_hex_string, keccak256_text
+from src.utils.secrets import load_user_secrets
 if TYPE_CHECKING:
     from src.flow.fee_tracker import FeeTracker
     from src.interfaces.network.networks.native_networks.native_network import NativeNetwork
-    from src.utils.data_structures import UserCredentials
+
+config = toml.load("config.toml")
+poll_interval : int = config["attestation"]["poll_interval"]
+proof_attempts : int = config["attestation"]["proof_attempts"]
+resolved_rounds : int = config["attestation"]["resolved_rounds"]
+batch : bool = config["attestation"]["batch"]
+batch_window : int = config["attestation"]["batch_window"]
 
 
 def retry_on_exception(max_attempts=20, min_wait=10, max_wait=15):
@@ -27,6 +40,234 @@ def retry_on_exception(max_attempts=20, min_wait=10, max_wait=15):
         return wrapper
     return decorator
 
+
+class RoundWatcher():
+    """
+    Polls the DA layer of one network for the latest finalized FDC voting round
+    and resolves proof requests of all users once their round is finalized.
+    One watcher (and one polling thread) is shared by the whole process per DA url,
+    see get_round_watcher.
+    Resolved futures are kept until released, so that callers polling with done() on later steps get the same future,
+    but at most until their round is resolved_rounds older than the latest finalized round.
+    """
+    def __init__(self, da_url: str):
+        self.da_url = da_url
+        self.session = get_session(da_url)
+        self.latest_round_id : Optional[int] = None
+        self.latest_round_time : float = 0
+        self._pending : dict[tuple[int, str], dict] = {}
+        self._resolved : dict[tuple[int, str], Future] = {}
+        self._condition = threading.Condition()
+        self._thread = None
+
+    @retry_on_exception()
+    def _fetch_round_id(self) -> int:
+        response = self.session.get(self.da_url + '/api/v0/fsp/status').json()
+        return response["latest_fdc"]["voting_round_id"]
+
+    def _update_round_id(self) -> int:
+        round_id = self._fetch_round_id()
+        with self._condition:
+            self.latest_round_id = round_id
+            self.latest_round_time = time.time()
+            # results of callers that never came back for them
+            for key in [key for key in self._resolved if key[0] < round_id - resolved_rounds]:
+                del self._resolved[key]
+        return round_id
+
+    def current_round_id(self) -> int:
+        """
+        Returns the latest finalized round id, polling the DA layer at most once per poll interval.
+        """
+        if self.latest_round_id is None or time.time() - self.latest_round_time >= poll_interval:
+            return self._update_round_id()
+        return self.latest_round_id
+
+    def _fetch_proof(self, round_id: int, abi_encoded_request: str, headers: dict) -> dict:
+        response = self.session.post(
+            url=self.da_url + "/api/v0/fdc/get-proof-round-id-bytes",
+            headers=headers,
+            data=json.dumps({
+                "votingRoundId": round_id,
+                "requestBytes": abi_encoded_request
+            })
+        )
+        if response.status_code == 200:
+            return response.json()
+        return {}
+
+    def request_proof(self, abi_encoded_request: str, round_id: int, headers: dict) -> Future:
+        """
+        Registers a proof request and returns a future that resolves to the proof response
+        once the round is finalized. Requests for the same round and request bytes share one future.
+        """
+        key = (round_id, abi_encoded_request)
+        with self._condition:
+            resolved = self._resolved.get(key)
+            if resolved is not None:
+                return resolved
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = {"future": Future(), "headers": headers, "attempts": 0}
+                self._pending[key] = pending
+                self._condition.notify()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"round-watcher-{self.da_url}", daemon=True)
+                self._thread.start()
+            return pending["future"]
+
+    def release(self, future: Future) -> None:
+        """
+        Forgets a resolved future once its caller has consumed the result.
+        """
+        with self._condition:
+            for key in [key for key, resolved in self._resolved.items() if resolved is future]:
+                del self._resolved[key]
+
+    def _try_fetch_proof(self, key: tuple[int, str], pending: dict) -> dict:
+        try:
+            return self._fetch_proof(key[0], key[1], pending["headers"])
+        except Exception:
+            return {}
+
+    def _resolve_pending(self, latest_round_id: int) -> None:
+        """
+        Fetches proofs of all requests of finalized rounds in parallel and resolves their futures.
+        """
+        with self._condition:
+            all_pending = list(self._pending.items())
+        ready = [(key, pending) for key, pending in all_pending if key[0] <= latest_round_id]
+        responses = {}
+        if ready:
+            with ThreadPoolExecutor(max_workers=min(len(ready), pool_size)) as executor:
+                results = executor.map(lambda item: self._try_fetch_proof(*item), ready)
+                responses = {key: response for (key, _), response in zip(ready, results)}
+        for (round_id, abi_encoded_request), pending in all_pending:
+            response = responses.get((round_id, abi_encoded_request), {})
+            pending["attempts"] += 1
+            if len(response.get("proof", [])) > 0:
+                pending["future"].set_result(response)
+            elif pending["attempts"] >= proof_attempts:
+                pending["future"].set_exception(ValueError("Proof not found after multiple attempts"))
+            else:
+                continue
+            with self._condition:
+                self._pending.pop((round_id, abi_encoded_request), None)
+                self._resolved[(round_id, abi_encoded_request)] = pending["future"]
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+            try:
+                latest_round_id = self._update_round_id()
+            except Exception as e:
+                with self._condition:
+                    pending = list(self._pending.items())
+                    self._pending.clear()
+                    for key, p in pending:
+                        self._resolved[key] = p["future"]
+                for _, p in pending:
+                    p["future"].set_exception(e)
+                continue
+            self._resolve_pending(latest_round_id)
+            time.sleep(poll_interval)
+
+
+class AttestationBatcher():
+    """
+    Collects attestation requests of all users of the process within a time window
+    and submits them together from the funder account, so that they land in the same voting round.
+    Where Multicall3 is deployed, a whole batch is one transaction.
+    One batcher is shared by the whole process per native network, see get_attestation_batcher.
+    """
+    def __init__(self, native_network: "NativeNetwork", window: int = batch_window):
+        self.native_network = native_network
+        self.window = window
+        secrets = load_user_secrets(None, False, funder=True)
+        self.credentials = UserCredentials(**secrets["user"]["native"])
+        self._queue : dict[str, tuple[int, Future]] = {}
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def submit(self, abi_encoded_request: str, fee: int) -> Future:
+        """
+        Queues the attestation request for the next batch.
+        Returns a future that resolves to the round id of the request.
+        """
+        with self._condition:
+            queued = self._queue.get(abi_encoded_request)
+            if queued is None:
+                queued = (fee, Future())
+                self._queue[abi_encoded_request] = queued
+                self._condition.notify()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="attestation-batcher", daemon=True)
+                self._thread.start()
+            return queued[1]
+
+    def _submit_batch(self, batch: dict[str, tuple[int, Future]]) -> None:
+        r = Relay(self.native_network)
+        if has_multicall(self.native_network):
+            fh = FdcHub(self.native_network)
+            calls = [(fh.batch_call("requestAttestation", [request]), fee) for request, (fee, _) in batch.items()]
+            receipt = Multicall3(self.native_network, self.credentials).aggregate_value(calls)["receipt"]
+            round_id = r.get_voting_round_id(int(receipt.blockNumber))
+            for _, future in batch.values():
+                future.set_result(round_id)
+        else:
+            fh = FdcHub(self.native_network, self.credentials)
+            for request, (fee, future) in batch.items():
+                block_number = fh.request_attestation(request, fee)
+                future.set_result(r.get_voting_round_id(block_number))
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+            time.sleep(self.window)
+            with self._condition:
+                batch = self._queue
+                self._queue = {}
+            try:
+                self._submit_batch(batch)
+            except Exception as e:
+                for _, future in batch.values():
+                    if not future.done():
+                        future.set_exception(e)
+
+
+_round_watchers_lock = threading.Lock()
+_round_watchers : dict[str, RoundWatcher] = {}
+
+def get_round_watcher(da_url: str) -> RoundWatcher:
+    """
+    Returns the process-wide round watcher for the given DA url.
+    """
+    with _round_watchers_lock:
+        watcher = _round_watchers.get(da_url)
+        if watcher is None:
+            watcher = RoundWatcher(da_url)
+            _round_watchers[da_url] = watcher
+        return watcher
+
+_attestation_batchers_lock = threading.Lock()
+_attestation_batchers : dict[str, AttestationBatcher] = {}
+
+def get_attestation_batcher(native_network: "NativeNetwork") -> AttestationBatcher:
+    """
+    Returns the process-wide attestation batcher for the given native network.
+    """
+    with _attestation_batchers_lock:
+        batcher = _attestation_batchers.get(native_network.__name__)
+        if batcher is None:
+            batcher = AttestationBatcher(native_network)
+            _attestation_batchers[native_network.__name__] = batcher
+        return batcher
+
+
 class Attestation():
     def __init__(
             self, 
@@ -71,10 +312,8 @@ class Attestation():
         response = requests.get(url_transaction + f'/{tx_hash}', headers=self.headers).json()
         return response['data']['transactionId']
         
-    @retry_on_exception()
     def _current_round_id(self) -> int:
-        response = requests.get(self.native_network.da_url() + '/api/v0/fsp/status').json()
-        return response["latest_fdc"]["voting_round_id"]
+        return get_round_watcher(self.native_network.da_url()).current_round_id()
 
     def request_body_payment(self, tx_hash: str) -> dict:
         return {
@@ -129,40 +368,39 @@ class Attestation():
         """
         frfc = FdcRequestFeeConfigurations(**self.contract_inputs)
         required_fee = frfc.get_request_fee(abi_encoded_request)
+        if batch:
+            # submitted (and paid) by the funder together with requests of other users
+            return get_attestation_batcher(self.native_network).submit(abi_encoded_request, required_fee).result()
         fh = FdcHub(**self.contract_inputs)
         block_number = fh.request_attestation(abi_encoded_request, required_fee)
         r = Relay(**self.contract_inputs)
         round_id = r.get_voting_round_id(block_number)
         return round_id
 
+    def request_proof(self, abi_encoded_request: bytes, round_id: int) -> Future:
+        """
+        Queues the proof retrieval from the DA without waiting for the round to finalize.
+        Returns a future that resolves to the response data.
+        """
+        watcher = get_round_watcher(self.native_network.da_url())
+        return watcher.request_proof(abi_encoded_request, round_id, self.headers)
+
+    def release_proof(self, proof_future: Future) -> None:
+        """
+        Releases a proof future returned by request_proof after its result was consumed.
+        """
+        get_round_watcher(self.native_network.da_url()).release(proof_future)
+
     def get_proof(self, abi_encoded_request: bytes, round_id: int) -> dict:
         """
         Retrieves the proof from the DA.
         Returns response data.
         """
-        for _ in range(10):
-            time.sleep(15)
-            if self._current_round_id() >= round_id:
-                break
-        response = {}
-        for _ in range(40):
-            if len(response.get("proof", [])) == 0:
-                time.sleep(15)
-                response = requests.post(
-                    url=self.native_network.da_url() + "/api/v0/fdc/get-proof-round-id-bytes",
-                    headers=self.headers,
-                    data=json.dumps({
-                        "votingRoundId": round_id,
-                        "requestBytes": abi_encoded_request
-                    })
-                )
-                if response.status_code == 200:
-                    response = response.json()
-                else:
-                    response = {}
-            else:
-                return response
-        raise ValueError("Proof not found after multiple attempts")
+        proof_future = self.request_proof(abi_encoded_request, round_id)
+        try:
+            return proof_future.result()
+        finally:
+            self.release_proof(proof_future)
 
     def get_block_range(self) -> tuple[int, int]:
         """
@@ -0,0 +1,81 @@
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+import toml
+if TYPE_CHECKING:
+    from web3 import Web3
+
+config = toml.load("config.toml")
+price_ttl : float = config["gas"]["price_ttl"]
+estimate_margin : float = config["gas"]["estimate_margin"]
+
+
+class GasOracle():
+    """
+    Gas price, chain id and gas estimates of one network, shared by all senders of the process.
+    The gas price is refreshed at most once per price_ttl (about one block time).
+    Gas estimates are cached per (contract, method) as the highest live estimate seen,
+    and handed out with a safety margin without any request.
+    A call that reverts is then only caught on chain (see PendingTransaction.wait).
+    """
+    def __init__(self, web3: "Web3"):
+        self.web3 = web3
+        self._lock = threading.Lock()
+        self._gas_price : Optional[int] = None
+        self._gas_price_time : float = 0
+        self._chain_id : Optional[int] = None
+        self._estimates : dict[tuple[str, str], int] = {}
+
+    def gas_price(self) -> int:
+        with self._lock:
+            if self._gas_price is None or time.time() - self._gas_price_time >= price_ttl:
+                self._gas_price = self.web3.eth.gas_price
+                self._gas_price_time = time.time()
+            return self._gas_price
+
+    def chain_id(self) -> int:
+        if self._chain_id is None:
+            self._chain_id = self.web3.eth.chain_id
+        return self._chain_id
+
+    def estimate_gas(self, address: str, method: str, estimate: Callable[[], int]) -> tuple[int, bool]:
+        """
+        Returns the gas limit for a call of method on contract address
+        and whether it comes from the cache.
+        The live estimate is used when nothing is cached yet.
+        """
+        key = (address.lower(), method)
+        cached = self._estimates.get(key)
+        if cached is not None:
+            return int(cached * estimate_margin), True
+        return self.live_estimate_gas(address, method, estimate), False
+
+    def live_estimate_gas(self, address: str, method: str, estimate: Callable[[], int]) -> int:
+        """
+        Estimates gas with a live call and remembers the estimate.
+        """
+        gas = estimate()
+        key = (address.lower(), method)
+        with self._lock:
+            self._estimates[key] = max(gas, self._estimates.get(key, 0))
+        return gas
+
+    def forget_estimate(self, address: str, method: str) -> None:
+        with self._lock:
+            self._estimates.pop((address.lower(), method), None)
+
+
+_lock = threading.Lock()
+_gas_oracles : dict[str, GasOracle] = {}
+
+def get_gas_oracle(web3: "Web3") -> GasOracle:
+    """
+    Returns the process-wide gas oracle for the network of web3.
+    """
+    key = web3.provider.endpoint_uri
+    with _lock:
+        gas_oracle = _gas_oracles.get(key)
+        if gas_oracle is None:
+            gas_oracle = GasOracle(web3)
+            _gas_oracles[key] = gas_oracle
+        return gas_oracle
@@ -0,0 +1,88 @@
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+import toml
+from xrpl.ledger import get_fee
+from xrpl.models.requests import ServerInfo
+if TYPE_CHECKING:
+    from xrpl.clients import JsonRpcClient
+
+config = toml.load("config.toml")
+reserve_ttl : float = config["network"]["ledger_info"]["reserve_ttl"]
+validated_ttl : float = config["network"]["ledger_info"]["validated_ttl"]
+fee_ttl : float = config["network"]["ledger_info"]["fee_ttl"]
+
+
+class LedgerInfo():
+    """
+    Validated ledger info of one XRPL server, shared by all users of the process.
+    Account reserves change rarely and are refreshed at most once per reserve_ttl,
+    the validated ledger index is refreshed at most once per validated_ttl (about one ledger close).
+    Both are read with the same server_info request.
+    The open ledger transaction fee is refreshed at most once per fee_ttl.
+    """
+    def __init__(self, client: "JsonRpcClient"):
+        self.client = client
+        self._lock = threading.Lock()
+        self._reserves : Optional[tuple[float, float]] = None
+        self._reserves_time : float = 0
+        self._validated_seq : Optional[int] = None
+        self._validated_seq_time : float = 0
+        self._fee : Optional[str] = None
+        self._fee_time : float = 0
+
+    def _refresh(self) -> None:
+        response = self.client.request(ServerInfo())
+        validated_ledger = response.result["info"]["validated_ledger"]
+        now = time.time()
+        self._reserves = (validated_ledger["reserve_base_xrp"], validated_ledger["reserve_inc_xrp"])
+        self._reserves_time = now
+        self._validated_seq = int(validated_ledger["seq"])
+        self._validated_seq_time = now
+
+    def reserves(self) -> tuple[float, float]:
+        """
+        Returns the base and per-object account reserves in XRP.
+        """
+        with self._lock:
+            if self._reserves is None or time.time() - self._reserves_time >= reserve_ttl:
+                self._refresh()
+            return self._reserves
+
+    def validated_seq(self) -> int:
+        with self._lock:
+            if self._validated_seq is None or time.time() - self._validated_seq_time >= validated_ttl:
+                self._refresh()
+            return self._validated_seq
+
+    def fee(self) -> str:
+        """
+        Returns the transaction fee in drops.
+        """
+        with self._lock:
+            if self._fee is None or time.time() - self._fee_time >= fee_ttl:
+                self._fee = get_fee(self.client)
+                self._fee_time = time.time()
+            return self._fee
+
+    def forget_fee(self) -> None:
+        """
+        Forgets the cached fee, call when a transaction was rejected for an insufficient fee.
+        """
+        with self._lock:
+            self._fee = None
+
+
+_lock = threading.Lock()
+_ledger_infos : dict[str, LedgerInfo] = {}
+
+def get_ledger_info(client: "JsonRpcClient") -> LedgerInfo:
+    """
+    Returns the process-wide ledger info for the server of client.
+    """
+    with _lock:
+        ledger_info = _ledger_infos.get(client.url)
+        if ledger_info is None:
+            ledger_info = LedgerInfo(client)
+            _ledger_infos[client.url] = ledger_info
+        return ledger_info
@@ -1,8 +1,8 @@
 from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
-from web3 import Web3
 from src.interfaces.contracts.oft_upgradeable import OFTUpgradeable
 from src.interfaces.network.networks.external_networks.external_network import ExternalNetwork
+from src.interfaces.network.providers import get_web3
 from src.utils.data_structures import UserCredentials
 if TYPE_CHECKING:
     from src.interfaces.network.tokens import TokenExternalFAsset, TokenExternalNative
@@ -10,7 +10,7 @@ if TYPE_CHECKING:
 class HyperEVM_testnet(ExternalNetwork):
     def __init__(self, address: Optional[str] = None):
         super().__init__()
-        self.web3 = Web3(Web3.HTTPProvider(self.rpc_url()))
+        self.web3 = get_web3(self.rpc_url())
         self.address = address
 
     def get_balance(self, token: "TokenExternalNative | TokenExternalFAsset") -> Decimal:
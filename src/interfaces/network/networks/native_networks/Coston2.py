@@ -6,6 +6,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from src.interfaces.network.networks.native_networks.native_network import NativeNetwork
+from src.interfaces.network.nonce_manager import get_nonce_manager
+from src.interfaces.network.gas import get_gas_oracle
 if TYPE_CHECKING:
     from src.utils.data_structures import UserCredentials
 
@@ -14,20 +16,27 @@ class Coston2(NativeNetwork):
     def __init__(self, credentials: Optional["UserCredentials"] = None):
         super().__init__(credentials)
     
-    def send_transaction(self, to_address: str, amount_uba: int) -> dict:
-        nonce = self.web3.eth.get_transaction_count(self.address)
+    def send_transaction(self, to_address: str, amount_uba: int, wait: bool = True) -> dict:
+        nonce_manager = get_nonce_manager(self.web3, self.address)
+        gas_oracle = get_gas_oracle(self.web3)
         tx = {
-            'nonce': nonce,
             'to': to_address,
             'value': amount_uba,
             'gas': 21000,
-            'gasPrice': self.web3.eth.gas_price,
-            'chainId': self.web3.eth.chain_id,
+            'gasPrice': gas_oracle.gas_price(),
+            'chainId': gas_oracle.chain_id(),
         }
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
-        return receipt
+        # the nonce is handed out last, so that a failed build does not leave a gap
+        tx['nonce'] = nonce_manager.next_nonce()
+        try:
+            signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
+            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        except Exception:
+            nonce_manager.resync()
+            raise
+        if not wait:
+            return tx_hash
+        return self.wait_for_receipt(tx_hash)
 
     def _get_current_block(self) -> int:
         return self.web3.eth.block_number
@@ -6,15 +6,16 @@ from typing import TYPE_CHECKING, Optional
 import time
 from dotenv import load_dotenv
 import toml
-from web3 import Web3
-from web3.middleware import ExtraDataToPOAMiddleware
 from src.interfaces.contracts.fasset_oft_adapter import FAssetOFTAdapter
 from src.interfaces.network.networks.network import Network
+from src.interfaces.network.providers import get_web3
+from src.interfaces.network.nonce_manager import get_nonce_manager
 from src.interfaces.contracts.fasset import FAsset
 from src.utils.encoding import pad_left_to_64_hex, pad_0x, unpad_0x
 if TYPE_CHECKING:
     from src.interfaces.network.tokens import TokenFAsset, TokenNative
     from src.utils.data_structures import UserCredentials
+    from web3.types import BlockIdentifier
 
 config = toml.load(Path("config.toml"))
 contracts_file : dict[str, str] = config["file"]["contract_addresses"]
@@ -29,8 +30,7 @@ eid : dict[str, int] = config["network"]["eid"]
 
 class NativeNetwork(Network):
     def __init__(self, credentials: Optional["UserCredentials"] = None):
-        self.web3 = Web3(Web3.HTTPProvider(self.rpc_url()))
-        self.web3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+        self.web3 = get_web3(self.rpc_url())
         if credentials:
             self.credentials = credentials
             self.address = credentials.address
@@ -68,12 +68,12 @@ class NativeNetwork(Network):
     def eid(cls) -> int:
         return eid[cls.__name__]
 
-    def get_balance(self, token: "TokenNative | TokenFAsset") -> int:
+    def get_balance(self, token: "TokenNative | TokenFAsset", block_identifier: "BlockIdentifier" = "latest") -> int:
         from src.interfaces.network.tokens import TokenNative, TokenFAsset
         if isinstance(token, TokenNative):
             if token.network != type(self):
                 raise ValueError(f"Token {token.name} does not belong to network {type(self).__name__}.")
-            balance_uba = self.web3.eth.get_balance(self.address)
+            balance_uba = self.web3.eth.get_balance(self.address, block_identifier)
             balance = self.web3.from_wei(balance_uba, 'ether')
         elif isinstance(token, TokenFAsset):
             f = FAsset(
@@ -81,13 +81,25 @@ class NativeNetwork(Network):
                     token,
                     self.credentials
                 )
-            balance = f.get_balance()
+            balance = f.balance_of(self.address, block_identifier)
         return balance
 
     @abstractmethod
-    def send_transaction(self, to_address: str, amount: Decimal) -> dict:
+    def send_transaction(self, to_address: str, amount: Decimal, wait: bool = True) -> dict:
+        """
+        If wait is False, returns the transaction hash without waiting for the receipt
+        (see wait_for_receipt).
+        """
         pass
 
+    def wait_for_receipt(self, tx_hash: bytes) -> dict:
+        try:
+            return self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        except Exception:
+            # timed out or dropped, the nonce may never be used
+            get_nonce_manager(self.web3, self.address).resync()
+            raise
+
     @abstractmethod
     def get_current_timestamp(self) -> int:
         pass
@@ -114,8 +126,12 @@ class NativeNetwork(Network):
             )
         # approve tokens for bridge
         f = FAsset(self, token_fasset, self.credentials, self.ft)
-        f.approve(foa.address, amount_uba)
-        f.approve(self.composer_address(), amount_uba)
+        pending = [
+            f.send_approve(foa.address, amount_uba),
+            f.send_approve(self.composer_address(), amount_uba)
+        ]
+        for tx in pending:
+            tx.wait()
         # prepare send params
         send_params = {
             "dstEid": to_eid,
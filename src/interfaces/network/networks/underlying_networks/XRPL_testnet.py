@@ -1,25 +1,34 @@
+import threading
 from typing import Optional, TYPE_CHECKING
-from xrpl.clients import JsonRpcClient
 from xrpl.wallet import Wallet
-from xrpl.models.transactions import Payment, Memo, AccountSet
+from xrpl.models.transactions import AccountSet
 from xrpl.utils import xrp_to_drops, drops_to_xrp
-from xrpl.models.requests import AccountInfo, ServerInfo, Tx
+from xrpl.models.requests import AccountInfo
 from xrpl.transaction import sign, autofill, submit
 import requests
 from decimal import Decimal
 from src.interfaces.network.networks.underlying_networks.underlying_network import UnderlyingNetwork
+from src.interfaces.network.providers import get_xrpl_client
+from src.interfaces.network.ledger_info import get_ledger_info
+from src.interfaces.network.xrpl_sender import XRPLPayment, get_transactions, get_xrpl_sender
 if TYPE_CHECKING:
     from src.utils.data_structures import UserCredentials
     from src.flow.fee_tracker import FeeTracker
     from src.interfaces.network.tokens import TokenUnderlying
 
+# ledger indexes of validated transactions never change, so they are cached for the whole process
+_tx_blocks_lock = threading.Lock()
+_tx_blocks : dict[str, int] = {}
+
 
 class XRPL_testnet(UnderlyingNetwork):
     def __init__(self, credentials: Optional["UserCredentials"] = None, fee_tracker: Optional["FeeTracker"]  = None):
         super().__init__(fee_tracker=fee_tracker)
-        self.client = JsonRpcClient(self.rpc_url())
+        self.client = get_xrpl_client(self.rpc_url())
+        self.ledger_info = get_ledger_info(self.client)
         if credentials:
             self.wallet = Wallet(credentials.public_key, credentials.private_key)
+            self.sender = get_xrpl_sender(self.client, self.wallet)
             
     @staticmethod
     def generate_address() -> dict:
@@ -31,13 +40,22 @@ class XRPL_testnet(UnderlyingNetwork):
             }
         return secrets
 
-    def get_balance(self, token: "TokenUnderlying") -> Decimal:
+    def get_balance(self, token: "TokenUnderlying", ledger_index: int | str = "validated") -> Decimal:
         if token.network != type(self):
             raise ValueError(f"Token {token.name} does not belong to network {type(self).__name__}.")
+        return self.get_balance_of(self.wallet.classic_address, ledger_index)
+
+    def get_reserves(self) -> tuple[float, float]:
+        """
+        Returns the base and per-object account reserves in XRP.
+        """
+        return self.ledger_info.reserves()
+
+    def get_balance_of(self, address: str, ledger_index: int | str = "validated", reserves: Optional[tuple[float, float]] = None) -> Decimal:
         # full balance
         acct_info = AccountInfo(
-            account=self.wallet.classic_address, 
-            ledger_index="validated", 
+            account=address, 
+            ledger_index=ledger_index, 
             strict=True
             )
         response = self.client.request(acct_info)
@@ -47,42 +65,87 @@ class XRPL_testnet(UnderlyingNetwork):
         balance = Decimal(drops_to_xrp(balance_drops))
         # reserved balance
         owner_count = response.result["account_data"].get("OwnerCount", 0)
-        server_info = self.client.request(ServerInfo())
-        validated_ledger = server_info.result["info"]["validated_ledger"]
-        reserve_base = validated_ledger["reserve_base_xrp"]
-        reserve_inc = validated_ledger["reserve_inc_xrp"]
+        reserve_base, reserve_inc = reserves if reserves is not None else self.get_reserves()
         reserved_balance = reserve_base + (owner_count * reserve_inc)
         # available balance
         available_balance = balance - Decimal(reserved_balance)
         return available_balance
     
-    def send_transaction(self, to_address: str, amount: Decimal, memo_data: Optional[str]  = None) -> dict:
-        payment = Payment(
-            account=self.wallet.classic_address,
-            amount=xrp_to_drops(amount),
-            destination=to_address,
-            memos=[Memo(memo_data=memo_data)] if memo_data else None
-        )
-        autofilled_tx = autofill(payment, self.client)
-        signed_tx = sign(autofilled_tx, self.wallet)
-        response = submit(signed_tx, self.client)
+    def _track_fee(self, fee_drops: int) -> None:
         if self.fee_tracker:
-            self.fee_tracker.update_fees(self.coin, gas_fees=drops_to_xrp(response.result["tx_json"]["Fee"]))
+            fee = drops_to_xrp(str(abs(fee_drops)))
+            self.fee_tracker.update_fees(self.coin, gas_fees=fee if fee_drops >= 0 else -fee)
+
+    def _submit(self, to_address: str, amount: Decimal, memo_data: Optional[str] = None) -> XRPLPayment:
+        return self.sender.submit(XRPLPayment(to_address, xrp_to_drops(amount), memo_data), self._track_fee)
+
+    def send_transaction(
+            self, 
+            to_address: str, 
+            amount: Decimal, 
+            memo_data: Optional[str]  = None
+        ) -> dict:
+        """
+        Submits a payment without waiting for validation.
+        """
+        payment = self._submit(to_address, amount, memo_data)
         return {
-            "tx_hash": response.result["tx_json"]["hash"],
+            "tx_hash": payment.tx_hash,
             "amount": amount
         }
+
+    def send_transactions(self, transfers: list[tuple[str, Decimal]], wait: bool = True) -> list[dict]:
+        """
+        Submits all payments back to back, then waits until they are validated
+        (payments that expire unvalidated are submitted again).
+        """
+        payments, results = [], []
+        for to_address, amount in transfers:
+            try:
+                payment = self._submit(to_address, amount)
+                payments.append(payment)
+                results.append({"tx_hash": payment.tx_hash, "amount": amount, "error": None})
+            except Exception as e:
+                payments.append(None)
+                results.append({"tx_hash": None, "amount": amount, "error": str(e)})
+        if wait:
+            self.sender.wait([payment for payment in payments if payment is not None], self._track_fee)
+        for payment, result in zip(payments, results):
+            if payment is not None:
+                result["tx_hash"], result["error"] = payment.tx_hash, payment.error
+        return results
     
     def get_current_block(self) -> int:
-        response = self.client.request(ServerInfo())
-        return int(response.result["info"]["validated_ledger"]["seq"])
+        """
+        Returns the last validated ledger index, cached for about one ledger close.
+        """
+        return self.ledger_info.validated_seq()
     
     def get_block_of_tx(self, tx_hash: str) -> int:
         """
-        Returns the block number of the given transaction hash.
+        Returns the block number of the given validated transaction hash.
+        """
+        blocks = self.get_blocks_of_txs([tx_hash])
+        if tx_hash not in blocks:
+            raise ValueError(f"Transaction {tx_hash} is not validated yet.")
+        return blocks[tx_hash]
+
+    def get_blocks_of_txs(self, tx_hashes: list[str]) -> dict[str, int]:
+        """
+        Returns the block numbers of the given transaction hashes.
+        Uncached transactions are looked up in parallel (at most lookup_concurrency at a time),
+        transactions that are not found or not validated (yet) are left out,
+        since the ledger of an unvalidated transaction can still change.
         """
-        response = self.client.request(Tx(transaction=tx_hash))
-        return int(response.result["ledger_index"])
+        blocks = {tx_hash: _tx_blocks[tx_hash] for tx_hash in tx_hashes if tx_hash in _tx_blocks}
+        missing = list(dict.fromkeys(tx_hash for tx_hash in tx_hashes if tx_hash not in blocks))
+        for tx_hash, result in get_transactions(self.client, missing).items():
+            if not result.get("validated") or "ledger_index" not in result:
+                continue
+            blocks[tx_hash] = int(result["ledger_index"])
+            with _tx_blocks_lock:
+                _tx_blocks[tx_hash] = blocks[tx_hash]
+        return blocks
     
     def generate_new_address(self) -> dict:
         wallet = Wallet.create()
@@ -109,6 +172,7 @@ class XRPL_testnet(UnderlyingNetwork):
         )
         signed_tx = sign(autofill(tx, self.client), self.wallet)
         response = submit(signed_tx, self.client)
+        self.sender.resync()
         if self.fee_tracker:
             self.fee_tracker.update_fees(self.coin, gas_fees=drops_to_xrp(response.result["tx_json"]["Fee"]))
     
@@ -119,5 +183,6 @@ class XRPL_testnet(UnderlyingNetwork):
         )
         signed_tx = sign(autofill(tx, self.client), self.wallet)
         response = submit(signed_tx, self.client)
+        self.sender.resync()
         if self.fee_tracker:
             self.fee_tracker.update_fees(self.coin, gas_fees=drops_to_xrp(response.result["tx_json"]["Fee"]))
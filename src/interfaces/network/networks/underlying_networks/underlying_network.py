@@ -7,6 +7,7 @@ import toml
 from src.interfaces.network.networks.network import Network
 if TYPE_CHECKING:
     from src.flow.fee_tracker import FeeTracker
+    from src.interfaces.network.tokens import TokenUnderlying
 
 config = toml.load(Path("config.toml"))
 rpc_url = config["network"]["rpc_url"]
@@ -34,7 +35,27 @@ class UnderlyingNetwork(Network):
         pass
 
     @abstractmethod
-    def get_balance(self) -> Decimal:
+    def get_balance(self, token: "TokenUnderlying", ledger_index: int | str = "validated") -> Decimal:
+        pass
+
+    @abstractmethod
+    def get_balance_of(self, address: str, ledger_index: int | str = "validated", reserves: Optional[tuple] = None) -> Decimal:
+        """
+        Returns the available balance of any address.
+        Reserves (see get_reserves) can be passed when reading balances of many addresses.
+        """
+        pass
+
+    @abstractmethod
+    def get_reserves(self) -> tuple:
+        pass
+
+    @abstractmethod
+    def send_transactions(self, transfers: list[tuple[str, Decimal]], wait: bool = True) -> list[dict]:
+        """
+        Sends many transactions from the same account, given as (target address, value) pairs.
+        Returns a dictionary including transaction hash, amount and error (if any) for each transaction.
+        """
         pass
 
     @abstractmethod
@@ -45,6 +66,14 @@ class UnderlyingNetwork(Network):
     def get_block_of_tx(self, tx_hash: str) -> int:
         pass
 
+    @abstractmethod
+    def get_blocks_of_txs(self, tx_hashes: list[str]) -> dict[str, int]:
+        """
+        Returns the block numbers of the given transaction hashes.
+        Transactions that are not found or not validated (yet) are left out.
+        """
+        pass
+
     @abstractmethod
     def generate_new_address(self) -> dict:
         pass
@@ -0,0 +1,50 @@
+import threading
+from typing import TYPE_CHECKING, Optional
+if TYPE_CHECKING:
+    from web3 import Web3
+
+
+class NonceManager():
+    """
+    Hands out nonces of one account locally, so that the account can have
+    several transactions in flight without waiting for receipts.
+    The nonce is read from the chain on first use and after every failed send or receipt wait
+    (timed out or dropped transaction), so that a nonce that was handed out but never used does not leave a gap.
+    """
+    def __init__(self, web3: "Web3", address: str):
+        self.web3 = web3
+        self.address = address
+        self._lock = threading.Lock()
+        self._next_nonce : Optional[int] = None
+
+    def next_nonce(self) -> int:
+        with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = self.web3.eth.get_transaction_count(self.address, "pending")
+            nonce = self._next_nonce
+            self._next_nonce += 1
+            return nonce
+
+    def resync(self) -> None:
+        """
+        Forgets the local nonce, next nonce is read from the chain again.
+        Call when a transaction with a handed out nonce was not sent or not mined.
+        """
+        with self._lock:
+            self._next_nonce = None
+
+
+_lock = threading.Lock()
+_nonce_managers : dict[tuple[str, str], NonceManager] = {}
+
+def get_nonce_manager(web3: "Web3", address: str) -> NonceManager:
+    """
+    Returns the process-wide nonce manager for the given account on the network of web3.
+    """
+    key = (web3.provider.endpoint_uri, address.lower())
+    with _lock:
+        nonce_manager = _nonce_managers.get(key)
+        if nonce_manager is None:
+            nonce_manager = NonceManager(web3, address)
+            _nonce_managers[key] = nonce_manager
+        return nonce_manager
@@ -0,0 +1,105 @@
+import threading
+from pathlib import Path
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+import toml
+from web3 import Web3
+from web3._utils.http_session_manager import HTTPSessionManager
+from web3.middleware import ExtraDataToPOAMiddleware
+from xrpl.asyncio.clients.client import REQUEST_TIMEOUT
+from xrpl.asyncio.clients.exceptions import XRPLRequestFailureException
+from xrpl.asyncio.clients.utils import json_to_response, request_to_json_rpc
+from xrpl.clients import JsonRpcClient
+from xrpl.models.requests.request import Request
+from xrpl.models.response import Response
+
+config = toml.load(Path("config.toml"))
+pool_size : int = config["network"]["provider"]["pool_size"]
+
+_lock = threading.RLock()
+_sessions : dict[str, requests.Session] = {}
+_web3_instances : dict[tuple[str, Optional[int]], Web3] = {}
+_xrpl_clients : dict[str, JsonRpcClient] = {}
+
+
+class _SharedSessionManager(HTTPSessionManager):
+    """
+    Session manager that hands out one keep-alive session to all threads,
+    instead of web3's default of one session per thread.
+    """
+    def __init__(self, session: requests.Session):
+        super().__init__()
+        self.session = session
+
+    def cache_and_return_session(self, endpoint_uri, session=None, request_timeout=None) -> requests.Session:
+        return self.session
+
+
+class _SharedSessionJsonRpcClient(JsonRpcClient):
+    """
+    XRPL JSON-RPC client that posts over the shared keep-alive session,
+    instead of xrpl-py's default of a new HTTP client and event loop per request.
+    """
+    def _post(self, request: Request, timeout: float = REQUEST_TIMEOUT) -> Response:
+        response = get_session(self.url).post(self.url, json=request_to_json_rpc(request), timeout=timeout)
+        try:
+            return json_to_response(response.json())
+        except ValueError:
+            raise XRPLRequestFailureException({
+                "error": response.status_code,
+                "error_message": response.text
+            })
+
+    def request(self, request: Request) -> Response:
+        return self._post(request)
+
+    async def _request_impl(self, request: Request, *, timeout: float = REQUEST_TIMEOUT) -> Response:
+        # used by xrpl-py helpers such as autofill and submit
+        return self._post(request, timeout)
+
+
+def get_session(url: str) -> requests.Session:
+    """
+    Returns the process-wide keep-alive session for the given url.
+    """
+    with _lock:
+        session = _sessions.get(url)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[url] = session
+        return session
+
+def get_web3(rpc_url: str, timeout: Optional[int] = None) -> Web3:
+    """
+    Returns the process-wide Web3 instance for the given rpc url.
+    Connection is checked only when the instance is first created.
+    """
+    key = (rpc_url, timeout)
+    with _lock:
+        web3 = _web3_instances.get(key)
+        if web3 is None:
+            kwargs = {}
+            if timeout is not None:
+                kwargs["timeout"] = timeout
+            provider = Web3.HTTPProvider(rpc_url, request_kwargs=kwargs)
+            provider._request_session_manager = _SharedSessionManager(get_session(rpc_url))
+            web3 = Web3(provider)
+            web3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+            assert web3.is_connected()
+            _web3_instances[key] = web3
+        return web3
+
+def get_xrpl_client(rpc_url: str) -> JsonRpcClient:
+    """
+    Returns the process-wide XRPL JSON-RPC client for the given rpc url.
+    """
+    with _lock:
+        client = _xrpl_clients.get(rpc_url)
+        if client is None:
+            client = _SharedSessionJsonRpcClient(rpc_url)
+            _xrpl_clients[rpc_url] = client
+        return client
@@ -0,0 +1,171 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional
+import toml
+from xrpl.models.requests import AccountInfo, Tx
+from xrpl.models.transactions import Payment, Memo
+from xrpl.transaction import sign, submit
+from src.interfaces.network.ledger_info import get_ledger_info
+if TYPE_CHECKING:
+    from xrpl.clients import JsonRpcClient
+    from xrpl.wallet import Wallet
+
+config = toml.load("config.toml")
+lookup_concurrency : int = config["network"]["provider"]["lookup_concurrency"]
+ledger_offset : int = config["xrpl_sender"]["ledger_offset"]
+max_attempts : int = config["xrpl_sender"]["max_attempts"]
+poll_interval : float = config["xrpl_sender"]["poll_interval"]
+
+# submission results after which the transaction can still be validated,
+# terPRE_SEQ transactions are held by the server until the missing sequences arrive or LastLedgerSequence passes
+_ACCEPTED_RESULTS = ["tesSUCCESS", "terQUEUED", "terPRE_SEQ"]
+# submission results caused by a stale local sequence, the transaction can never apply and is signed again with a fresh one
+_SEQUENCE_RESULTS = ["tefPAST_SEQ"]
+
+
+def get_transactions(client: "JsonRpcClient", tx_hashes: list[str]) -> dict[str, dict]:
+    """
+    Looks up the given transactions in parallel (at most lookup_concurrency at a time).
+    Returns tx results by hash, transactions that are not found are left out.
+    """
+    if not tx_hashes:
+        return {}
+    def lookup(tx_hash: str) -> Optional[dict]:
+        response = client.request(Tx(transaction=tx_hash))
+        return response.result if response.is_successful() else None
+    with ThreadPoolExecutor(max_workers=min(lookup_concurrency, len(tx_hashes)), thread_name_prefix="xrpl-tx") as executor:
+        results = dict(zip(tx_hashes, executor.map(lookup, tx_hashes)))
+    return {tx_hash: result for tx_hash, result in results.items() if result is not None}
+
+
+@dataclass
+class XRPLPayment:
+    to_address: str
+    amount_drops: str
+    memo_data: Optional[str] = None
+    tx_hash: Optional[str] = None
+    fee_drops: Optional[str] = None
+    last_ledger_sequence: Optional[int] = None
+    attempts: int = 0
+    validated: bool = False
+    error: Optional[str] = None
+
+
+class XRPLSender():
+    """
+    Submits payments of one account without waiting for validation.
+    Sequences are handed out locally and the fee and validated ledger come from the shared ledger info,
+    so a payment costs one submit request. Every payment carries a LastLedgerSequence,
+    so that a payment that was not validated by then is known to have failed and is submitted again.
+    Fees are reported through on_fee in drops: the fee of every accepted submission,
+    and the negated fee of a submission that expired unvalidated (its fee was never charged).
+    """
+    def __init__(self, client: "JsonRpcClient", wallet: "Wallet"):
+        self.client = client
+        self.wallet = wallet
+        self.ledger_info = get_ledger_info(client)
+        self._lock = threading.Lock()
+        self._next_sequence : Optional[int] = None
+
+    def _next(self) -> int:
+        with self._lock:
+            if self._next_sequence is None:
+                response = self.client.request(AccountInfo(account=self.wallet.classic_address, ledger_index="current"))
+                self._next_sequence = int(response.result["account_data"]["Sequence"])
+            sequence = self._next_sequence
+            self._next_sequence += 1
+            return sequence
+
+    def resync(self) -> None:
+        """
+        Forgets the local sequence, next sequence is read from the ledger again.
+        """
+        with self._lock:
+            self._next_sequence = None
+
+    def submit(self, payment: XRPLPayment, on_fee: Optional[Callable[[int], None]] = None) -> XRPLPayment:
+        """
+        Signs and submits the payment. Raises if the payment was rejected.
+        """
+        while payment.attempts < max_attempts:
+            payment.attempts += 1
+            tx = Payment(
+                account=self.wallet.classic_address,
+                amount=payment.amount_drops,
+                destination=payment.to_address,
+                memos=[Memo(memo_data=payment.memo_data)] if payment.memo_data else None,
+                sequence=self._next(),
+                fee=self.ledger_info.fee(),
+                last_ledger_sequence=self.ledger_info.validated_seq() + ledger_offset
+            )
+            signed_tx = sign(tx, self.wallet)
+            try:
+                response = submit(signed_tx, self.client)
+            except Exception:
+                self.resync()
+                raise
+            result = response.result["engine_result"]
+            if result in _ACCEPTED_RESULTS or result.startswith("tec"):
+                # tec results are included in a ledger and reported on validation
+                payment.tx_hash = response.result["tx_json"]["hash"]
+                payment.fee_drops = tx.fee
+                payment.last_ledger_sequence = tx.last_ledger_sequence
+                if on_fee is not None:
+                    on_fee(int(tx.fee))
+                return payment
+            self.resync()
+            if result == "telINSUF_FEE_P":
+                self.ledger_info.forget_fee()
+            elif result not in _SEQUENCE_RESULTS:
+                raise Exception(f"Payment rejected with {result}: {response.result.get('engine_result_message')}")
+        raise Exception(f"Payment not accepted after {max_attempts} attempts.")
+
+    def wait(self, payments: list[XRPLPayment], on_fee: Optional[Callable[[int], None]] = None) -> None:
+        """
+        Waits until all submitted payments are validated or failed.
+        Payments that expired without being validated are submitted again, at most max_attempts times in total.
+        """
+        pending = [payment for payment in payments if payment.tx_hash and not payment.validated and payment.error is None]
+        while pending:
+            time.sleep(poll_interval)
+            # read before the lookup, so that a payment not found is known to be past its last ledger
+            validated_seq = self.ledger_info.validated_seq()
+            results = get_transactions(self.client, [payment.tx_hash for payment in pending])
+            still_pending = []
+            for payment in pending:
+                result = results.get(payment.tx_hash)
+                if result is not None and result.get("validated"):
+                    payment.validated = True
+                    transaction_result = result["meta"]["TransactionResult"]
+                    if transaction_result != "tesSUCCESS":
+                        payment.error = f"Payment {payment.tx_hash} failed with {transaction_result}."
+                elif validated_seq > payment.last_ledger_sequence:
+                    if on_fee is not None:
+                        on_fee(-int(payment.fee_drops))
+                    self.resync()
+                    try:
+                        self.submit(payment, on_fee)
+                        still_pending.append(payment)
+                    except Exception as e:
+                        payment.error = str(e)
+                else:
+                    still_pending.append(payment)
+            pending = still_pending
+
+
+_lock = threading.Lock()
+_xrpl_senders : dict[tuple[str, str], XRPLSender] = {}
+
+def get_xrpl_sender(client: "JsonRpcClient", wallet: "Wallet") -> XRPLSender:
+    """
+    Returns the process-wide sender for the given account on the server of client.
+    """
+    key = (client.url, wallet.classic_address)
+    with _lock:
+        xrpl_sender = _xrpl_senders.get(key)
+        if xrpl_sender is None:
+            xrpl_sender = XRPLSender(client, wallet)
+            _xrpl_senders[key] = xrpl_sender
+        return xrpl_sender
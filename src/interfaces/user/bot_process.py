@@ -0,0 +1,106 @@
+import json
+import queue
+import subprocess
+import threading
+from pathlib import Path
+from typing import Optional
+import toml
+
+config = toml.load("config.toml")
+fasset_bots_folder = config["folder"]["fasset_bots"]
+entry : str = config["bot"]["process"]["entry"]
+start_timeout : float = config["bot"]["process"]["start_timeout"]
+driver = Path("scripts/user_bot_driver.js").resolve()
+
+
+class BotProcess():
+    """
+    One long-lived fasset-bots user-bot process, started once and reused for all commands of a user.
+    Commands are sent to the driver (scripts/user_bot_driver.js) as JSON lines on stdin
+    and each command is answered with one JSON line holding its output, so Node.js startup
+    and config loading are paid once instead of on every command.
+    Commands are executed one at a time. The process is started again if it exited or a command timed out.
+    """
+    def __init__(self, args: list[str]):
+        self.args = args
+        self._lock = threading.Lock()
+        self._process : Optional[subprocess.Popen] = None
+        self._responses : queue.Queue = queue.Queue()
+        self._next_id = 0
+
+    @staticmethod
+    def _read(process: subprocess.Popen, responses: queue.Queue) -> None:
+        for line in process.stdout:
+            try:
+                responses.put(json.loads(line))
+            except ValueError:
+                continue
+        responses.put(None)
+
+    def _start(self) -> None:
+        self._process = subprocess.Popen(
+            ["node", str(driver), entry],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=fasset_bots_folder,
+            start_new_session=True,
+            text=True,
+            bufsize=1
+        )
+        self._responses = queue.Queue()
+        threading.Thread(
+            target=self._read,
+            args=(self._process, self._responses),
+            name="user-bot-reader",
+            daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.kill()
+            self._process = None
+
+    def execute(self, command_args: list[str], timeout: Optional[float] = None) -> list[str]:
+        """
+        Executes one user-bot command and returns its output lines.
+        Raises if the process exited or the command did not finish within timeout seconds.
+        """
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+                timeout = None if timeout is None else timeout + start_timeout
+            self._next_id += 1
+            request_id = self._next_id
+            try:
+                self._process.stdin.write(json.dumps({"id": request_id, "args": self.args + command_args}) + "\n")
+                self._process.stdin.flush()
+                while True:
+                    response = self._responses.get(timeout=timeout)
+                    if response is None:
+                        raise Exception("User bot process exited.")
+                    if response["id"] == request_id:
+                        break
+            except queue.Empty:
+                self.stop()
+                raise Exception(f"User bot command timed out after {timeout} seconds.")
+            except Exception:
+                self.stop()
+                raise
+            return [line.strip() for line in response["output"].splitlines()]
+
+
+_lock = threading.Lock()
+_bot_processes : dict[tuple[str, ...], BotProcess] = {}
+
+def get_bot_process(args: list[str]) -> BotProcess:
+    """
+    Returns the process-wide user-bot process for the given common arguments (secrets, config, fasset).
+    """
+    key = tuple(args)
+    with _lock:
+        bot_process = _bot_processes.get(key)
+        if bot_process is None:
+            bot_process = BotProcess(args)
+            _bot_processes[key] = bot_process
+        return bot_process
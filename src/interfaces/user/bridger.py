@@ -27,9 +27,11 @@ class Bridger(User):
         lot_size = AssetManager(self.native_network, self.token_fasset).lot_size()
         amount_uba = self.token_fasset.to_uba(Decimal(lots * lot_size))
         f = FAsset(self.native_network, self.token_fasset, self.native_credentials, self.fee_tracker)
-        f.approve(spender, amount_uba)
+        pending = [f.send_approve(spender, amount_uba)]
         if composer:
-            f.approve(self.native_network.composer_address(), amount_uba)
+            pending.append(f.send_approve(self.native_network.composer_address(), amount_uba))
+        for tx in pending:
+            tx.wait()
     
     def _get_send_params(
             self, 
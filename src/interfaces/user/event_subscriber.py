@@ -0,0 +1,155 @@
+import time
+from typing import TYPE_CHECKING, Optional
+import toml
+from src.interfaces.user.user import User
+from src.interfaces.contracts import *
+from src.utils.data_storage import DataStorageClient
+if TYPE_CHECKING:
+    from src.utils.data_structures import UserData
+    from src.flow.fee_tracker import FeeTracker
+
+config = toml.load("config.toml")
+events_enabled : bool = config["events"]["enabled"]
+max_block_range : int = config["events"]["max_block_range"]
+reconcile_interval : float = config["events"]["reconcile_interval"]
+
+# terminal redemption events and the stored status they lead to
+REDEMPTION_EVENTS = {
+    "RedemptionPerformed": "success",
+    "RedemptionDefault": "expired",
+    "RedemptionRejected": "expired",
+    "RedemptionPaymentBlocked": "expired",
+    "RedemptionPaymentFailed": "expired"
+}
+
+
+def _address_topic(address: str) -> str:
+    return "0x" + "0" * 24 + address[2:].lower()
+
+def _uint_topic(value: int) -> str:
+    return "0x" + value.to_bytes(32, "big").hex()
+
+
+class EventSubscriber(User):
+    """
+    Keeps the user's fasset balance and final mint and redemption statuses up to date
+    from AssetManager and FAsset logs, instead of reading them again on every state snapshot.
+    Logs are read with eth_getLogs from the last processed block on, in ranges of at most max_block_range blocks.
+    Event processing restarts from a full read of the state (reconcile) every reconcile_interval seconds:
+    the fasset balance is then only moved by Transfer events, and statuses are read in full once
+    at the reconciled block before event statuses are relied on.
+    """
+    def __init__(self, user_data: "UserData", fee_tracker: Optional["FeeTracker"] = None):
+        super().__init__(user_data, fee_tracker)
+        self.mint_dsc = DataStorageClient(user_data, "mint")
+        self.redeem_dsc = DataStorageClient(user_data, "redeem")
+        self.am = self.context.asset_manager()
+        self.fasset = self.context.fasset()
+        self.web3 = self.am.web3
+        self.address = self.native_credentials.address
+        self.last_block : Optional[int] = None
+        self.fasset_balance_uba : Optional[int] = None
+        self.statuses_synced : bool = False
+        self.last_reconciliation : float = 0
+
+    def needs_reconciliation(self) -> bool:
+        return self.last_block is None or time.time() - self.last_reconciliation >= reconcile_interval
+
+    def reconcile(self, block: int) -> None:
+        """
+        Restarts event processing after block.
+        The fasset balance and statuses must then be fully read at block.
+        """
+        self.last_block = block
+        self.fasset_balance_uba = None
+        self.statuses_synced = False
+        self.last_reconciliation = time.time()
+
+    def _filters(self, from_block: int, to_block: int) -> list[dict]:
+        user_topic = _address_topic(self.address)
+        am_events = self.am.contract.events
+        fasset_events = self.fasset.contract.events
+        block_range = {"fromBlock": from_block, "toBlock": to_block}
+        filters = [
+            {**block_range, "address": self.am.address, "topics": [
+                [am_events[name]().topic for name in REDEMPTION_EVENTS], None, user_topic
+            ]},
+            {**block_range, "address": self.am.address, "topics": [
+                am_events.MintingPaymentDefault().topic, None, user_topic
+            ]},
+            {**block_range, "address": self.fasset.address, "topics": [
+                fasset_events.Transfer().topic, user_topic
+            ]},
+            {**block_range, "address": self.fasset.address, "topics": [
+                fasset_events.Transfer().topic, None, user_topic
+            ]}
+        ]
+        # minting can be executed by an executor, so pending mints are matched by id
+        pending_mint_ids = self.mint_dsc.get_existing_record_ids()
+        if pending_mint_ids:
+            filters.append({**block_range, "address": self.am.address, "topics": [
+                am_events.MintingExecuted().topic, None, [_uint_topic(i) for i in pending_mint_ids]
+            ]})
+        return filters
+
+    def _get_logs(self, from_block: int, to_block: int) -> list[dict]:
+        """
+        Reads logs of all filters in one batch request and decodes them in block order.
+        """
+        with self.web3.batch_requests() as batch:
+            for log_filter in self._filters(from_block, to_block):
+                batch.add(self.web3.eth.get_logs(log_filter))
+            results = batch.execute()
+        logs = sorted(
+            (log for logs in results for log in logs),
+            key=lambda log: (log["blockNumber"], log["logIndex"])
+        )
+        topics = {}
+        for client in [self.am, self.fasset]:
+            for name in [*REDEMPTION_EVENTS, "MintingPaymentDefault", "MintingExecuted", "Transfer"]:
+                event = getattr(client.contract.events, name, None)
+                if event is not None:
+                    topics[(client.address.lower(), event().topic)] = event()
+        decoded = []
+        seen = set()
+        for log in logs:
+            # transfers from the user to the user match two filters
+            key = (log["blockNumber"], log["logIndex"])
+            if key in seen:
+                continue
+            seen.add(key)
+            event = topics[(log["address"].lower(), "0x" + log["topics"][0].hex().removeprefix("0x"))]
+            decoded.append(event.process_log(log))
+        return decoded
+
+    def _apply(self, event: dict) -> None:
+        name, args = event["event"], event["args"]
+        if name in REDEMPTION_EVENTS:
+            request_id = int(args["requestId"])
+            if self.redeem_dsc.exists(request_id):
+                self.redeem_dsc.set_status(request_id, REDEMPTION_EVENTS[name])
+        elif name == "MintingPaymentDefault":
+            request_id = int(args["collateralReservationId"])
+            if self.mint_dsc.exists(request_id):
+                self.mint_dsc.set_status(request_id, "expired")
+        elif name == "MintingExecuted":
+            request_id = int(args["collateralReservationId"])
+            if self.mint_dsc.exists(request_id):
+                self.mint_dsc.remove_record(request_id)
+        elif name == "Transfer" and self.fasset_balance_uba is not None:
+            if args["from"].lower() == self.address.lower():
+                self.fasset_balance_uba -= args["value"]
+            if args["to"].lower() == self.address.lower():
+                self.fasset_balance_uba += args["value"]
+
+    def sync(self, block: int) -> None:
+        """
+        Applies all events up to and including block.
+        """
+        if self.last_block is None or block <= self.last_block:
+            return
+        for from_block in range(self.last_block + 1, block + 1, max_block_range):
+            to_block = min(from_block + max_block_range - 1, block)
+            for event in self._get_logs(from_block, to_block):
+                self._apply(event)
+        self.last_block = block
@@ -1,13 +1,12 @@
 from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
-from src.flow.fee_tracker import FeeTracker
-from src.interfaces.user.state_manager import StateManager
-from src.interfaces.user.user import User
-from src.interfaces.contracts import *
+from src.interfaces.user.user import User, get_user_context
+from src.interfaces.user.funding import BulkFunding, Transfer
 from src.utils.data_structures import UserData
 from src.utils.secrets import get_user_nums
 if TYPE_CHECKING:
     from src.interfaces.network.tokens import TokenNative, TokenUnderlying
+    from src.interfaces.user.user import UserContext
 
 
 class Funder(User):
@@ -39,103 +38,100 @@ class Funder(User):
         except Exception as e:
             self.logger.info(f"Error requesting underlying funds: {e}")
 
-    def _send_native_funds_to_user(self, num: int, amount: Decimal) -> None:
-        amount_uba = self.token_native.to_uba(amount)
-        nn = self.token_native.network(self.native_credentials)
-        user_data = UserData(
+    def _user_context(self, num: int, partner: bool = False) -> "UserContext":
+        return get_user_context(UserData(
             token_native=self.token_native,
             token_underlying=self.token_underlying,
-            num=num
-        )
-        sm = StateManager(user_data)
-        nn.send_transaction(sm.native_credentials.address, amount_uba)
+            num=num,
+            partner=partner
+        ))
 
-    def _send_underlying_funds_to_user(self, num: int, amount: Decimal) -> None:
-        un = self.token_underlying.network(self.underlying_credentials)
-        user_data = UserData(
-            token_native=self.token_native,
-            token_underlying=self.token_underlying,
-            num=num
-        )
-        sm = StateManager(user_data)
-        un.send_transaction(sm.underlying_credentials.address, amount)
+    def _execute_plan(self, funding: BulkFunding, transfers: list[Transfer], name: str) -> None:
+        """
+        Logs the transfer plan, executes it and logs the results.
+        """
+        if not transfers:
+            self.logger.info(f"{name}: nothing to transfer.")
+            return
+        plan = "\n".join(f"{t.description}: {t.amount} {t.token.name}" for t in transfers)
+        self.logger.info(f"{name} plan:\n{plan}")
+        funding.execute(transfers)
+        self.logger.info(f"{name} results:\n{funding.report(transfers)}")
 
-    def _check_reserves(self) -> None:
+    def _check_reserves(self, funding: BulkFunding) -> None:
         """
         Check if all users and partner users have at least reserve amount of both native and underlying tokens.
         If not, send funds to those users to bring them up to the reserve.
         """
-        for num in self.user_nums:
-            for partner in [False, True]:
-                user_sm = StateManager(
-                    UserData(
-                        token_native=self.token_native,
-                        token_underlying=self.token_underlying,
-                        num=num,
-                        partner=partner
-                    )
-                )
-                balances = user_sm.get_balances()
-                native_balance = balances.get(self.token_native)
-                if native_balance < self.user_reserve:
-                    amount_to_send = self.user_reserve - native_balance
-                    self._send_native_funds_to_user(num, amount_to_send)
-                    self.logger.info(f"Sent {amount_to_send} {self.token_native.name} to {'partner ' if partner else ''}user {num} to meet reserve.")
-                underlying_balance = balances.get(self.token_underlying)
-                if underlying_balance < self.user_reserve:
-                    amount_to_send = self.user_reserve - underlying_balance
-                    self._send_underlying_funds_to_user(num, amount_to_send)
-                    self.logger.info(f"Sent {amount_to_send} {self.token_underlying.name} to {'partner ' if partner else ''}user {num} to meet reserve.")
+        users = [(num, partner) for num in self.user_nums for partner in [False, True]]
+        contexts = [self._user_context(num, partner) for num, partner in users]
+        transfers = []
+        for (num, partner), context, balances in zip(users, contexts, funding.balances(contexts)):
+            user_name = f"{'partner ' if partner else ''}user {num}"
+            native_balance = balances.get(self.token_native)
+            if native_balance < self.user_reserve:
+                transfers.append(Transfer(
+                    self.token_native, self.context, context.native_credentials.address,
+                    self.user_reserve - native_balance, f"Reserve for {user_name}"
+                ))
+            underlying_balance = balances.get(self.token_underlying)
+            if underlying_balance < self.user_reserve:
+                transfers.append(Transfer(
+                    self.token_underlying, self.context, context.underlying_credentials.address,
+                    self.user_reserve - underlying_balance, f"Reserve for {user_name}"
+                ))
+        self._execute_plan(funding, transfers, "Reserves")
 
     def distribute_funds(
             self, 
             max_native_to_send : Decimal = Decimal(300),
             max_underlying_to_send : Decimal = Decimal(50)
             ) -> None:
-        self._check_reserves()
-        sm = StateManager(self.user_data)
-        balances = sm.get_balances()
+        funding = BulkFunding(self.token_native, self.token_underlying)
+        self._check_reserves(funding)
+        balances = funding.balances([self.context])[0]
         self.logger.info(f"Funder balances before fund distribution: {balances}.")
         native_to_send = (balances.get(self.token_native) - self.funder_reserve) / len(self.user_nums)
         native_to_send = min(native_to_send, max_native_to_send)
         underlying_to_send = (balances.get(self.token_underlying) - self.funder_reserve) / len(self.user_nums)
         underlying_to_send = min(underlying_to_send, max_underlying_to_send)
+        transfers = []
         for num in self.user_nums:
+            context = self._user_context(num)
             if native_to_send > 0:
-                self._send_native_funds_to_user(num, native_to_send)
-                self.logger.info(f"Sent {native_to_send} {self.token_native.name} to user {num}.")
+                transfers.append(Transfer(
+                    self.token_native, self.context, context.native_credentials.address,
+                    native_to_send, f"Distribution to user {num}"
+                ))
             if underlying_to_send > 0:
-                self._send_underlying_funds_to_user(num, underlying_to_send)
-                self.logger.info(f"Sent {underlying_to_send} {self.token_underlying.name} to user {num}.")
+                transfers.append(Transfer(
+                    self.token_underlying, self.context, context.underlying_credentials.address,
+                    underlying_to_send, f"Distribution to user {num}"
+                ))
+        self._execute_plan(funding, transfers, "Distribution")
 
     def collect_funds(self) -> None:
-        for num in self.user_nums:
-            user_sm = StateManager(
-                UserData(
-                    token_native=self.token_native,
-                    token_underlying=self.token_underlying,
-                    num=num
-                )
-            )
-            balances = user_sm.get_balances()
+        funding = BulkFunding(self.token_native, self.token_underlying)
+        contexts = [self._user_context(num) for num in self.user_nums]
+        transfers = []
+        for num, context, balances in zip(self.user_nums, contexts, funding.balances(contexts)):
             self.logger.info(f"User {num} balances before collection: {balances}.")
-            
             native_to_send = balances.get(self.token_native) - self.user_reserve * Decimal(1.01)
             if native_to_send > 0:
-                native_to_send_uba = self.token_native.to_uba(native_to_send)
-                nn = self.token_native.network(user_sm.native_credentials)
-                nn.send_transaction(self.native_credentials.address, native_to_send_uba)
-                self.logger.info(f"Collected {native_to_send} {self.token_native.name} from user {num}.")
-            
+                transfers.append(Transfer(
+                    self.token_native, context, self.native_credentials.address,
+                    native_to_send, f"Collection from user {num}"
+                ))
             fasset_to_send = balances.get(self.token_fasset)
             if fasset_to_send > 0:
-                fasset_to_send_uba = self.token_fasset.to_uba(fasset_to_send)
-                f = FAsset(self.token_native.network, self.token_fasset, user_sm.native_credentials, FeeTracker())
-                f.transfer(self.native_credentials.address, fasset_to_send_uba)
-                self.logger.info(f"Collected {fasset_to_send} {self.token_fasset.name} from user {num}.")
-            
+                transfers.append(Transfer(
+                    self.token_fasset, context, self.native_credentials.address,
+                    fasset_to_send, f"Collection from user {num}"
+                ))
             underlying_to_send = balances.get(self.token_underlying) - self.user_reserve * Decimal(1.01)
             if underlying_to_send > 0:
-                un = self.token_underlying.network(user_sm.underlying_credentials)
-                un.send_transaction(self.underlying_credentials.address, underlying_to_send)
-                self.logger.info(f"Collected {underlying_to_send} {self.token_underlying.name} from user {num}.")
\ No newline at end of file
+                transfers.append(Transfer(
+                    self.token_underlying, context, self.underlying_credentials.address,
+                    underlying_to_send, f"Collection from user {num}"
+                ))
+        self._execute_plan(funding, transfers, "Collection")
@@ -0,0 +1,144 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import TYPE_CHECKING, Callable, Optional
+import toml
+from src.interfaces.network.tokens import TokenNative, TokenUnderlying, TokenFAsset
+from src.interfaces.contracts import *
+from src.interfaces.contracts.multicall3 import has_multicall
+from src.utils.data_structures import Balances
+if TYPE_CHECKING:
+    from src.interfaces.network.tokens import Token
+    from src.interfaces.user.user import UserContext
+    from src.interfaces.network.networks.native_networks.native_network import NativeNetwork
+
+config = toml.load("config.toml")
+concurrency : int = config["funder"]["concurrency"]
+
+
+@dataclass
+class Transfer:
+    token: "Token"
+    sender: "UserContext"
+    to_address: str
+    amount: Decimal
+    description: str
+    tx_hash: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkFunding():
+    """
+    Reads balances of many users and executes transfer plans between the funder and users.
+    Native chain balances of all users are read in one batched call (native balances per address where
+    Multicall3 is not deployed) and underlying balances in parallel,
+    pinned to one block and ledger.
+    Transfers are grouped by sender account and network, groups run in parallel:
+    native and fasset transfers of one sender are pipelined with the local nonce manager
+    and underlying payments of one sender are submitted back to back and awaited together.
+    """
+    def __init__(self, token_native: "TokenNative", token_underlying: "TokenUnderlying"):
+        self.token_native = token_native
+        self.token_underlying = token_underlying
+        self.token_fasset = TokenFAsset.from_underlying(token_underlying)
+        self.native_network = token_native.network
+
+    def balances(self, contexts: list["UserContext"]) -> list[Balances]:
+        """
+        Returns native, underlying and fasset balances of all given users.
+        Without Multicall3, native balances are read per address in parallel.
+        """
+        web3 = self.token_native.network().web3
+        block = web3.eth.block_number
+        un = self.token_underlying.network()
+        ledger_index = un.get_current_block()
+        reserves = un.get_reserves()
+        addresses = [context.native_credentials.address for context in contexts]
+        calls = [FAsset(self.native_network, self.token_fasset).batch_call("balanceOf", [address]) for address in addresses]
+        multicall = has_multicall(self.native_network)
+        if multicall:
+            calls += [Multicall3(self.native_network).eth_balance_call(address) for address in addresses]
+        results = read_batch(self.native_network, calls, block)
+        fasset_balances_uba = results[:len(addresses)]
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="funding") as executor:
+            if multicall:
+                native_balances_uba = results[len(addresses):]
+            else:
+                native_balances_uba = list(executor.map(lambda address: web3.eth.get_balance(address, block), addresses))
+            underlying_balances = list(executor.map(
+                lambda context: un.get_balance_of(context.underlying_credentials.address, ledger_index, reserves),
+                contexts
+            ))
+        return [
+            Balances(data={
+                self.token_native: self.token_native.from_uba(native_balance_uba),
+                self.token_underlying: underlying_balance,
+                self.token_fasset: self.token_fasset.from_uba(fasset_balance_uba)
+            })
+            for native_balance_uba, underlying_balance, fasset_balance_uba
+            in zip(native_balances_uba, underlying_balances, fasset_balances_uba)
+        ]
+
+    def _execute_underlying(self, transfers: list[Transfer]) -> None:
+        un = transfers[0].sender.underlying_client()
+        results = un.send_transactions([(transfer.to_address, transfer.amount) for transfer in transfers])
+        for transfer, result in zip(transfers, results):
+            transfer.tx_hash = result["tx_hash"]
+            transfer.error = result["error"]
+
+    @staticmethod
+    def _wait_for_receipt(nn: "NativeNetwork", tx_hash: bytes) -> None:
+        receipt = nn.wait_for_receipt(tx_hash)
+        if receipt.status != 1:
+            raise Exception(f"Transaction 0x{tx_hash.hex()} failed.")
+
+    def _execute_native(self, transfers: list[Transfer]) -> None:
+        sender = transfers[0].sender
+        nn = sender.native_client()
+        pending : list[tuple[Transfer, Callable[[], None]]] = []
+        for transfer in transfers:
+            try:
+                if isinstance(transfer.token, TokenNative):
+                    tx_hash = nn.send_transaction(transfer.to_address, transfer.token.to_uba(transfer.amount), wait=False)
+                    pending.append((transfer, lambda tx_hash=tx_hash: self._wait_for_receipt(nn, tx_hash)))
+                else:
+                    f = FAsset(self.native_network, self.token_fasset, sender.native_credentials)
+                    tx = f.send_transfer(transfer.to_address, transfer.token.to_uba(transfer.amount))
+                    tx_hash = tx.tx_hash
+                    pending.append((transfer, tx.wait))
+                transfer.tx_hash = "0x" + tx_hash.hex().removeprefix("0x")
+            except Exception as e:
+                transfer.error = str(e)
+        for transfer, wait in pending:
+            try:
+                wait()
+            except Exception as e:
+                transfer.error = str(e)
+
+    def execute(self, transfers: list[Transfer]) -> list[Transfer]:
+        """
+        Executes all transfers and records their transaction hashes or errors.
+        """
+        groups : dict[tuple[str, bool], list[Transfer]] = {}
+        for transfer in transfers:
+            underlying = isinstance(transfer.token, TokenUnderlying)
+            key = (transfer.sender.native_credentials.address, underlying)
+            groups.setdefault(key, []).append(transfer)
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="funding") as executor:
+            futures = [
+                executor.submit(self._execute_underlying if underlying else self._execute_native, group)
+                for (_, underlying), group in groups.items()
+            ]
+            for future in futures:
+                future.result()
+        return transfers
+
+    @staticmethod
+    def report(transfers: list[Transfer]) -> str:
+        lines = []
+        for transfer in transfers:
+            result = f"failed: {transfer.error}" if transfer.error else f"ok ({transfer.tx_hash})"
+            lines.append(f"{transfer.description}: {transfer.amount} {transfer.token.name} - {result}")
+        failed = sum(1 for transfer in transfers if transfer.error)
+        lines.append(f"{len(transfers) - failed}/{len(transfers)} transfers successful.")
+        return "\n".join(lines)
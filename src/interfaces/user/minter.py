@@ -1,3 +1,4 @@
+from concurrent.futures import Future
 from typing import TYPE_CHECKING, Optional
 from src.interfaces.user.user import User
 from src.interfaces.contracts import *
@@ -37,14 +38,36 @@ class Minter(User):
         )
         return response
     
-    def _get_payment_proof(self, underlying_hash: str) -> dict:
+    def _request_payment_attestation(self, underlying_hash: str) -> tuple[str, int]:
+        """
+        Submit the payment attestation request to the FDC.
+        Returns abi encoded request and round id.
+        """
         a = Attestation(self.native_network, self.token_underlying, self.native_credentials, self.indexer_api_key, self.fee_tracker)
         request_body = a.request_body_payment(underlying_hash)
         response = a.prepare_attestation_request(request_body, "Payment")
         abi_encoded_request = response["abiEncodedRequest"]
         round_id = a.submit_attestation_request(abi_encoded_request)
-        proof = a.get_proof(abi_encoded_request, round_id)
-        return proof
+        return abi_encoded_request, round_id
+
+    def request_payment_proof(self, collateral_reservation_id: int, log_steps: bool = False) -> Future:
+        """
+        Request the attestation of the underlying payment, unless it was already requested.
+        Returns a future of the proof, without waiting for the voting round to finalize.
+        """
+        mint_request = self.dsc.get_record(collateral_reservation_id)
+        if mint_request.get("attestationRoundId") is None:
+            self.log_step("Requesting payment attestation...", log_steps)
+            abi_encoded_request, round_id = self._request_payment_attestation(mint_request["transactionHash"])
+            self.dsc.add_data(collateral_reservation_id, {
+                "attestationRequest": abi_encoded_request,
+                "attestationRoundId": round_id
+            })
+            self.log_step(f"Payment attestation requested in round {round_id}.", log_steps)
+        else:
+            abi_encoded_request, round_id = mint_request["attestationRequest"], mint_request["attestationRoundId"]
+        a = Attestation(self.native_network, self.token_underlying, self.native_credentials, self.indexer_api_key)
+        return a.request_proof(abi_encoded_request, round_id)
 
     @staticmethod
     def _prepare_proof(proof: dict) -> tuple:
@@ -131,14 +154,27 @@ class Minter(User):
         self._save_mint_request(reserve_collateral_data, pay_underlying_outputs["tx_hash"], lots)
         return collateral_reservation_id
 
-    def prove_and_execute_minting(self, collateral_reservation_id: int, log_steps: bool = False) -> None:
+    def prove_and_execute_minting(self, collateral_reservation_id: int, log_steps: bool = False, wait: bool = True) -> bool:
         """
         Get attestation proof for the underlying payment and execute minting on AssetManager contract.
+        If wait is False and the proof is not available yet, only the attestation is requested.
+        Returns True if minting was executed.
         """
         self.log_step(f"Retrieving mint request data for collateral reservation id {collateral_reservation_id}...", log_steps)
-        mint_request = self.dsc.get_record(collateral_reservation_id)
+        proof_future = self.request_payment_proof(collateral_reservation_id, log_steps)
+        if not wait and not proof_future.done():
+            self.log_step("Payment proof is not available yet.", log_steps)
+            return False
         self.log_step("Getting payment proof...", log_steps)
-        proof = self._get_payment_proof(mint_request["transactionHash"])
+        try:
+            proof = proof_future.result()
+        except Exception:
+            # request a new attestation next time
+            self.dsc.add_data(collateral_reservation_id, {"attestationRequest": None, "attestationRoundId": None})
+            raise
+        finally:
+            a = Attestation(self.native_network, self.token_underlying, self.native_credentials, self.indexer_api_key)
+            a.release_proof(proof_future)
         self.log_step("Got payment proof.", log_steps)
         proof = self._prepare_proof(proof)
         self.log_step("Executing minting on AssetManager contract...", log_steps)
@@ -148,22 +184,42 @@ class Minter(User):
         )
         self.dsc.remove_record(collateral_reservation_id)
         self.log_step(f"Minting executed in transaction 0x{tx.transactionHash.hex()}.", log_steps)
+        return True
 
     def mint_status(self) -> "MintStatus":
         """
         Returns the status of all mint requests in storage.
+        Expired status is final and kept in storage, and the underlying block of each payment
+        is looked up only once, so only the indexer block range is read for known requests.
         """
+        statuses = {"pending": [], "expired": []}
+        stored_statuses = self.dsc.get_statuses()
+        records = []
+        for record in self.dsc.get_records():
+            request_id = int(record["requestId"])
+            if stored_statuses.get(request_id) == "expired":
+                statuses["expired"].append(request_id)
+            else:
+                records.append(record)
+        if not records:
+            return MintStatus(**statuses)
         a = Attestation(self.native_network, self.token_underlying, self.native_credentials, self.indexer_api_key)
         first_block, _ = a.get_block_range()
-        records = self.dsc.get_records()
-        statuses = {"pending": [], "expired": []}
+        new_tx_hashes = [record["transactionHash"] for record in records if record.get("transactionBlock") is None]
+        new_tx_blocks = self.token_underlying.network().get_blocks_of_txs(new_tx_hashes) if new_tx_hashes else {}
         for record in records:
-            tx_hash = record["transactionHash"]
             request_id = int(record["requestId"])
-            un = self.token_underlying.network()
-            tx_block = un.get_block_of_tx(tx_hash)
+            tx_block = record.get("transactionBlock")
+            if tx_block is None:
+                tx_block = new_tx_blocks.get(record["transactionHash"])
+                if tx_block is None:
+                    # payment not found or not validated yet
+                    statuses["pending"].append(request_id)
+                    continue
+                self.dsc.add_data(request_id, {"transactionBlock": tx_block})
             if tx_block < first_block:
                 statuses["expired"].append(request_id)
+                self.dsc.set_status(request_id, "expired")
             else:
                 statuses["pending"].append(request_id)
         return MintStatus(**statuses)
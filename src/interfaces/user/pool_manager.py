@@ -2,10 +2,13 @@ from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 from src.interfaces.user.user import User
 from src.interfaces.contracts import *
+from src.interfaces.contracts.agent_registry import get_agent_registry
+from src.interfaces.contracts.contract_metadata import get_contract_metadata
 from src.utils.data_structures import Pool, PoolHolding
 if TYPE_CHECKING:
     from src.utils.data_structures import UserData
     from src.flow.fee_tracker import FeeTracker
+    from web3.types import BlockIdentifier
 
 
 class PoolManager(User):
@@ -42,49 +45,67 @@ class PoolManager(User):
         fees_UBA = self.token_fasset.to_uba(fees)
         cp.withdraw_fees(fees_UBA)
 
-    def pools(self, chunk_size: int = 10, log_steps: bool = False) -> list["Pool"]:
+    def pools(self, log_steps: bool = False, block_identifier: "BlockIdentifier" = "latest") -> list["Pool"]:
         """
         Get dictionary of collateral pools and their details.
+        Pools are taken from the shared agent registry, swept at block_identifier or later if it is a block number.
         """
-        agent_list = []
-        start = 0
-        am = AssetManager(self.native_network, self.token_fasset)
-        while True:
-            new = am.get_available_agents_detailed_list(start, start + chunk_size)
-            agent_list.extend(new)
-            if len(new) < chunk_size:
-                break
-            start += len(new)
+        block = block_identifier if isinstance(block_identifier, int) else None
+        pool_addresses = get_agent_registry(self.native_network, self.token_fasset).collateral_pools(block)
         result = []
-        for agent in agent_list:
-            pool_dict = {"address": am.agent_attribute(agent["agentVault"], "collateralPool")}
+        for pool_address in pool_addresses:
+            pool_dict = {"address": pool_address}
             # add more details as needed
             result.append(Pool(**pool_dict))
         return result
     
-    def pool_holdings(self, log_steps: bool = False) -> list["PoolHolding"]:
+    def pool_holdings(self, log_steps: bool = False, block_identifier: "BlockIdentifier" = "latest") -> list["PoolHolding"]:
         """
         Get the user's holdings and fasset fees of all pools.
+        Holdings of all pools are read in one batched call,
+        pool tokens and their decimals are taken from the contract metadata.
         """
-        result = []
-        all_pools = self.pools(log_steps=log_steps)
+        all_pools = self.pools(log_steps=log_steps, block_identifier=block_identifier)
+        calls = []
         for pool in all_pools:
-            pool_address = pool.address
+            cp = CollateralPool(self.native_network, pool.address)
+            calls.extend([
+                cp.batch_call("debtFreeTokensOf", [self.native_address]),
+                cp.batch_call("debtLockedTokensOf", [self.native_address]),
+                cp.batch_call("fAssetFeesOf", [self.native_address])
+            ])
+        results = read_batch(self.native_network, calls, block_identifier)
+        holdings = {}
+        for i, pool in enumerate(all_pools):
+            debt_free_tokens, debt_locked_tokens, fees = results[3 * i : 3 * i + 3]
+            holdings[pool.address] = (debt_free_tokens + debt_locked_tokens, fees)
+        # pool token decimals, only for pools with holdings
+        token_pools = [pool_address for pool_address, (tokens, _) in holdings.items() if tokens > 0]
+        metadata = get_contract_metadata()
+        pool_tokens = metadata.get_many(
+            self.native_network, token_pools, "poolToken",
+            lambda pools: read_batch(
+                self.native_network,
+                [CollateralPool(self.native_network, pool).batch_call("poolToken") for pool in pools]
+            )
+        )
+        decimals = metadata.get_many(
+            self.native_network, pool_tokens, "decimals",
+            lambda tokens: read_batch(
+                self.native_network,
+                [CollateralPoolToken(self.native_network, token).batch_call("decimals") for token in tokens]
+            )
+        )
+        decimals = dict(zip(token_pools, decimals))
+        result = []
+        for pool_address, (tokens, fees) in holdings.items():
             pool_dict = {"pool_address": pool_address}
             # holdings
-            cp = CollateralPool(self.native_network, pool_address)
-            debt_free_tokens = cp.debt_free_tokens_of(self.native_address)
-            debt_locked_tokens = cp.debt_locked_tokens_of(self.native_address)
-            tokens = debt_free_tokens + debt_locked_tokens
             if tokens > 0:
-                cpt = CollateralPoolToken(self.native_network, cp.pool_token())
-                tokens = cpt.from_uba(tokens)
-                pool_dict["pool_tokens"] = tokens
+                pool_dict["pool_tokens"] = Decimal(tokens) / (Decimal(10) ** decimals[pool_address])
             # fasset fees
-            fees = cp.fAsset_fees_of(self.native_address)
             if fees > 0:
-                fees = self.token_fasset.from_uba(fees)
-                pool_dict["fasset_fees"] = fees
+                pool_dict["fasset_fees"] = self.token_fasset.from_uba(fees)
             if "pool_tokens" in pool_dict or "fasset_fees" in pool_dict:
                 result.append(PoolHolding(**pool_dict))
         return result
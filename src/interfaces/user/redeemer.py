@@ -1,3 +1,4 @@
+from concurrent.futures import Future
 from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 from src.interfaces.user.user import User
@@ -9,6 +10,7 @@ from src.utils.data_structures import RedemptionStatus
 if TYPE_CHECKING:
     from src.utils.data_structures import UserData
     from src.flow.fee_tracker import FeeTracker
+    from web3.types import BlockIdentifier
 
 
 class Redeemer(User):
@@ -81,9 +83,10 @@ class Redeemer(User):
         )
         return contract_proof
 
-    def _get_referenced_payment_non_existence_proof(self, redemption_data: dict) -> dict:
+    def _request_referenced_payment_non_existence_attestation(self, redemption_data: dict) -> tuple[str, int]:
         """
-        Get attestation proof for referenced payment non-existence.
+        Submit the referenced payment non-existence attestation request to the FDC.
+        Returns abi encoded request and round id.
         """
         a = Attestation(self.native_network, self.token_underlying, self.native_credentials, self.indexer_api_key, self.fee_tracker)
         request_body = a.request_body_referenced_payment_nonexistence(
@@ -97,17 +100,49 @@ class Redeemer(User):
         response = a.prepare_attestation_request(request_body, "ReferencedPaymentNonexistence")
         abi_encoded_request = response["abiEncodedRequest"]
         round_id = a.submit_attestation_request(abi_encoded_request)
-        proof = a.get_proof(abi_encoded_request, round_id)
-        return proof
+        return abi_encoded_request, round_id
 
-    def redeem_default(self, redemption_id: int, log_steps: bool = False) -> None:
+    def request_non_existence_proof(self, redemption_id: int, log_steps: bool = False) -> Future:
+        """
+        Request the referenced payment non-existence attestation, unless it was already requested.
+        Returns a future of the proof, without waiting for the voting round to finalize.
+        """
+        redemption_data = self.dsc.get_record(redemption_id)
+        if redemption_data.get("attestationRoundId") is None:
+            self.log_step("Requesting referenced payment non existence attestation...", log_steps)
+            abi_encoded_request, round_id = self._request_referenced_payment_non_existence_attestation(redemption_data)
+            self.dsc.add_data(redemption_id, {
+                "attestationRequest": abi_encoded_request,
+                "attestationRoundId": round_id
+            })
+            self.log_step(f"Attestation requested in round {round_id}.", log_steps)
+        else:
+            abi_encoded_request, round_id = redemption_data["attestationRequest"], redemption_data["attestationRoundId"]
+        a = Attestation(self.native_network, self.token_underlying, self.native_credentials, self.indexer_api_key)
+        return a.request_proof(abi_encoded_request, round_id)
+
+    def redeem_default(self, redemption_id: int, log_steps: bool = False, wait: bool = True) -> bool:
         """
         Redeem a default redemption by its ID.
+        If wait is False and the proof is not available yet, only the attestation is requested.
+        Returns True if the default was executed.
         """
         self.log_step(f"Starting default redemption for ID {redemption_id}.", log_steps)
+        proof_future = self.request_non_existence_proof(redemption_id, log_steps)
+        if not wait and not proof_future.done():
+            self.log_step("Referenced payment non existence proof is not available yet.", log_steps)
+            return False
         redemption_data = self.dsc.get_record(redemption_id)
         self.log_step("Getting referenced payment non existence proof ...", log_steps)
-        proof = self._get_referenced_payment_non_existence_proof(redemption_data)
+        try:
+            proof = proof_future.result()
+        except Exception:
+            # request a new attestation next time
+            self.dsc.add_data(redemption_id, {"attestationRequest": None, "attestationRoundId": None})
+            raise
+        finally:
+            a = Attestation(self.native_network, self.token_underlying, self.native_credentials, self.indexer_api_key)
+            a.release_proof(proof_future)
         proof = self._prepare_proof(proof)
         self.log_step("Got proof.", log_steps)
         redemption_id = int(redemption_data["requestId"])
@@ -117,24 +152,46 @@ class Redeemer(User):
         self.log_step(f"Redemption default executed.", log_steps)
         self.dsc.remove_record(redemption_id)
         self.log_step(f"Redemption data removed from storage.", log_steps)
+        return True
 
-    def redemption_status(self) -> "RedemptionStatus":
+    def redemption_status(
+            self, 
+            block_identifier: "BlockIdentifier" = "latest", 
+            ledger_index: Optional[int] = None,
+            assume_active: bool = False
+        ) -> "RedemptionStatus":
         """
         Get statuses of all saved redemptions.
+        Request infos are read at block_identifier, and ledger_index (if given) is used as the current underlying block.
+        Success and expired statuses are final and kept in storage, so only the remaining redemptions are checked.
+        If assume_active is True, redemptions without a final status are known to be active on chain
+        (e.g. final statuses are kept up to date from events) and request infos are not read.
         """
         statuses = ["ACTIVE", "DEFAULTED_UNCONFIRMED", "SUCCESSFUL", "DEFAULTED_FAILED", "BLOCKED", "REJECTED"] # from RedemptionRequestInfo.sol
         result = {"pending": [], "default": [], "expired": [], "success": []}
-        redemptions = self.dsc.get_records()
-        am = AssetManager(self.native_network, self.token_fasset)
-        for redemption in redemptions:
+        stored_statuses = self.dsc.get_statuses()
+        redemptions = []
+        for redemption in self.dsc.get_records():
             redemption_id = int(redemption["requestId"])
-            request_info = am.redemption_request_info(redemption_id)
-            status = statuses[request_info[1]]
+            if stored_statuses.get(redemption_id) in ["success", "expired"]:
+                result[stored_statuses[redemption_id]].append(redemption_id)
+            else:
+                redemptions.append(redemption)
+        am = self.context.asset_manager()
+        redemption_ids = [int(redemption["requestId"]) for redemption in redemptions]
+        if assume_active:
+            onchain_statuses = ["ACTIVE"] * len(redemption_ids)
+        else:
+            request_infos = am.redemption_request_infos(redemption_ids, block_identifier)
+            onchain_statuses = [statuses[request_info[1]] for request_info in request_infos]
+        current_underlying_block, first_block = None, None
+        for redemption, redemption_id, status in zip(redemptions, redemption_ids, onchain_statuses):
             if status == "ACTIVE":
                 block = int(redemption["lastUnderlyingBlock"])
-                current_underlying_block = self.token_underlying.network().get_current_block()
-                a = Attestation(self.native_network, self.token_underlying, self.native_credentials, self.indexer_api_key)
-                first_block, _ = a.get_block_range()
+                if current_underlying_block is None:
+                    current_underlying_block = ledger_index if ledger_index is not None else self.token_underlying.network().get_current_block()
+                    a = Attestation(self.native_network, self.token_underlying, self.native_credentials, self.indexer_api_key)
+                    first_block, _ = a.get_block_range()
                 if current_underlying_block > block:
                     status = "default"
                 elif block < first_block:
@@ -143,8 +200,10 @@ class Redeemer(User):
                     status = "pending"
             elif status == "SUCCESSFUL":
                 status = "success"
+                self.dsc.set_status(redemption_id, status)
             else:
                 status = "expired"
+                self.dsc.set_status(redemption_id, status)
             result[status].append(redemption_id)
         return RedemptionStatus(**result)   
 
@@ -1,30 +1,69 @@
+from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 from src.interfaces.network.tokens import TokenNative, TokenUnderlying, TokenFAsset, TokenExternalNative, TokenExternalFAsset
 from src.interfaces.contracts.oft_upgradeable import OFTUpgradeable
 from src.interfaces.user.user import User
 from src.interfaces.contracts import *
+from src.interfaces.contracts.multicall3 import has_multicall
 from src.utils.data_structures import Balances
 if TYPE_CHECKING:
     from src.utils.data_structures import UserData
     from src.flow.fee_tracker import FeeTracker
     from src.interfaces.network.tokens import Token
+    from web3.types import BlockIdentifier
 
 
 class StateManager(User):
     def __init__(self, user_data : "UserData", fee_tracker : Optional["FeeTracker"]  = None):
         super().__init__(user_data, fee_tracker)
 
-    def get_balances(self, tokens: Optional[list["Token"]] = None, log_steps: bool = False) -> "Balances":
+    def get_snapshot_blocks(self) -> tuple[int, int]:
+        """
+        Returns the native block number and the underlying ledger index to pin a state snapshot to.
+        """
+        block = self.token_native.network().web3.eth.block_number
+        ledger_index = self.token_underlying.network().get_current_block()
+        return block, ledger_index
+
+    def _get_native_chain_balances(self, tokens: list["Token"], block_identifier: "BlockIdentifier" = "latest") -> dict["Token", Decimal]:
+        """
+        Reads native and fasset balances in one batched call.
+        """
+        if not has_multicall(self.native_network):
+            nn = self.context.native_client()
+            return {token: nn.get_balance(token, block_identifier) for token in tokens}
+        address = self.native_credentials.address
+        calls = []
+        for token in tokens:
+            if isinstance(token, TokenNative):
+                calls.append(Multicall3(self.native_network).eth_balance_call(address))
+            else:
+                calls.append(FAsset(self.native_network, token).batch_call("balanceOf", [address]))
+        results = read_batch(self.native_network, calls, block_identifier)
+        return {token: token.from_uba(balance_uba) for token, balance_uba in zip(tokens, results)}
+
+    def get_balances(
+            self, 
+            tokens: Optional[list["Token"]] = None, 
+            log_steps: bool = False,
+            block_identifier: "BlockIdentifier" = "latest",
+            ledger_index: int | str = "validated"
+        ) -> "Balances":
+        """
+        Returns balances of the given tokens.
+        Native chain balances are read at block_identifier and underlying balances at ledger_index.
+        """
         if not tokens:
             tokens = [self.token_native, self.token_underlying, self.token_fasset]
+        native_chain_tokens = [token for token in tokens if isinstance(token, (TokenNative, TokenFAsset))]
+        native_chain_balances = self._get_native_chain_balances(native_chain_tokens, block_identifier) if native_chain_tokens else {}
         balances_dict = {}
         for token in tokens:
             if isinstance(token, (TokenNative, TokenFAsset)):
-                nn = self.token_native.network(self.native_credentials)
-                balances_dict[token] = nn.get_balance(token)
+                balances_dict[token] = native_chain_balances[token]
             elif isinstance(token, TokenUnderlying):
-                un = self.token_underlying.network(self.underlying_credentials)
-                balances_dict[token] = un.get_balance(token)
+                un = self.context.underlying_client()
+                balances_dict[token] = un.get_balance(token, ledger_index)
             elif isinstance(token, (TokenExternalNative, TokenExternalFAsset)):
                 en = token.network(self.native_credentials.address)
                 balances_dict[token] = en.get_balance(token)
@@ -32,10 +71,10 @@ class StateManager(User):
         return balances
     
     def block_underlying_deposits(self) -> None:
-        un = self.token_underlying.network(self.underlying_credentials)
+        un = self.context.underlying_client()
         un.block_all_deposits()
 
     def unblock_underlying_deposits(self) -> None:
-        un = self.token_underlying.network(self.underlying_credentials)
+        un = self.context.underlying_client()
         un.unblock_all_deposits()
     
\ No newline at end of file
@@ -1,18 +1,22 @@
 from abc import ABC
 import os
 import re
+import threading
 from dotenv import load_dotenv
 import requests
 import logging
 from pathlib import Path
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Literal, Optional
 import toml
 from src.utils.secrets import load_user_secrets
 from src.utils.data_structures import UserCredentials
 from src.interfaces.network.tokens import TokenFAsset
+from src.interfaces.contracts import *
 if TYPE_CHECKING:
     from src.flow.fee_tracker import FeeTracker
     from src.utils.data_structures import UserData
+    from src.interfaces.network.networks.native_networks.native_network import NativeNetwork
+    from src.interfaces.network.networks.underlying_networks.underlying_network import UnderlyingNetwork
 
 config = toml.load("config.toml")
 log_folder = Path(config["folder"]["log"])
@@ -23,8 +27,14 @@ BOT_TOKEN = os.environ["BOT_TOKEN"]
 BOT_CHANNEL_ID = int(os.environ["BOT_CHANNEL_ID"])
 
 
-class User(ABC):
-    def __init__(self, user_data: "UserData", fee_tracker : "FeeTracker" = None):
+class UserContext():
+    """
+    Role independent data of one user (credentials, logger, network clients and contract handles),
+    loaded once per process and shared by all user roles (see get_user_context).
+    Network clients and contract handles are built on first use, without a fee tracker,
+    so they are used for reads and for writes whose fees are not tracked.
+    """
+    def __init__(self, user_data: "UserData"):
         token_native, token_underlying, num, partner, funder = (
             user_data.token_native,
             user_data.token_underlying,
@@ -32,20 +42,13 @@ class User(ABC):
             user_data.partner,
             user_data.funder
         )
-        self.num = num
-        self.partner = partner
-        self.funder = funder
-        self.fee_tracker = fee_tracker
+        self._lock = threading.Lock()
 
         # tokens
         self.token_native = token_native
         self.token_underlying = token_underlying
         self.token_fasset = TokenFAsset.from_underlying(token_underlying)
 
-        # networks
-        self.native_network = token_native.network
-        self.underlying_network = token_underlying.network
-        
         # secrets
         secrets = load_user_secrets(num, partner, funder)
         self.native_credentials = UserCredentials(**secrets["user"]["native"])
@@ -69,6 +72,85 @@ class User(ABC):
             file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
             self.logger.addHandler(file_handler)
 
+        # clients
+        self._native_client : Optional["NativeNetwork"] = None
+        self._underlying_client : Optional["UnderlyingNetwork"] = None
+        self._asset_manager : Optional[AssetManager] = None
+        self._fasset : Optional[FAsset] = None
+
+    def native_client(self) -> "NativeNetwork":
+        with self._lock:
+            if self._native_client is None:
+                self._native_client = self.token_native.network(self.native_credentials)
+            return self._native_client
+
+    def underlying_client(self) -> "UnderlyingNetwork":
+        with self._lock:
+            if self._underlying_client is None:
+                self._underlying_client = self.token_underlying.network(self.underlying_credentials)
+            return self._underlying_client
+
+    def asset_manager(self) -> AssetManager:
+        with self._lock:
+            if self._asset_manager is None:
+                self._asset_manager = AssetManager(self.token_native.network, self.token_fasset)
+            return self._asset_manager
+
+    def fasset(self) -> FAsset:
+        with self._lock:
+            if self._fasset is None:
+                self._fasset = FAsset(self.token_native.network, self.token_fasset)
+            return self._fasset
+
+
+_lock = threading.Lock()
+_user_contexts : dict[tuple, UserContext] = {}
+
+def get_user_context(user_data: "UserData") -> UserContext:
+    """
+    Returns the process-wide context of the given user.
+    """
+    key = (
+        user_data.token_native.name,
+        user_data.token_underlying.name,
+        user_data.num,
+        bool(user_data.partner),
+        bool(user_data.funder)
+    )
+    with _lock:
+        user_context = _user_contexts.get(key)
+        if user_context is None:
+            user_context = UserContext(user_data)
+            _user_contexts[key] = user_context
+        return user_context
+
+
+class User(ABC):
+    def __init__(self, user_data: "UserData", fee_tracker : "FeeTracker" = None):
+        context = get_user_context(user_data)
+        self.context = context
+        self.num = user_data.num
+        self.partner = user_data.partner
+        self.funder = user_data.funder
+        self.fee_tracker = fee_tracker
+
+        # tokens
+        self.token_native = context.token_native
+        self.token_underlying = context.token_underlying
+        self.token_fasset = context.token_fasset
+
+        # networks
+        self.native_network = context.token_native.network
+        self.underlying_network = context.token_underlying.network
+        
+        # secrets
+        self.native_credentials = context.native_credentials
+        self.underlying_credentials = context.underlying_credentials
+        self.indexer_api_key = context.indexer_api_key
+
+        # logger
+        self.logger = context.logger
+
     def _send_telegram_message(self, message, level):
         if BOT_TOKEN and BOT_CHANNEL_ID:
             user_snippet = "funder" if self.funder else f"user{'_partner' if self.partner else ''} {self.num}"
@@ -1,24 +1,70 @@
+from dataclasses import fields
 from decimal import Decimal
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
 import toml
+import json
 import re
+import shlex
 from contextlib import suppress
 import subprocess
 from src.utils.data_storage import DataStorageClient
 from src.utils.secrets import secrets_file
 from src.utils.data_structures import AgentInfo, Balances, MintStatus, PoolHolding, Pool, RedemptionStatus
 from src.interfaces.user.user import User
+from src.interfaces.user.bot_process import get_bot_process
 if TYPE_CHECKING:
     from src.utils.data_structures import UserData
 
 config = toml.load("config.toml")
 fasset_bots_folder = config["folder"]["fasset_bots"]
+persistent : bool = config["bot"]["process"]["persistent"]
+
+# commands that only read state, so they can be run again in a new process if the persistent one fails
+INFO_COMMANDS = ["help", "balances", "agents", "agentInfo", "pools", "poolHoldings", "mintStatus", "redemptionStatus"]
+json_output : bool = config["bot"]["json_output"]
+json_flag : str = config["bot"]["json_flag"]
+
+
+class _TableDecoder():
+    """
+    Decodes table output line by line: the first text line is the header and every further line a row.
+    NDJSON lines are decoded as records directly. Only the given numeric columns are converted to Decimal.
+    """
+    def __init__(self, record_type: type, numeric_keys: list[str], key_mapping: Optional[dict[str, str]] = None):
+        self.record_type = record_type
+        self.numeric_keys = numeric_keys
+        self.key_mapping = key_mapping or {}
+        self.field_names = {f.name for f in fields(record_type)}
+        self.header : Optional[list[str]] = None
+
+    def _record(self, values: dict[str, Any]) -> Any:
+        return self.record_type(**{
+            key: Decimal(str(value)) if key in self.numeric_keys and value is not None else value
+            for key, value in values.items()
+            if key in self.field_names
+        })
+
+    def decode(self, line: str) -> Any:
+        if line.startswith("{"):
+            return self._record(json.loads(line))
+        if self.header is None:
+            self.header = [
+                self.key_mapping.get(name, name.replace(" ", "_").lower())
+                for name in re.split(r"\s{2,}", line.strip())
+            ]
+            return None
+        values = line.split()
+        if len(values) != len(self.header):
+            raise ValueError(f"expected {len(self.header)} columns, got {len(values)}")
+        return self._record(dict(zip(self.header, values)))
 
 
 class UserBot(User):
     """
     A class to interact with the user bot command line interface.
     It provides methods to execute commands and parse their output.
+    With persistent bot processes enabled, commands are sent to one long-lived user-bot process per user
+    instead of starting a new one for every command.
     """
     def __init__(self, user_data: "UserData", config=None, timeout=None):
         super().__init__(user_data)
@@ -27,33 +73,78 @@ class UserBot(User):
         secrets = secrets_file(user_data.num, user_data.partner)
         config_snippet = f"-c {config}" if config else ""
         self.command_prefix = f"yarn user-bot -s {secrets} {config_snippet} -f {self.token_fasset} "
+        self.bot_process = get_bot_process(shlex.split(f"-s {secrets} {config_snippet} -f {self.token_fasset}")) if persistent else None
 
-    def _execute(self, command: str, log_steps: bool) -> list[str]:
+    def _stream(self, command: str, log_steps: bool) -> Iterator[str]:
+        """
+        Executes the command and yields its output lines as they arrive.
+        """
         self.logger.info(f"Executing command: {command}")
+        if self.bot_process is None:
+            yield from self._stream_subprocess(command, log_steps)
+            return
+        try:
+            lines = self.bot_process.execute(shlex.split(command), self.timeout)
+        except Exception as e:
+            if command.split()[0] not in INFO_COMMANDS:
+                self.logger.error(f"Error while executing command:\n{e}")
+                return
+            self.logger.warning(f"Error in user bot process, executing command in a new process:\n{e}")
+            yield from self._stream_subprocess(command, log_steps)
+            return
+        for line in lines:
+            if log_steps:
+                self.logger.info(line)
+            yield line
+        self.logger.info(f"Command finished.")
+
+    def _stream_subprocess(self, command: str, log_steps: bool) -> Iterator[str]:
         full_command = self.command_prefix + command
         p = subprocess.Popen(
             full_command,
             shell=True,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             cwd=fasset_bots_folder,
             restore_signals=False,
             start_new_session=True,
             text=True,
         )
-        lines = []
         try:
             for line in p.stdout:
                 line = line.strip()
-                lines.append(line)
                 if log_steps:
                     self.logger.info(line)
+                yield line
             p.wait(timeout=self.timeout)
         except Exception as e:
             self.logger.error(f"Error while executing command:\n{e}")
-            return lines
+            return
         self.logger.info(f"Command finished.")
-        return lines
+
+    def _execute(self, command: str, log_steps: bool) -> list[str]:
+        return list(self._stream(command, log_steps))
+
+    def _decode(self, command: str, decode: Callable[[str], Any], log_steps: bool) -> list:
+        """
+        Executes an info command and decodes its output in one pass, line by line as it arrives.
+        With json_output, the command is asked for NDJSON output.
+        Lines that cannot be decoded are logged and skipped.
+        """
+        if json_output:
+            command = f"{command} {json_flag}"
+        records = []
+        for line in self._stream(command, log_steps):
+            if not line:
+                continue
+            try:
+                record = decode(line)
+            except Exception as e:
+                self.logger.warning(f"Skipping malformed line of '{command}' output '{line}': {e}")
+                continue
+            if record is not None:
+                records.append(record)
+        return records
 
     def help(self, log_steps: bool = False) -> list[str]:
         """
@@ -66,34 +157,41 @@ class UserBot(User):
     def get_balances(self, log_steps: bool = False) -> "Balances":
         """
         Returns the balance of the user bot.
-        """
-        output = self._execute("balances", log_steps)
-        balances = {}
-        for line in output:
-            amount, token = line.split(":")[1].strip().split(" ")
-            balances[token] = Decimal(amount)
-        return Balances(data=balances)
+        Text lines look like 'CFLR balance: 100 CFLR', NDJSON records like {"token": "CFLR", "amount": "100"}.
+        """
+        def decode(line: str) -> tuple[str, Decimal]:
+            if line.startswith("{"):
+                record = json.loads(line)
+                return record["token"], Decimal(str(record["amount"]))
+            amount, token = line.split(":", 1)[1].split()
+            return token, Decimal(amount)
+        return Balances(data=dict(self._decode("balances", decode, log_steps)))
 
     def get_agents(self, log_steps: bool = False) -> list["AgentInfo"]:
         """
-        Returns a list of parsed agent dicts.
-        Each dict contains the agent's address, max_lots and fee.
-        """
-        output = self._execute("agents", log_steps)
-        agents = []
-        for line in output[1:]:  # Skip the header line
-            try:
-                address, max_lots, fee = line.split()
-                agents.append(AgentInfo(
-                    {
-                        "address": address,
-                        "max_lots": int(max_lots),
-                        "fee": Decimal(fee.strip("%") / 1e4),
-                    })
+        Returns a list of agents with their address, max_lots and fee.
+        Text rows look like '<address> <free lots> <fee>%' after a header line,
+        NDJSON records have the fields of AgentInfo.
+        """
+        header = []
+        def decode(line: str) -> Optional["AgentInfo"]:
+            if line.startswith("{"):
+                record = json.loads(line)
+                return AgentInfo(
+                    address=record["address"],
+                    max_lots=int(record["max_lots"]),
+                    fee=Decimal(str(record["fee"]))
                 )
-            except Exception as e:
-                self.logger.error(f"Error parsing agent line '{line}': {e}")
-        return agents
+            if not header:
+                header.append(line)
+                return None
+            address, max_lots, fee = line.split()
+            return AgentInfo(
+                address=address,
+                max_lots=int(max_lots),
+                fee=Decimal(fee.strip("%")) / Decimal(1e4)
+            )
+        return self._decode("agents", decode, log_steps)
 
     def get_agent_info(self, agent: str, log_steps: bool = False) -> dict:
         """
@@ -114,10 +212,8 @@ class UserBot(User):
     def get_pools(self, log_steps: bool = False) -> list["Pool"]:
         """
         Returns a list of pools available.
-        Each pool is represented as a dictionary with keys like 'Pool address', 'Token symbol' and other pool data.
+        Text output is a table with a header line, NDJSON records have the fields of Pool.
         """
-        output = self._execute("pools", log_steps)
-        pools = []
         key_mapping = {
             "Pool address": "address",
             "Token symbol": "token_symbol",
@@ -126,35 +222,16 @@ class UserBot(User):
             "Fees (FTestXRP)": "fees_underlying",
             "CR": "cr"
         }
-        header = re.split(r"\s{2,}", output[0].strip())
-        for line in output[1:]:
-            data = line.split()
-            pool = {}
-            for i, value in enumerate(data):
-                with suppress(ValueError):
-                    value = Decimal(value)
-                pool[key_mapping.get(header[i])] = value
-            pools.append(Pool(**pool))
-        return pools
+        decoder = _TableDecoder(Pool, ["token_price_native", "collateral_native", "fees_underlying", "cr"], key_mapping)
+        return self._decode("pools", decoder.decode, log_steps)
 
     def get_pool_holdings(self, log_steps: bool = False) -> list["PoolHolding"]:
         """
         Returns a list of pool holdings.
-        Each holding is represented as a dictionary with keys 'Pool address', 'Token symbol', 'Pool tokens'.
-        """
-        output = self._execute("poolHoldings", log_steps)
-        holdings = []
-        header = re.split(r"\s{2,}", output[0].strip())
-        for line in output[1:]:
-            data = line.split()
-            holding = {}
-            for i, value in enumerate(data):
-                with suppress(ValueError):
-                    value = Decimal(value)
-                key = header[i].replace(" ", "_").lower()
-                holding[key] = value
-            holdings.append(PoolHolding(**holding))
-        return holdings
+        Text output is a table with a header line, NDJSON records have the fields of PoolHolding.
+        """
+        decoder = _TableDecoder(PoolHolding, ["pool_tokens", "fasset_fees", "max_amount_to_exit"])
+        return self._decode("poolHoldings", decoder.decode, log_steps)
 
     # Mint and redeem actions
 
@@ -212,35 +289,37 @@ class UserBot(User):
         command = f"redemptionDefault {redemption_id}"
         return self._execute(command, log_steps)
 
+    def _get_statuses(self, command: str, statuses: list[str], log_steps: bool) -> dict[str, list[int]]:
+        """
+        Text lines look like '<id>  <status>', NDJSON records like {"id": 1, "status": "PENDING"}.
+        Lines with other statuses are ignored.
+        """
+        def decode(line: str) -> Optional[tuple[int, str]]:
+            if line.startswith("{"):
+                record = json.loads(line)
+                request_id, status = record["id"], record["status"]
+            elif "  " in line:
+                request_id, status = line.split("  ", 1)
+            else:
+                return None
+            return int(str(request_id).strip()), status.strip().lower()
+        result = {status: [] for status in statuses}
+        for request_id, status in self._decode(command, decode, log_steps):
+            if status in result:
+                result[status].append(request_id)
+        return result
+
     def get_mint_status(self, log_steps: bool = False) -> "MintStatus":
         """
         Returns a dictionary describing mint status of the user bot.
         """
-        output = self._execute("mintStatus", log_steps)
-        mint_status = {"expired": [], "pending": []}
-        for line in output:
-            if "  " in line:
-                mint_id, status = line.split("  ", 1)
-                status = status.lower()
-                if status in mint_status.keys():
-                    mint_status[status] = mint_status[status] + [mint_id]
-        return MintStatus(**mint_status)
+        return MintStatus(**self._get_statuses("mintStatus", ["expired", "pending"], log_steps))
 
     def get_redemption_status(self, log_steps: bool = False) -> "RedemptionStatus":
         """
         Returns a dictionary describing remeption status of the user bot.
         """
-        output = self._execute("redemptionStatus", log_steps)
-        redemption_status = {"pending": [], "success": [], "default": [], "expired": []}
-        for line in output:
-            if "  " in line:
-                redemption_id, status = line.split("  ", 1)
-                status = status.lower()
-                if status in redemption_status.keys():
-                    redemption_status[status] = redemption_status[status] + [
-                        int(redemption_id.strip())
-                    ]
-        return RedemptionStatus(**redemption_status)
+        return RedemptionStatus(**self._get_statuses("redemptionStatus", ["pending", "success", "default", "expired"], log_steps))
 
     # Pool actions
 
@@ -1,8 +1,12 @@
+import functools
 import json
+import threading
 from typing import Optional, TYPE_CHECKING
 import toml
 from pathlib import Path
 if TYPE_CHECKING:
+    from web3 import Web3
+    from web3.contract import Contract
     from src.interfaces.contracts.contract_client import ContractClient
     from src.interfaces.network.networks.external_networks.external_network import ExternalNetwork
     from src.interfaces.network.networks.native_networks.native_network import NativeNetwork
@@ -11,6 +15,9 @@ if TYPE_CHECKING:
 config = toml.load("config.toml")
 contract_interfaces_folder = config["folder"]["contract_interfaces"]
 
+_contracts_lock = threading.Lock()
+_contracts : dict[tuple, "Contract"] = {}
+
 
 def get_contract_names(cl: "ContractClient", token_fasset: Optional["TokenFAsset"] = None) -> str:
     name = cl.__class__.__name__
@@ -19,27 +26,56 @@ def get_contract_names(cl: "ContractClient", token_fasset: Optional["TokenFAsset
         names["instance"] += f"_{token_fasset.name}"
     return names
 
-def get_contract_address(instance_name: str, network: "NativeNetwork | ExternalNetwork") -> str:
-    with open(network.contracts_file(), "r") as f:
+def _network_name(network: "NativeNetwork | ExternalNetwork") -> str:
+    return network.__name__ if isinstance(network, type) else type(network).__name__
+
+@functools.cache
+def _load_contract_addresses(contracts_file: str) -> dict[str, str]:
+    with open(contracts_file, "r") as f:
         contracts = json.load(f)
-    for contract in contracts:
-        if contract.get("name") == instance_name:
-            return contract.get("address")
+    return {contract.get("name"): contract.get("address") for contract in contracts}
+
+def get_contract_address(instance_name: str, network: "NativeNetwork | ExternalNetwork") -> str:
+    addresses = _load_contract_addresses(network.contracts_file())
+    if instance_name in addresses:
+        return addresses[instance_name]
     raise ValueError(f"Contract {instance_name} not found")
 
+def contract_exists(instance_name: str, network: "NativeNetwork | ExternalNetwork") -> bool:
+    return instance_name in _load_contract_addresses(network.contracts_file())
+
+@functools.cache
 def get_contract_abi(interface_name: str) -> list:
     contract_path = Path(contract_interfaces_folder) / f"{interface_name}.json"
     with open(contract_path, "r") as f:
         return json.load(f)["abi"]
 
-def get_output_index(contract_interface_name: str, function_name: str, output_name: str) -> int:
+@functools.cache
+def _output_indices(contract_interface_name: str, function_name: str) -> dict[str, int]:
     abi = get_contract_abi(contract_interface_name)
     try:
         for item in abi:
             if item.get("type") == "function" and item.get("name") == function_name:
                 outputs = item.get("outputs")[0].get("components")
-                for index, output in enumerate(outputs):
-                    if output.get("name") == output_name:
-                        return index
+                return {output.get("name"): index for index, output in enumerate(outputs)}
     except Exception as e:
         raise ValueError(f"Function {function_name} not found in contract {contract_interface_name}: {e}")
+    raise ValueError(f"Function {function_name} not found in contract {contract_interface_name}")
+
+def get_output_index(contract_interface_name: str, function_name: str, output_name: str) -> int:
+    indices = _output_indices(contract_interface_name, function_name)
+    if output_name not in indices:
+        raise ValueError(f"Output {output_name} not found in function {function_name} of contract {contract_interface_name}")
+    return indices[output_name]
+
+def get_contract(web3: "Web3", network: "NativeNetwork | ExternalNetwork", interface_name: str, address: str) -> "Contract":
+    """
+    Returns the cached web3 contract object for the given network, interface and address.
+    """
+    key = (_network_name(network), interface_name, address, web3)
+    with _contracts_lock:
+        contract = _contracts.get(key)
+        if contract is None:
+            contract = web3.eth.contract(address, abi=get_contract_abi(interface_name))
+            _contracts[key] = contract
+        return contract
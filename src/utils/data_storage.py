@@ -1,6 +1,8 @@
 from pathlib import Path
 import re
-from typing import TYPE_CHECKING, Literal
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Literal, Optional
 import json
 import os
 from datetime import datetime, timezone
@@ -14,9 +16,44 @@ if TYPE_CHECKING:
 
 config = toml.load("config.toml")
 data_storage_folder = Path(config["folder"]["data_storage"])
+index_file = Path(config["data_storage"]["index_file"])
+mirror_files : bool = config["data_storage"]["mirror_files"]
+
+
+_local = threading.local()
+
+def _connection() -> sqlite3.Connection:
+    """
+    Returns the index database connection of the current thread.
+    """
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(index_file, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "folder TEXT NOT NULL, "
+            "request_id INTEGER NOT NULL, "
+            "status TEXT, "
+            "mtime REAL, "
+            "data TEXT NOT NULL, "
+            "PRIMARY KEY (folder, request_id))"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS records_status ON records (folder, status)")
+        connection.execute("CREATE TABLE IF NOT EXISTS imported_folders (folder TEXT PRIMARY KEY)")
+        _local.connection = connection
+    return connection
 
 
 class DataStorageClient():
+    """
+    Mint and redemption records of one user, indexed by request id in an SQLite database (WAL mode).
+    With mirror_files, every record is also kept as a JSON file in the fasset-bots layout,
+    and records created or changed by fasset-bots (CLI mode) are synced into the index.
+    Record files that exist when a folder is first indexed are imported once, also without mirror_files.
+    """
     def __init__(self, user_data : "UserData", action_type: Literal["redeem", "mint"]):
         if action_type not in ["redeem", "mint"]:
             raise ValueError("action_type must be either 'redeem' or 'mint'")
@@ -31,37 +68,147 @@ class DataStorageClient():
         self.folder = data_storage_folder / re.sub(r'\d+$', '', user_name).strip('_') / user_name / folder_name
         if not self.folder.exists():
             os.makedirs(self.folder)
+        self.key = str(self.folder)
+        self._import_files()
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        # clients are used from other threads than the one that built them (flow runners, snapshot workers)
+        return _connection()
 
     @staticmethod
     def timestamp_to_date(timestamp: int) -> str:
         dt = datetime.fromtimestamp(timestamp, tz=timezone.utc)
         return dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
 
-    def get_records(self) -> list[dict]:
-        records = []
-        for file_name in os.listdir(self.folder):
-            if file_name.endswith(".json"):
-                with open(self.folder / file_name, "r") as f:
-                    records.append(json.load(f))
-        return records
+    # file mirror
+
+    def _file(self, record_id: int) -> Path:
+        return self.folder / f"{record_id}.json"
+
+    def _load_file(self, file: Path, mtime: float) -> None:
+        with open(file, "r") as f:
+            record = json.load(f)
+        self.db.execute(
+            "INSERT INTO records (folder, request_id, mtime, data) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (folder, request_id) DO UPDATE SET mtime = excluded.mtime, data = excluded.data",
+            (self.key, int(record["requestId"]), mtime, json.dumps(record))
+        )
+
+    def _import_files(self) -> None:
+        """
+        Imports the record files of the folder into the index once, when the folder is first indexed.
+        Records already in the index are kept as they are.
+        """
+        db = self.db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if db.execute("INSERT OR IGNORE INTO imported_folders (folder) VALUES (?)", (self.key,)).rowcount:
+                for entry in os.scandir(self.folder):
+                    if not entry.name.endswith(".json"):
+                        continue
+                    with open(entry.path, "r") as f:
+                        record = json.load(f)
+                    db.execute(
+                        "INSERT INTO records (folder, request_id, mtime, data) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT (folder, request_id) DO NOTHING",
+                        (self.key, int(record["requestId"]), entry.stat().st_mtime, json.dumps(record))
+                    )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def _sync_record(self, record_id: int) -> None:
+        """
+        Syncs one record with its file.
+        """
+        if not mirror_files:
+            return
+        file = self._file(record_id)
+        row = self.db.execute(
+            "SELECT mtime FROM records WHERE folder = ? AND request_id = ?", (self.key, record_id)
+        ).fetchone()
+        if not file.exists():
+            if row is not None:
+                self.db.execute("DELETE FROM records WHERE folder = ? AND request_id = ?", (self.key, record_id))
+            return
+        mtime = file.stat().st_mtime
+        if row is None or row[0] != mtime:
+            self._load_file(file, mtime)
+
+    def sync(self) -> None:
+        """
+        Syncs the index with the record files, loading only new and changed files.
+        """
+        if not mirror_files:
+            return
+        indexed = dict(self.db.execute("SELECT request_id, mtime FROM records WHERE folder = ?", (self.key,)).fetchall())
+        existing = set()
+        for entry in os.scandir(self.folder):
+            if not entry.name.endswith(".json"):
+                continue
+            record_id = int(entry.name.removesuffix(".json"))
+            existing.add(record_id)
+            mtime = entry.stat().st_mtime
+            if indexed.get(record_id) != mtime:
+                self._load_file(Path(entry.path), mtime)
+        removed = [(self.key, record_id) for record_id in indexed if record_id not in existing]
+        if removed:
+            self.db.executemany("DELETE FROM records WHERE folder = ? AND request_id = ?", removed)
+
+    def export(self) -> None:
+        """
+        Writes all indexed records as files in the fasset-bots layout.
+        """
+        for record in self.get_records():
+            self._write_file(record)
+
+    def _write_file(self, record_data: dict) -> float:
+        file = self._file(int(record_data["requestId"]))
+        with open(file, "w") as f:
+            json.dump(record_data, f, indent=4)
+        return file.stat().st_mtime
+
+    # records
+
+    def get_records(self, status: Optional[str] = None) -> list[dict]:
+        """
+        Get all records, or only records with the given status (see set_status).
+        """
+        self.sync()
+        if status is None:
+            rows = self.db.execute("SELECT data FROM records WHERE folder = ?", (self.key,))
+        else:
+            rows = self.db.execute("SELECT data FROM records WHERE folder = ? AND status = ?", (self.key, status))
+        return [json.loads(data) for (data,) in rows.fetchall()]
     
     def get_record(self, request_id: int) -> dict:
         """
         Get redemption or mint data by its ID.
         """
-        records = self.get_records()
-        for record in records:
-            if int(record["requestId"]) == request_id:
-                return record
-        raise ValueError(f"Request ID {request_id} not found.")
+        request_id = int(request_id)
+        self._sync_record(request_id)
+        row = self.db.execute(
+            "SELECT data FROM records WHERE folder = ? AND request_id = ?", (self.key, request_id)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Request ID {request_id} not found.")
+        return json.loads(row[0])
 
     def save_record(self, record_data: dict):
-        record_id = record_data.get("requestId")
-        with open(self.folder / f"{record_id}.json", "w") as f:
-            json.dump(record_data, f, indent=4)
+        record_id = int(record_data.get("requestId"))
+        mtime = self._write_file(record_data) if mirror_files else None
+        self.db.execute(
+            "INSERT INTO records (folder, request_id, mtime, data) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (folder, request_id) DO UPDATE SET mtime = excluded.mtime, data = excluded.data",
+            (self.key, record_id, mtime, json.dumps(record_data))
+        )
 
     def remove_record(self, record_id: int):
-        record_file = self.folder / f"{record_id}.json"
+        record_id = int(record_id)
+        self.db.execute("DELETE FROM records WHERE folder = ? AND request_id = ?", (self.key, record_id))
+        record_file = self._file(record_id)
         if record_file.exists():
             os.remove(record_file)
 
@@ -70,16 +217,35 @@ class DataStorageClient():
         record.update(data_dict)
         self.save_record(record)
 
+    def set_status(self, record_id: int, status: Optional[str]) -> None:
+        """
+        Set the status of a record (e.g. a terminal status that does not need to be checked again).
+        The status is kept in the index only.
+        """
+        self.db.execute(
+            "UPDATE records SET status = ? WHERE folder = ? AND request_id = ?", (status, self.key, int(record_id))
+        )
+
+    def get_statuses(self) -> dict[int, Optional[str]]:
+        self.sync()
+        rows = self.db.execute("SELECT request_id, status FROM records WHERE folder = ?", (self.key,))
+        return dict(rows.fetchall())
+
     def exists(self, record_id: int) -> bool:
-        record_file = self.folder / f"{record_id}.json"
-        return record_file.exists()
+        record_id = int(record_id)
+        self._sync_record(record_id)
+        row = self.db.execute(
+            "SELECT 1 FROM records WHERE folder = ? AND request_id = ?", (self.key, record_id)
+        ).fetchone()
+        return row is not None
     
     def get_existing_record_ids(self) -> list[int]:
-        existing_ids = [int(file_name.removesuffix(".json")) for file_name in os.listdir(self.folder) if file_name.endswith(".json")]
-        return existing_ids
+        self.sync()
+        rows = self.db.execute("SELECT request_id FROM records WHERE folder = ?", (self.key,))
+        return [record_id for (record_id,) in rows.fetchall()]
     
     def get_new_record_ids(self, previous_ids: list[int]) -> list[int]:
-        existing_ids = [int(file_name.removesuffix(".json")) for file_name in os.listdir(self.folder) if file_name.endswith(".json")]
+        existing_ids = self.get_existing_record_ids()
         return list(set(existing_ids).difference(set(previous_ids)))
     
 
@@ -204,6 +204,9 @@ class FlowState:
     mint_status: Optional[MintStatus] = None
     redemption_status: Optional[RedemptionStatus] = None
     pool_holdings: Optional[list[PoolHolding]] = None
+    # native block and underlying ledger the state was read at (not compared)
+    block: Optional[int] = None
+    ledger_index: Optional[int] = None
 
     def __post_init__(self):
         if self.pool_holdings:
@@ -225,13 +228,13 @@ class FlowState:
         return new_flow_state
     
     def fields(self) -> list[str]:
-        return list(self.__dataclass_fields__.keys())
+        return [field for field in self.__dataclass_fields__ if field not in ["block", "ledger_index"]]
     
     def __getitem__(self, key: str):
         return getattr(self, key)
     
     def copy(self) -> "FlowState":
-        flow_state = FlowState(balances=self.balances.copy())
+        flow_state = FlowState(balances=self.balances.copy(), block=self.block, ledger_index=self.ledger_index)
         if self.mint_status:
             flow_state.mint_status = self.mint_status.copy()
         if self.redemption_status:
@@ -274,6 +277,7 @@ class RelevantInfo:
     mint_status: bool = False
     redemption_status: bool = False
     pool_holdings: bool = False
+    agents: bool = False
 
     @classmethod
     def union(cls, objs: list["RelevantInfo"]) -> "RelevantInfo":
@@ -281,16 +285,19 @@ class RelevantInfo:
         mint_status = False
         redemption_status = False
         pool_holdings = False
+        agents = False
         for obj in objs:
             tokens.update(obj.tokens)
             mint_status = mint_status or obj.mint_status
             redemption_status = redemption_status or obj.redemption_status
             pool_holdings = pool_holdings or obj.pool_holdings
+            agents = agents or obj.agents
         return RelevantInfo(
             tokens=list(tokens),
             mint_status=mint_status,
             redemption_status=redemption_status,
-            pool_holdings=pool_holdings
+            pool_holdings=pool_holdings,
+            agents=agents
         )
     
     def __repr__(self) -> str: